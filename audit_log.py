@@ -0,0 +1,166 @@
+import discord
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone, timedelta
+
+# How many recent entries each guild's tailer keeps indexed
+AUDIT_INDEX_SIZE = 500
+# Entries fetched on the first poll of a guild (newest first, one request)
+AUDIT_BOOTSTRAP_LIMIT = 50
+# Seconds between polls while a listener is still waiting for its entry
+AUDIT_POLL_INTERVAL = 1.0
+# Entries older than this are never attributed to a new event
+AUDIT_DEFAULT_MAX_AGE = 60
+
+
+class AuditLogTailer:
+    """
+    Tails one guild's audit log incrementally (using the `after` snowflake) and
+    serves lookups by (action, target ID) from a bounded index of recent entries.
+    Concurrent lookups share a single in-flight fetch, and a miss shortly after
+    a fetch waits for the shared poll loop instead of fetching again; the poll
+    loop only runs while some lookup is still waiting for its entry to show up.
+    """
+
+    def __init__(self, guild: discord.Guild):
+        self.guild = guild
+        self.last_id: int | None = None
+        self.fetches = 0
+        # time.monotonic() of the last fetch start, 0 before the first
+        self.fetched_at = 0.0
+        self._recent: deque[discord.AuditLogEntry] = deque()
+        self._by_key: dict[tuple, list[discord.AuditLogEntry]] = {}
+        self._waiters: list[tuple] = []
+        self._fetch_task: asyncio.Task | None = None
+        self._poll_task: asyncio.Task | None = None
+
+    def _add(self, entry: discord.AuditLogEntry):
+        if len(self._recent) >= AUDIT_INDEX_SIZE:
+            old = self._recent.popleft()
+            old_key = (old.action, getattr(old.target, "id", None))
+            bucket = self._by_key.get(old_key)
+            if bucket:
+                bucket.remove(old)
+                if not bucket:
+                    del self._by_key[old_key]
+        self._recent.append(entry)
+        key = (entry.action, getattr(entry.target, "id", None))
+        self._by_key.setdefault(key, []).append(entry)
+
+    @staticmethod
+    def _matches(entry, since: datetime, check) -> bool:
+        return entry.created_at >= since and (check is None or check(entry))
+
+    def _lookup(self, action, target_id: int, since: datetime, check):
+        # Newest matching entry wins
+        for entry in reversed(self._by_key.get((action, target_id), ())):
+            if self._matches(entry, since, check):
+                return entry
+        return None
+
+    async def _fetch_new(self):
+        self.fetches += 1
+        self.fetched_at = time.monotonic()
+        try:
+            if self.last_id is None:
+                entries = [
+                    e async for e in self.guild.audit_logs(limit=AUDIT_BOOTSTRAP_LIMIT)
+                ]
+                entries.reverse()  # oldest first, like incremental fetches
+            else:
+                entries = [
+                    e
+                    async for e in self.guild.audit_logs(
+                        limit=100, after=discord.Object(id=self.last_id)
+                    )
+                ]
+        except Exception as e:
+            print(f"Audit log fetch failed for {self.guild}: {e}")
+            return
+
+        for entry in entries:
+            if self.last_id is not None and entry.id <= self.last_id:
+                continue
+            self.last_id = entry.id
+            self._add(entry)
+            key = (entry.action, getattr(entry.target, "id", None))
+            for waiter_key, since, check, future in self._waiters:
+                if (
+                    waiter_key == key
+                    and not future.done()
+                    and self._matches(entry, since, check)
+                ):
+                    future.set_result(entry)
+
+    async def refresh(self):
+        """Fetch entries newer than the last one seen, sharing any fetch already running."""
+        if self._fetch_task is None or self._fetch_task.done():
+            self._fetch_task = asyncio.create_task(self._fetch_new())
+        await asyncio.shield(self._fetch_task)
+
+    async def _poll(self):
+        while self._waiters:
+            await asyncio.sleep(AUDIT_POLL_INTERVAL)
+            await self.refresh()
+
+    async def find(
+        self,
+        action: discord.AuditLogAction,
+        target_id: int,
+        *,
+        max_age: float = AUDIT_DEFAULT_MAX_AGE,
+        check=None,
+        wait: float = 0,
+    ) -> discord.AuditLogEntry | None:
+        """
+        Return the newest entry for (action, target_id) created within `max_age`
+        seconds that passes `check`, polling for up to `wait` seconds if it
+        hasn't been written yet. Returns None if nothing matches.
+        """
+        since = datetime.now(timezone.utc) - timedelta(seconds=max_age)
+        entry = self._lookup(action, target_id, since, check)
+        if entry is not None:
+            return entry
+
+        # Share a fetch that's running; only fetch directly if the last one is
+        # older than a poll interval, otherwise the poll loop fetches soon enough
+        fetching = self._fetch_task is not None and not self._fetch_task.done()
+        if fetching or time.monotonic() - self.fetched_at >= AUDIT_POLL_INTERVAL:
+            await self.refresh()
+            entry = self._lookup(action, target_id, since, check)
+        if entry is not None or wait <= 0:
+            return entry
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = ((action, target_id), since, check, future)
+        self._waiters.append(waiter)
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.create_task(self._poll())
+        try:
+            return await asyncio.wait_for(future, wait)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._waiters.remove(waiter)
+
+
+# guild_id -> tailer
+_tailers: dict[int, AuditLogTailer] = {}
+
+
+def get_tailer(guild: discord.Guild) -> AuditLogTailer:
+    tailer = _tailers.get(guild.id)
+    if tailer is None:
+        tailer = _tailers[guild.id] = AuditLogTailer(guild)
+    return tailer
+
+
+async def find_entry(
+    guild: discord.Guild,
+    action: discord.AuditLogAction,
+    target_id: int,
+    **kwargs,
+) -> discord.AuditLogEntry | None:
+    """Look up the audit log entry for an event through the guild's shared tailer."""
+    return await get_tailer(guild).find(action, target_id, **kwargs)
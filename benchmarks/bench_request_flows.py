@@ -0,0 +1,276 @@
+"""
+Drive N concurrent virtual users through the SOAP and NNID request flows (the
+real views, from the request button to channel creation) with fake
+interactions. Reports per-step handler latency, simulated REST calls, and
+races such as duplicate channels when a user double-clicks the last step.
+
+    python3.13 benchmarks/bench_request_flows.py --users 200 --double-click 0.2
+    python3.13 benchmarks/bench_request_flows.py --users 500 --ramp 0 --think 0
+
+SOAP:  SOAPRequestView -> CFWCheckView -> RegionChangeView -> SOAPConfirmView
+NNID:  NNIDRequestView -> FilesCheckView -> BrokenConsoleCheckView
+       [-> BrokenReasonView] -> CFWCheckView
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import fakes
+
+constants = fakes.install_constants()
+fakes.isolate_journal()
+
+import discord  # noqa: E402
+import tracing  # noqa: E402
+from channel_index import ChannelIndexCog, ChannelKind, classify_channel  # noqa: E402
+from nnid import NNIDCog  # noqa: E402
+from nnid_request import NNIDRequestView  # noqa: E402
+from soap import SoapCog  # noqa: E402
+from soap_automation import SOAPAutomationCog  # noqa: E402
+from soap_request import SOAPRequestView  # noqa: E402
+
+
+class Run:
+    """Shared state of one benchmark run."""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.rest = fakes.RestRecorder(
+            latency=args.latency / 1000, jitter=args.jitter / 1000, seed=args.seed
+        )
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: Counter = Counter()
+        self.outcomes: Counter = Counter()
+
+    async def step(self, name: str, coro):
+        start = time.perf_counter()
+        try:
+            return await coro
+        except Exception as e:
+            self.errors[f"{name}: {type(e).__name__}"] += 1
+            return None
+        finally:
+            self.latencies.setdefault(name, []).append(time.perf_counter() - start)
+
+    async def think(self):
+        if self.args.think:
+            await asyncio.sleep(self.rng.expovariate(1000 / self.args.think))
+
+
+def build_world(run: Run):
+    guild = fakes.FakeGuild(run.rest)
+    for category_id, name in (
+        (constants.SOAP_CHANNEL_CATEGORY_ID, "SOAP"),
+        (constants.MANUAL_SOAP_CATEGORY_ID, "Manual SOAP"),
+        (constants.NNID_CHANNEL_CATEGORY_ID, "NNID"),
+        (constants.TEMP_ARCHIVE_CATEGORY_ID, "Archive"),
+    ):
+        guild.add_category(category_id, name)
+    guild.add_role(constants.HELPEE_ROLE_ID, "Helpee")
+    guild.add_role(constants.RESTRICTED_ROLE_ID, "Restricted")
+    guild.add_text_channel("soap-log", channel_id=constants.SOAP_LOG_ID)
+
+    bot = fakes.FakeBot(guild)
+    bot.add_cog(ChannelIndexCog(bot))
+    bot.add_cog(SoapCog(bot))  # cog_load isn't run, so no archive checker
+    bot.add_cog(SOAPAutomationCog(bot))
+    bot.add_cog(NNIDCog(bot))
+
+    soap_request = guild.add_text_channel(
+        "request-soap", channel_id=constants.REQUEST_SOAP_CHANNEL_ID
+    ).add_message(guild.me, view=SOAPRequestView())
+    nnid_request = guild.add_text_channel(
+        "request-nnid", channel_id=constants.REQUEST_NNID_CHANNEL_ID
+    ).add_message(guild.me, view=NNIDRequestView())
+    return guild, bot, soap_request, nnid_request
+
+
+async def soap_user(run: Run, bot, member, request_message, double_click: bool):
+    button = fakes.find_item(request_message.view, custom_id="soap_request_button")
+    interaction = await run.step(
+        "SOAPRequestView.request", fakes.click(bot, member, request_message, button)
+    )
+    form = interaction.sent if interaction else None
+    if form is None or form.view is None:
+        run.outcomes["soap: stopped at request"] += 1
+        return
+
+    for name, answer in (("CFWCheckView.cfw_select", "yes"), ("RegionChangeView.region_select", "yes")):
+        await run.think()
+        select = fakes.find_item(form.view, item_type=discord.ui.Select)
+        await run.step(name, fakes.click(bot, member, form, select, [answer]))
+
+    await run.think()
+    confirm = fakes.find_item(form.view, custom_id="soap_confirm_button")
+    clicks = 2 if double_click else 1
+    await asyncio.gather(
+        *(
+            run.step("SOAPConfirmView.confirm", fakes.click(bot, member, form, confirm))
+            for _ in range(clicks)
+        )
+    )
+    run.outcomes[f"soap: {form.embeds[0].title if form.embeds else '?'}"] += 1
+
+
+async def nnid_user(run: Run, bot, member, request_message, double_click: bool):
+    button = fakes.find_item(request_message.view, custom_id="nnid_request_button")
+    interaction = await run.step(
+        "NNIDRequestView.request", fakes.click(bot, member, request_message, button)
+    )
+    form = interaction.sent if interaction else None
+    if form is None or form.view is None:
+        run.outcomes["nnid: stopped at request"] += 1
+        return
+
+    steps = [("FilesCheckView.files_select", "yes")]
+    if run.rng.random() < 0.5:
+        steps += [
+            ("BrokenConsoleCheckView.broken_console_select", "broken"),
+            ("BrokenReasonView.reason_select", run.rng.choice(["broken", "lost", "stolen"])),
+        ]
+    else:
+        steps += [("BrokenConsoleCheckView.broken_console_select", "new_to_old")]
+    for name, answer in steps:
+        await run.think()
+        select = fakes.find_item(form.view, item_type=discord.ui.Select)
+        await run.step(name, fakes.click(bot, member, form, select, [answer]))
+
+    # The last select creates the channel
+    await run.think()
+    select = fakes.find_item(form.view, item_type=discord.ui.Select)
+    clicks = 2 if double_click else 1
+    await asyncio.gather(
+        *(
+            run.step("CFWCheckView.cfw_select (create)", fakes.click(bot, member, form, select, ["yes"]))
+            for _ in range(clicks)
+        )
+    )
+    run.outcomes[f"nnid: {form.embeds[0].title if form.embeds else '?'}"] += 1
+
+
+async def simulate(args) -> dict:
+    run = Run(args)
+    guild, bot, soap_request, nnid_request = build_world(run)
+
+    users = []
+    for i in range(args.users):
+        member = guild.add_member(fakes.FakeMember(guild, fakes.snowflake(), f"user{i}"))
+        is_nnid = run.rng.random() < args.nnid_share
+        double_click = run.rng.random() < args.double_click
+        users.append((member, is_nnid, double_click, run.rng.uniform(0, args.ramp)))
+
+    async def start_user(member, is_nnid, double_click, delay):
+        await asyncio.sleep(delay)
+        if is_nnid:
+            await nnid_user(run, bot, member, nnid_request, double_click)
+        else:
+            await soap_user(run, bot, member, soap_request, double_click)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(start_user(*u) for u in users))
+    finished = time.perf_counter() - start
+    await fakes.drain()
+
+    # Races: more than one open channel of the same kind for one user
+    owned: Counter = Counter()
+    for channel in guild.text_channels:
+        kind = classify_channel(channel)
+        if not kind.is_transfer:
+            continue
+        for owner in set(re.findall(r"<@!?(\d+)>", channel.topic or "")):
+            owned[(int(owner), "nnid" if kind is ChannelKind.NNID else "soap")] += 1
+    duplicates = {"soap": 0, "nnid": 0}
+    for (owner, kind), count in owned.items():
+        if count > 1:
+            duplicates[kind] += count - 1
+
+    double_clickers = sum(1 for u in users if u[2])
+    return {
+        "users": args.users,
+        "double_clickers": double_clickers,
+        "seconds": finished,
+        "channels_created": sum(owned.values()),
+        "duplicate_channels": duplicates,
+        "rest_total": run.rest.total,
+        "rest_per_user": run.rest.total / max(args.users, 1),
+        "rest_by_route": {f"{m} {r}": n for (m, r), n in run.rest.calls.most_common()},
+        "latency": {
+            name: {
+                "count": len(values),
+                "p50": tracing.percentile(sorted(values), 50),
+                "p95": tracing.percentile(sorted(values), 95),
+                "p99": tracing.percentile(sorted(values), 99),
+                "max": max(values),
+            }
+            for name, values in run.latencies.items()
+        },
+        "outcomes": dict(run.outcomes.most_common()),
+        "errors": dict(run.errors.most_common()),
+    }
+
+
+def print_report(report: dict, args):
+    print(
+        f"{report['users']} virtual users ({report['double_clickers']} double-click the last step), "
+        f"REST latency {args.latency:g}ms (+{args.jitter:g}ms jitter), finished in {report['seconds']:.2f}s"
+    )
+    print(
+        f"REST calls: {report['rest_total']} total, {report['rest_per_user']:.1f} per user"
+    )
+    for route, count in report["rest_by_route"].items():
+        print(f"  {count:>7}  {route}")
+    print(f"\n{'step':<46} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for name, row in report["latency"].items():
+        print(
+            f"{name[:46]:<46} {row['count']:>6} "
+            + " ".join(f"{row[k] * 1000:>6.1f}ms" for k in ("p50", "p95", "p99", "max"))
+        )
+    print("\noutcomes:")
+    for outcome, count in report["outcomes"].items():
+        print(f"  {count:>7}  {outcome}")
+    dupes = report["duplicate_channels"]
+    print(
+        f"\nchannels created: {report['channels_created']} • "
+        f"duplicate SOAP channels: {dupes['soap']} • duplicate NNID channels: {dupes['nnid']}"
+    )
+    if report["errors"]:
+        print("handler exceptions:")
+        for error, count in report["errors"].items():
+            print(f"  {count:>7}  {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100, help="Virtual users to run.")
+    parser.add_argument("--nnid-share", type=float, default=0.3, help="Fraction of users requesting NNID.")
+    parser.add_argument(
+        "--double-click", type=float, default=0.1,
+        help="Fraction of users who click the final step twice at once.",
+    )
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which users arrive.")
+    parser.add_argument("--think", type=float, default=300.0, help="Mean think time between steps in ms.")
+    parser.add_argument("--latency", type=float, default=50.0, help="Simulated REST latency in ms.")
+    parser.add_argument("--jitter", type=float, default=20.0, help="Extra random REST latency in ms.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON (for baselines).")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(simulate(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
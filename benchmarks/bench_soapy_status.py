@@ -0,0 +1,281 @@
+"""
+Replay SOAP_STATUS streams through the real SOAPAutomationCog status handler
+against fake Discord objects and report throughput, simulated REST calls per
+transfer and handler latency.
+
+    python3.13 benchmarks/bench_soapy_status.py --transfers 300 --pattern burst
+    python3.13 benchmarks/bench_soapy_status.py --journal journal/events.jsonl --speed 10
+
+Synthetic patterns:
+  steady        transfer starts spread over --ramp seconds
+  burst         every transfer starts at once
+  out-of-order  like steady, but some terminal statuses overtake the progress
+                updates before them
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import fakes
+
+constants = fakes.install_constants()
+fakes.isolate_journal()
+
+import tracing  # noqa: E402
+from soap_automation import SOAPAutomationCog  # noqa: E402
+
+PROGRESS_STEPS = [
+    "SERIAL_CHECK_ATTEMPT",
+    "QUEUED",
+    "CLEANINTY_INIT",
+    "CLEANINTY_SERIAL_CHECK",
+    "ESHOP_REGION_CHANGE_ATTEMPT",
+]
+TRANSFER_STEPS = ["SYSTEM_TRANSFER_ATTEMPT", "SYSTEM_TRANSFER_SUCCESS"]
+LOTTERY_STEPS = ["ESHOP_REGION_CHANGE_SUCCESS", "ESHOP_DELETE_SUCCESS"]
+# Outcome mix for synthetic transfers
+OUTCOME_WEIGHTS = {"SUCCESS": 0.6, "LOTTERY": 0.3, "ERROR": 0.07, "SERIAL_MISMATCH": 0.03}
+# Messages already in a SOAP channel before Soapy starts (welcome, serial prompt, user replies)
+SEEDED_MESSAGES = 8
+PROGRESS_AUTHOR = "🧼 SOAP Transfer - In Progress"
+
+
+class StatusEvent:
+    __slots__ = ("offset", "channel_id", "status", "detail")
+
+    def __init__(self, offset: float, channel_id: int, status: str, detail: str | None = None):
+        self.offset = offset
+        self.channel_id = channel_id
+        self.status = status
+        self.detail = detail
+
+    @property
+    def content(self) -> str:
+        return f"SOAP_STATUS {self.channel_id} {self.status}" + (f" {self.detail}" if self.detail else "")
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in ("SUCCESS", "LOTTERY", "ERROR")
+
+
+def synthetic_stream(
+    transfers: int, pattern: str, ramp: float, step_gap: float, seed: int
+) -> list[StatusEvent]:
+    rng = random.Random(seed)
+    outcomes = list(OUTCOME_WEIGHTS)
+    weights = list(OUTCOME_WEIGHTS.values())
+    events = []
+    for _ in range(transfers):
+        channel_id = fakes.snowflake()
+        start = 0.0 if pattern == "burst" else rng.uniform(0, ramp)
+        outcome = rng.choices(outcomes, weights)[0]
+        serial = f"CW{rng.randrange(10**8):08d}"
+
+        steps: list[tuple[str, str | None]] = [("PROGRESS", "START")]
+        steps += [("PROGRESS", s) for s in PROGRESS_STEPS]
+        if outcome == "SUCCESS":
+            steps += [("PROGRESS", s) for s in TRANSFER_STEPS] + [("SUCCESS", serial)]
+        elif outcome == "LOTTERY":
+            steps += [("PROGRESS", s) for s in LOTTERY_STEPS] + [("LOTTERY", serial)]
+        elif outcome == "SERIAL_MISMATCH":
+            steps = steps[:3] + [("ERROR", "SERIAL_MISMATCH")]
+        else:
+            steps += [("ERROR", f"E{rng.randrange(100, 999)}")]
+
+        at = start
+        timed = []
+        for status, detail in steps:
+            timed.append(StatusEvent(at, channel_id, status, detail))
+            at += step_gap * rng.uniform(0.5, 1.5)
+        if pattern == "out-of-order" and rng.random() < 0.3 and len(timed) > 2:
+            # Terminal status lands just before the last progress update or two
+            overtaken = rng.randint(1, 2)
+            terminal = timed[-1]
+            terminal.offset = timed[-1 - overtaken].offset - step_gap * 0.1
+        events.extend(timed)
+
+    events.sort(key=lambda e: e.offset)
+    return events
+
+
+def recorded_stream(path: Path) -> list[StatusEvent]:
+    """soap_status events from an event journal, timed relative to the first one."""
+    events = []
+    first = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("event") != "soap_status":
+                continue
+            at = datetime.fromisoformat(entry["ts"]).timestamp()
+            first = at if first is None else first
+            events.append(
+                StatusEvent(at - first, int(entry["channel_id"]), entry["status"], entry.get("detail"))
+            )
+    events.sort(key=lambda e: e.offset)
+    return events
+
+
+def build_world(events: list[StatusEvent], rest: fakes.RestRecorder):
+    guild = fakes.FakeGuild(rest)
+    soapy = fakes.FakeUser(fakes.snowflake(), "Soapy", bot=True)
+    guild.add_member(soapy)
+    guild.add_category(constants.SOAP_CHANNEL_CATEGORY_ID, "SOAP")
+    bots_only = guild.add_text_channel("bots-only", channel_id=constants.BOTS_ONLY_CHANNEL_ID)
+
+    for channel_id in dict.fromkeys(e.channel_id for e in events):
+        helpee = guild.add_member(fakes.FakeUser(fakes.snowflake(), "helpee"))
+        channel = guild.add_text_channel(
+            f"helpee{constants.SOAP_CHANNEL_SUFFIX}",
+            channel_id=channel_id,
+            category_id=constants.SOAP_CHANNEL_CATEGORY_ID,
+            topic=f"SOAP channel for {helpee.mention}",
+        )
+        for i in range(SEEDED_MESSAGES):
+            author = guild.me if i % 2 == 0 else helpee
+            channel.add_message(author, "seed")
+    return guild, soapy, bots_only
+
+
+async def replay(events: list[StatusEvent], args) -> dict:
+    rest = fakes.RestRecorder(latency=args.latency / 1000, jitter=args.jitter / 1000, seed=args.seed)
+    guild, soapy, bots_only = build_world(events, rest)
+    bot = fakes.FakeBot(guild)
+    cog = SOAPAutomationCog(bot)
+    bot.add_cog(cog)
+
+    latencies: dict[str, list[float]] = {}
+    errors = Counter()
+
+    async def dispatch(event: StatusEvent):
+        message = bots_only.add_message(soapy, event.content)
+        start = time.perf_counter()
+        try:
+            await cog.handle_status_message(message)
+        except Exception as e:
+            errors[type(e).__name__] += 1
+        kind = event.status if event.status != "PROGRESS" else f"PROGRESS {event.detail}"
+        latencies.setdefault(kind, []).append(time.perf_counter() - start)
+
+    # Like Pycord: every gateway message gets its own task
+    tasks = []
+    start = time.perf_counter()
+    for event in events:
+        if args.speed:
+            delay = event.offset / args.speed - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(dispatch(event)))
+    await asyncio.gather(*tasks)
+    handled = time.perf_counter() - start
+    await fakes.drain()
+    settled = time.perf_counter() - start
+
+    channels = {e.channel_id for e in events}
+    terminal_channels = {e.channel_id for e in events if e.terminal}
+    stray_progress = sum(
+        1
+        for channel_id in terminal_channels
+        for m in guild.get_channel(channel_id).messages
+        if m.embeds and m.embeds[0].author and m.embeds[0].author.name == PROGRESS_AUTHOR
+    )
+    return {
+        "messages": len(events),
+        "transfers": len(channels),
+        "handled_seconds": handled,
+        "settled_seconds": settled,
+        "rest_total": rest.total,
+        "rest_by_route": {f"{m} {r}": n for (m, r), n in rest.calls.most_common()},
+        "rest_max_inflight": rest.max_inflight,
+        "latency": {
+            kind: {
+                "count": len(values),
+                "p50": tracing.percentile(sorted(values), 50),
+                "p95": tracing.percentile(sorted(values), 95),
+                "p99": tracing.percentile(sorted(values), 99),
+                "max": max(values),
+            }
+            for kind, values in sorted(latencies.items())
+        },
+        "stray_progress_messages": stray_progress,
+        "errors": dict(errors),
+    }
+
+
+def print_report(report: dict, args):
+    transfers = report["transfers"] or 1
+    print(
+        f"{report['messages']} status messages, {report['transfers']} transfers, "
+        f"REST latency {args.latency:g}ms (+{args.jitter:g}ms jitter)"
+    )
+    print(
+        f"handled in {report['handled_seconds']:.2f}s "
+        f"({report['messages'] / max(report['handled_seconds'], 1e-9):.0f} msg/s), "
+        f"background work settled at {report['settled_seconds']:.2f}s"
+    )
+    print(
+        f"REST calls: {report['rest_total']} total, "
+        f"{report['rest_total'] / transfers:.1f} per transfer, "
+        f"max {report['rest_max_inflight']} in flight"
+    )
+    for route, count in report["rest_by_route"].items():
+        print(f"  {count:>7}  {count / transfers:>6.1f}/transfer  {route}")
+    print(f"\n{'handler latency':<40} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for kind, row in report["latency"].items():
+        print(
+            f"{kind[:40]:<40} {row['count']:>6} "
+            + " ".join(f"{row[k] * 1000:>6.1f}ms" for k in ("p50", "p95", "p99", "max"))
+        )
+    print(f"\nstray progress messages after terminal status: {report['stray_progress_messages']}")
+    if report["errors"]:
+        print(f"handler exceptions: {report['errors']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transfers", type=int, default=200, help="Synthetic transfers to replay.")
+    parser.add_argument(
+        "--pattern", choices=("steady", "burst", "out-of-order"), default="steady"
+    )
+    parser.add_argument("--ramp", type=float, default=60.0, help="Seconds over which steady transfers start.")
+    parser.add_argument("--step-gap", type=float, default=5.0, help="Mean seconds between a transfer's statuses.")
+    parser.add_argument("--journal", type=Path, help="Replay soap_status events from a journal file instead.")
+    parser.add_argument(
+        "--speed", type=float, default=10.0,
+        help="Replay at N x recorded/synthetic timing (default 10). 0 floods every message at once.",
+    )
+    parser.add_argument("--latency", type=float, default=50.0, help="Simulated REST latency in ms.")
+    parser.add_argument("--jitter", type=float, default=20.0, help="Extra random REST latency in ms.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON (for baselines).")
+    args = parser.parse_args(argv)
+
+    if args.journal:
+        events = recorded_stream(args.journal)
+    else:
+        events = synthetic_stream(args.transfers, args.pattern, args.ramp, args.step_gap, args.seed)
+    if not events:
+        print("No SOAP_STATUS events to replay.")
+        return 1
+
+    report = asyncio.run(replay(events, args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,532 @@
+"""
+Offline stand-ins for the bits of Discord the bot's handlers touch. Every method
+that would hit the REST API goes through a RestRecorder, which sleeps for a
+simulated latency and counts the call by route, so benchmarks can report how
+many requests a code path makes without a live connection.
+"""
+
+import asyncio
+import itertools
+import random
+import re
+import sys
+import tempfile
+import time
+import types
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+EXAMPLE_CONSTANTS = REPO_DIR / "constants.py.example"
+# Fake snowflakes handed to blank IDs in constants.py.example
+FAKE_ID_BASE = 900_000_000_000_000_000
+
+
+def install_constants():
+    """
+    Make the bot's modules importable. A real constants.py is used if present;
+    otherwise one is synthesized from constants.py.example with a distinct fake
+    ID for every blank entry.
+    """
+    if str(REPO_DIR) not in sys.path:
+        sys.path.insert(0, str(REPO_DIR))
+    if "constants" in sys.modules:
+        return sys.modules["constants"]
+    try:
+        import constants
+
+        return constants
+    except ModuleNotFoundError:
+        pass
+
+    counter = itertools.count(1)
+    source = re.sub(
+        r"^(\w+)\s*=\s*(#.*)?$",
+        lambda m: f"{m.group(1)} = {FAKE_ID_BASE + next(counter)}  {m.group(2) or ''}",
+        EXAMPLE_CONSTANTS.read_text(encoding="utf-8"),
+        flags=re.MULTILINE,
+    )
+    module = types.ModuleType("constants")
+    module.__file__ = str(EXAMPLE_CONSTANTS)
+    exec(compile(source, str(EXAMPLE_CONSTANTS), "exec"), module.__dict__)
+    # No sockets or watchdog threads during a benchmark
+    module.METRICS_ENABLED = False
+    module.METRICS_HTTP_PORT = 0
+    module.STALL_THRESHOLD_MS = 0
+    sys.modules["constants"] = module
+    return module
+
+
+def isolate_journal():
+    """Point the event journal and the console registry at a throwaway directory."""
+    import console_registry
+    import journal
+
+    journal.JOURNAL_DIR = Path(tempfile.mkdtemp(prefix="maidy-bench-"))
+    journal.JOURNAL_FILE = journal.JOURNAL_DIR / "events.jsonl"
+    console_registry.REGISTRY_FILE = journal.JOURNAL_DIR / "console_registry.sqlite3"
+    return journal.JOURNAL_DIR
+
+
+_snowflakes = itertools.count(int(time.time() * 1000 - 1420070400000) << 22)
+
+
+def snowflake() -> int:
+    return next(_snowflakes)
+
+
+class RestRecorder:
+    """Counts simulated REST calls per (method, route) and fakes their latency."""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.calls: Counter = Counter()
+        self.inflight = 0
+        self.max_inflight = 0
+        self._random = random.Random(seed)
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    async def call(self, method: str, route: str):
+        self.calls[(method, route)] += 1
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)
+        finally:
+            self.inflight -= 1
+
+
+class FakeUser:
+    def __init__(self, user_id: int, name: str = "user", bot: bool = False):
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.bot = bot
+        self.mention = f"<@{user_id}>"
+        self.roles = []
+
+    def __eq__(self, other):
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeRole:
+    def __init__(self, role_id: int, name: str = "role"):
+        self.id = role_id
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+    def __eq__(self, other):
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeMember(FakeUser):
+    def __init__(self, guild: "FakeGuild", user_id: int, name: str = "member", bot: bool = False):
+        super().__init__(user_id, name, bot)
+        self.guild = guild
+
+    def get_role(self, role_id: int):
+        return next((r for r in self.roles if r.id == role_id), None)
+
+    async def add_roles(self, *roles, reason=None):
+        for role in roles:
+            await self.guild.rest.call("PUT", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}")
+            if role not in self.roles:
+                self.roles.append(role)
+
+    async def remove_roles(self, *roles, reason=None):
+        for role in roles:
+            await self.guild.rest.call("DELETE", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}")
+            if role in self.roles:
+                self.roles.remove(role)
+
+
+class FakeMessage:
+    def __init__(
+        self,
+        channel: "FakeTextChannel",
+        author: FakeUser,
+        content: str | None = None,
+        embeds: list | None = None,
+        view=None,
+        message_id: int | None = None,
+    ):
+        self.id = message_id or snowflake()
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content or ""
+        self.embeds = embeds or []
+        self.attachments = []
+        self.view = view
+        self.created_at = datetime.now(timezone.utc)
+        self.deleted = False
+
+    async def edit(self, content=None, *, embed=None, embeds=None, view=None, **_):
+        await self.channel.rest.call("PATCH", "/channels/{channel_id}/messages/{message_id}")
+        if self.deleted:
+            raise FakeNotFound("Unknown Message")
+        if content is not None:
+            self.content = content
+        if embed is not None:
+            self.embeds = [embed]
+        elif embeds is not None:
+            self.embeds = list(embeds)
+        if view is not None:
+            self.view = view
+        return self
+
+    async def delete(self, *, delay=None, reason=None):
+        if delay:
+            await asyncio.sleep(delay)
+        await self.channel.rest.call("DELETE", "/channels/{channel_id}/messages/{message_id}")
+        if self.deleted:
+            raise FakeNotFound("Unknown Message")
+        self.deleted = True
+        self.channel._forget(self)
+
+
+class FakeNotFound(Exception):
+    pass
+
+
+class FakeTextChannel:
+    def __init__(
+        self,
+        guild: "FakeGuild",
+        channel_id: int,
+        name: str,
+        category_id: int | None = None,
+        topic: str | None = None,
+    ):
+        self.guild = guild
+        self.rest = guild.rest
+        self.id = channel_id
+        self.name = name
+        self.category_id = category_id
+        self.topic = topic
+        self.mention = f"<#{channel_id}>"
+        self.messages: list[FakeMessage] = []
+
+    @property
+    def category(self):
+        return self.guild.get_channel(self.category_id) if self.category_id else None
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/{self.guild.id}/{self.id}"
+
+    async def set_permissions(self, target, *, overwrite=None, reason=None, **permissions):
+        await self.rest.call("PUT", "/channels/{channel_id}/permissions/{overwrite_id}")
+
+    def _forget(self, message: FakeMessage):
+        try:
+            self.messages.remove(message)
+        except ValueError:
+            pass
+
+    def add_message(self, author: FakeUser, content: str = None, **kwargs) -> FakeMessage:
+        """Put a message in the channel without a REST call (e.g. sent by someone else)."""
+        message = FakeMessage(self, author, content, **kwargs)
+        self.messages.append(message)
+        return message
+
+    async def send(self, content=None, *, embed=None, embeds=None, view=None, file=None, files=None, **_):
+        await self.rest.call("POST", "/channels/{channel_id}/messages")
+        if embed is not None:
+            embeds = [embed]
+        return self.add_message(self.guild.me, content, embeds=embeds, view=view)
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self.rest.call("GET", "/channels/{channel_id}/messages/{message_id}")
+        for message in self.messages:
+            if message.id == message_id:
+                return message
+        raise FakeNotFound("Unknown Message")
+
+    async def history(self, limit: int | None = 100, **_):
+        # Pages of 100, newest first, like Pycord's HistoryIterator
+        snapshot = list(reversed(self.messages))
+        if limit is not None:
+            snapshot = snapshot[:limit]
+        for i, message in enumerate(snapshot):
+            if i % 100 == 0:
+                await self.rest.call("GET", "/channels/{channel_id}/messages")
+            yield message
+        if not snapshot:
+            await self.rest.call("GET", "/channels/{channel_id}/messages")
+
+    async def edit(self, **kwargs):
+        await self.rest.call("PATCH", "/channels/{channel_id}")
+        for key, value in kwargs.items():
+            if key == "category":
+                self.category_id = value.id if value else None
+            elif hasattr(self, key):
+                setattr(self, key, value)
+        return self
+
+    async def delete(self, *, reason=None):
+        await self.rest.call("DELETE", "/channels/{channel_id}")
+        if self.guild._channels.pop(self.id, None) is not None:
+            self.guild.dispatch("guild_channel_delete", self)
+
+
+class FakeCategory:
+    def __init__(self, guild: "FakeGuild", category_id: int, name: str):
+        self.guild = guild
+        self.id = category_id
+        self.name = name
+
+    @property
+    def channels(self):
+        return [c for c in self.guild.channels if getattr(c, "category_id", None) == self.id]
+
+    @property
+    def text_channels(self):
+        return self.channels
+
+
+class FakeGuild:
+    def __init__(self, rest: RestRecorder, guild_id: int | None = None, me: FakeUser | None = None):
+        self.rest = rest
+        self.id = guild_id or snowflake()
+        self.name = "Benchmark Guild"
+        self.me = me or FakeUser(snowflake(), "Maidy", bot=True)
+        self._channels: dict[int, object] = {}
+        self._members: dict[int, FakeUser] = {}
+        self._roles: dict[int, FakeRole] = {}
+        self.bot: "FakeBot | None" = None
+
+    def dispatch(self, event: str, *args):
+        """Deliver a gateway event to the bot's listeners, as if it came back over the websocket."""
+        if self.bot is not None:
+            self.bot.dispatch(event, *args)
+
+    @property
+    def channels(self):
+        return list(self._channels.values())
+
+    @property
+    def text_channels(self):
+        return [c for c in self._channels.values() if isinstance(c, FakeTextChannel)]
+
+    @property
+    def categories(self):
+        return [c for c in self._channels.values() if isinstance(c, FakeCategory)]
+
+    @property
+    def members(self):
+        return list(self._members.values())
+
+    @property
+    def roles(self):
+        return list(self._roles.values())
+
+    def get_role(self, role_id: int):
+        return self._roles.get(role_id)
+
+    def add_role(self, role_id: int, name: str = "role") -> FakeRole:
+        role = self._roles[role_id] = FakeRole(role_id, name)
+        return role
+
+    def get_channel(self, channel_id: int):
+        return self._channels.get(channel_id)
+
+    def get_member(self, user_id: int):
+        return self._members.get(user_id)
+
+    def add_member(self, user: FakeUser) -> FakeUser:
+        self._members[user.id] = user
+        return user
+
+    def add_category(self, category_id: int, name: str = "category") -> FakeCategory:
+        category = FakeCategory(self, category_id, name)
+        self._channels[category_id] = category
+        return category
+
+    def add_text_channel(
+        self, name: str, *, channel_id: int | None = None, category_id: int | None = None, topic: str | None = None
+    ) -> FakeTextChannel:
+        channel = FakeTextChannel(self, channel_id or snowflake(), name, category_id, topic)
+        self._channels[channel.id] = channel
+        return channel
+
+    async def create_text_channel(self, name: str, *, category=None, topic=None, overwrites=None, reason=None, **_):
+        await self.rest.call("POST", "/guilds/{guild_id}/channels")
+        channel = self.add_text_channel(
+            name, category_id=category.id if category else None, topic=topic
+        )
+        self.dispatch("guild_channel_create", channel)
+        return channel
+
+
+class FakeBot:
+    """Just enough of commands.Bot for cogs under benchmark."""
+
+    def __init__(self, guild: FakeGuild):
+        self.user = guild.me
+        self.guilds = [guild]
+        self.loop = asyncio.get_running_loop()
+        self._cogs: dict[str, object] = {}
+        self._listeners: dict[str, list] = {}
+        self.views: list = []
+        guild.bot = self
+
+    def add_cog(self, cog):
+        self._cogs[type(cog).__name__] = cog
+        # Wire up the cog's @commands.Cog.listener()s like Pycord would
+        for name, method in getattr(cog, "get_listeners", lambda: [])():
+            self.add_listener(method, name)
+
+    def add_listener(self, func, name: str):
+        self._listeners.setdefault(name, []).append(func)
+
+    def dispatch(self, event: str, *args):
+        for func in self._listeners.get(f"on_{event}", []):
+            asyncio.create_task(func(*args), name=f"pycord: on_{event}")
+
+    def get_cog(self, name: str):
+        return self._cogs.get(name)
+
+    def get_guild(self, guild_id: int):
+        return next((g for g in self.guilds if g.id == guild_id), None)
+
+    def add_view(self, view, message_id=None):
+        self.views.append(view)
+
+
+async def drain(timeout: float = 30.0):
+    """Wait for background tasks the handlers spawned (progress deletes etc.)."""
+    current = asyncio.current_task()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        pending = [t for t in asyncio.all_tasks() if t is not current and not t.done()]
+        if not pending:
+            return
+        await asyncio.wait(pending, timeout=max(0.0, deadline - time.monotonic()))
+
+
+class FakeInteractionResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._responded = False
+
+    def is_done(self) -> bool:
+        return self._responded
+
+    async def _respond(self):
+        if self._responded:
+            raise FakeInteractionResponded("This interaction has already been responded to before")
+        self._responded = True
+        await self._interaction.rest.call("POST", "/interactions/{interaction_id}/{token}/callback")
+
+    async def send_message(self, content=None, *, embed=None, embeds=None, view=None, ephemeral=False, **_):
+        await self._respond()
+        channel = self._interaction.channel
+        self._interaction.sent = FakeMessage(
+            channel, self._interaction.client.user, content,
+            embeds=[embed] if embed is not None else embeds, view=view,
+        )
+        return self._interaction
+
+    async def edit_message(self, content=None, *, embed=None, embeds=None, view=..., **_):
+        await self._respond()
+        message = self._interaction.message
+        if embed is not None:
+            message.embeds = [embed]
+        elif embeds is not None:
+            message.embeds = list(embeds)
+        if content is not None:
+            message.content = content
+        if view is not ...:
+            message.view = view
+
+    async def defer(self, *, ephemeral=False, invisible=True):
+        await self._respond()
+
+    async def send_modal(self, modal):
+        await self._respond()
+        self._interaction.sent_modal = modal
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, content=None, *, embed=None, embeds=None, view=None, ephemeral=False, **_):
+        await self._interaction.rest.call("POST", "/webhooks/{application_id}/{token}")
+        return FakeMessage(
+            self._interaction.channel, self._interaction.client.user, content,
+            embeds=[embed] if embed is not None else embeds, view=view,
+        )
+
+    async def edit_message(self, message_id: int, *, content=None, embed=None, embeds=None, view=..., **_):
+        await self._interaction.rest.call("PATCH", "/webhooks/{application_id}/{token}/messages/{message_id}")
+        message = self._interaction.message
+        if embed is not None:
+            message.embeds = [embed]
+        elif embeds is not None:
+            message.embeds = list(embeds)
+        if content is not None:
+            message.content = content
+        if view is not ...:
+            message.view = view
+
+
+class FakeInteractionResponded(Exception):
+    pass
+
+
+class FakeInteraction:
+    """A component interaction on `message`, clicked by `user`."""
+
+    def __init__(self, bot: FakeBot, user: FakeMember, message: FakeMessage, values: list[str] | None = None):
+        self.id = snowflake()
+        self.client = bot
+        self.user = user
+        self.guild = message.guild
+        self.guild_id = message.guild.id
+        self.channel = message.channel
+        self.channel_id = message.channel.id
+        self.message = message
+        self.rest = message.guild.rest
+        self.data = {"values": values or []}
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeFollowup(self)
+        # What the handler sent back, for driving the next step
+        self.sent: FakeMessage | None = None
+        self.sent_modal = None
+
+
+def find_item(view, *, custom_id: str | None = None, item_type=None):
+    """A view's component by custom_id, or the first of a type."""
+    for item in view.children:
+        if custom_id is not None and getattr(item, "custom_id", None) == custom_id:
+            return item
+        if custom_id is None and item_type is not None and isinstance(item, item_type):
+            return item
+    raise LookupError(f"{type(view).__name__} has no component {custom_id or item_type}")
+
+
+async def click(bot: FakeBot, user: FakeMember, message: FakeMessage, item, values: list[str] | None = None):
+    """Run a component callback the way Pycord does after an INTERACTION_CREATE."""
+    interaction = FakeInteraction(bot, user, message, values)
+    if values is not None:
+        item._selected_values = list(values)
+        item._interaction = interaction
+    await item.callback(interaction)
+    return interaction
@@ -0,0 +1,253 @@
+import asyncio
+import discord
+import re
+from enum import Enum
+from discord.ext import commands
+from constants import (
+    SOAP_CHANNEL_SUFFIX,
+    NNID_CHANNEL_SUFFIX,
+    SOAP_CHANNEL_CATEGORY_ID,
+    MANUAL_SOAP_CATEGORY_ID,
+    NNID_CHANNEL_CATEGORY_ID,
+    TEMP_ARCHIVE_CATEGORY_ID,
+    SOAP_USABLE_IDS,
+)
+
+
+class ChannelKind(Enum):
+    SOAP_AUTO = "soap_auto"
+    SOAP_MANUAL = "soap_manual"
+    NNID = "nnid"
+    ARCHIVED = "archived"
+    OTHER = "other"
+
+    @property
+    def is_soap(self) -> bool:
+        return self in (ChannelKind.SOAP_AUTO, ChannelKind.SOAP_MANUAL)
+
+    @property
+    def is_transfer(self) -> bool:
+        """SOAP (auto or manual) or NNID channel that is still open."""
+        return self.is_soap or self is ChannelKind.NNID
+
+
+# Category ID sets per kind, built once at import
+SOAP_CATEGORY_IDS = frozenset({SOAP_CHANNEL_CATEGORY_ID, MANUAL_SOAP_CATEGORY_ID})
+NNID_CATEGORY_IDS = frozenset({NNID_CHANNEL_CATEGORY_ID})
+ARCHIVE_CATEGORY_IDS = (
+    frozenset({TEMP_ARCHIVE_CATEGORY_ID}) if TEMP_ARCHIVE_CATEGORY_ID else frozenset()
+)
+SOAP_USABLE_CATEGORY_IDS = frozenset(SOAP_USABLE_IDS)
+
+# channel_id -> kind, dropped when the channel is updated or deleted
+_kind_cache: dict[int, ChannelKind] = {}
+
+# Helpee mentions in SOAP/NNID channel topics
+_OWNER_RE = re.compile(r"<@!?(\d+)>")
+
+# guild_id -> owner_id -> ids of that owner's open SOAP/NNID channels.
+# Built lazily per guild on first lookup, then kept current by ChannelIndexCog.
+_owner_index: dict[int, dict[int, set[int]]] = {}
+# channel_id -> owner ids it is filed under, so updates/deletes can unfile it
+_channel_owners: dict[int, frozenset[int]] = {}
+
+# (guild_id, "soap" | "nnid", owner_id) -> channel creation in progress
+_creating: dict[tuple[int, str, int], asyncio.Future] = {}
+
+
+def _classify(channel) -> ChannelKind:
+    category_id = getattr(channel, "category_id", None)
+    if category_id is None:
+        return ChannelKind.OTHER
+    if category_id in ARCHIVE_CATEGORY_IDS:
+        return ChannelKind.ARCHIVED
+    if category_id == MANUAL_SOAP_CATEGORY_ID:
+        return ChannelKind.SOAP_MANUAL
+    name = getattr(channel, "name", None) or ""
+    if category_id == SOAP_CHANNEL_CATEGORY_ID and name.endswith(SOAP_CHANNEL_SUFFIX):
+        return ChannelKind.SOAP_AUTO
+    if category_id in NNID_CATEGORY_IDS and name.endswith(NNID_CHANNEL_SUFFIX):
+        return ChannelKind.NNID
+    return ChannelKind.OTHER
+
+
+def classify_channel(channel) -> ChannelKind:
+    """Return the cached kind of a channel, classifying it on first use."""
+    if channel is None:
+        return ChannelKind.OTHER
+    kind = _kind_cache.get(channel.id)
+    if kind is None:
+        kind = _kind_cache[channel.id] = _classify(channel)
+    return kind
+
+
+def invalidate_channel(channel_id: int) -> None:
+    """Forget a channel's kind (its name or category changed, or it was deleted)."""
+    _kind_cache.pop(channel_id, None)
+
+
+def is_soap_usable(channel) -> bool:
+    """Whether SOAP channel commands may be used in this channel (any channel in SOAP_USABLE_IDS)."""
+    return getattr(channel, "category_id", None) in SOAP_USABLE_CATEGORY_IDS
+
+
+def _unindex_channel(guild_id: int, channel_id: int) -> None:
+    owners = _channel_owners.pop(channel_id, None)
+    if not owners:
+        return
+    by_owner = _owner_index.get(guild_id)
+    if by_owner is None:
+        return
+    for owner_id in owners:
+        ids = by_owner.get(owner_id)
+        if ids is None:
+            continue
+        ids.discard(channel_id)
+        if not ids:
+            del by_owner[owner_id]
+
+
+def _index_channel(channel) -> None:
+    by_owner = _owner_index.get(channel.guild.id)
+    if by_owner is None:
+        return  # guild not indexed yet, the first lookup will scan it
+    _unindex_channel(channel.guild.id, channel.id)
+    if not classify_channel(channel).is_transfer:
+        return
+    owners = frozenset(int(m) for m in _OWNER_RE.findall(getattr(channel, "topic", None) or ""))
+    if not owners:
+        return
+    _channel_owners[channel.id] = owners
+    for owner_id in owners:
+        by_owner.setdefault(owner_id, set()).add(channel.id)
+
+
+def _build_owner_index(guild: discord.Guild) -> dict[int, set[int]]:
+    by_owner = _owner_index[guild.id] = {}
+    for channel in guild.text_channels:
+        _index_channel(channel)
+    return by_owner
+
+
+def register_channel(channel) -> None:
+    """File a freshly created/edited channel under its topic owner(s) right away."""
+    invalidate_channel(channel.id)
+    _index_channel(channel)
+
+
+def channel_owner(channel) -> int | None:
+    """The helpee mentioned first in a SOAP/NNID channel's topic."""
+    match = _OWNER_RE.search(getattr(channel, "topic", None) or "")
+    return int(match.group(1)) if match else None
+
+
+def is_channel_owner(guild_id: int, user_id: int) -> bool:
+    """Whether the user owns an open SOAP/NNID channel. False until the guild is indexed (never scans)."""
+    by_owner = _owner_index.get(guild_id)
+    return by_owner is not None and user_id in by_owner
+
+
+def channels_owned_by(guild: discord.Guild, user_id: int) -> list[discord.TextChannel]:
+    """Open SOAP/NNID channels whose topic mentions the given user."""
+    by_owner = _owner_index.get(guild.id)
+    if by_owner is None:
+        by_owner = _build_owner_index(guild)
+    channels = []
+    for channel_id in by_owner.get(user_id, ()):
+        channel = guild.get_channel(channel_id)
+        if channel is not None:
+            channels.append(channel)
+    return channels
+
+
+def soap_channels_owned_by(guild: discord.Guild, user_id: int) -> list[discord.TextChannel]:
+    """Open SOAP (auto or manual) channels whose topic mentions the given user."""
+    return [c for c in channels_owned_by(guild, user_id) if classify_channel(c).is_soap]
+
+
+def nnid_channels_owned_by(guild: discord.Guild, user_id: int) -> list[discord.TextChannel]:
+    """Open NNID channels whose topic mentions the given user."""
+    return [c for c in channels_owned_by(guild, user_id) if classify_channel(c) is ChannelKind.NNID]
+
+
+_OWNED_BY_KIND = {"soap": soap_channels_owned_by, "nnid": nnid_channels_owned_by}
+
+
+async def create_channel_once(guild: discord.Guild, kind: str, user_id: int, create):
+    """
+    Get or create a user's "soap" or "nnid" channel, at most one at a time.
+
+    Returns (channel, created). An open channel the user already owns is returned
+    as is. Otherwise the slot is reserved before `create()` makes its REST call,
+    so concurrent requests (double clicks, a staff command racing a button) wait
+    for that one creation and get the same channel back with created=False.
+    """
+    key = (guild.id, kind, user_id)
+    while (future := _creating.get(key)) is not None:
+        try:
+            return await asyncio.shield(future), False
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise  # we were cancelled ourselves
+            # The creating task was cancelled, try again ourselves
+
+    existing = _OWNED_BY_KIND[kind](guild, user_id)
+    if existing:
+        return existing[0], False
+
+    future = _creating[key] = asyncio.get_running_loop().create_future()
+    # Nobody may be waiting, so don't let an unretrieved exception get logged
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    try:
+        channel = await create()
+        # Index it now rather than when the gateway event arrives
+        register_channel(channel)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(channel)
+        return channel, True
+    finally:
+        del _creating[key]
+
+
+class ChannelIndexCog(commands.Cog):
+    """Keeps the channel classification cache and owner index in sync with the guild."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    def export_state(self) -> dict:
+        return {
+            "kind_cache": _kind_cache,
+            "owner_index": _owner_index,
+            "channel_owners": _channel_owners,
+        }
+
+    def import_state(self, state: dict):
+        _kind_cache.update(state["kind_cache"])
+        _owner_index.update(state["owner_index"])
+        _channel_owners.update(state["channel_owners"])
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        register_channel(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ):
+        register_channel(after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        invalidate_channel(channel.id)
+        _unindex_channel(channel.guild.id, channel.id)
+
+
+def setup(bot: commands.Bot):
+    bot.add_cog(ChannelIndexCog(bot))
@@ -0,0 +1,91 @@
+"""
+Persistent component routing. Routed custom_ids look like "<family>" or
+"<family>:<params>" (e.g. "soap_helper_dropdown:eshop_issue"); a route maps the
+family to one handler that gets the interaction and the params, so every
+context encoded in the suffix is served without a View per context held in
+the view store. Views that still need Pycord's view store are declared with
+persistent_view() and added to the bot exactly once, before it connects
+(main.py), not on every on_ready.
+"""
+
+from typing import Awaitable, Callable, Iterable
+
+import discord
+from discord.ext import commands
+
+import metrics
+
+Handler = Callable[[discord.Interaction, str], Awaitable[None]]
+
+_routes: dict[str, Handler] = {}
+_views: dict[str, Callable[[commands.Bot], discord.ui.View]] = {}
+
+
+def route(family: str):
+    """Register the decorated coroutine as the handler for a custom_id family."""
+
+    def decorator(handler: Handler) -> Handler:
+        _routes[family] = handler
+        return handler
+
+    return decorator
+
+
+def resolve(custom_id: str) -> tuple[Handler, str] | None:
+    """(handler, params) for a routed custom_id, or None if no route matches."""
+    family, _, params = custom_id.partition(":")
+    handler = _routes.get(family)
+    if handler is None:
+        return None
+    return handler, params
+
+
+def persistent_view(name: str, factory: Callable[[commands.Bot], discord.ui.View]):
+    """Declare a persistent view to be added to the bot once it's ready."""
+    _views[name] = factory
+
+
+class ComponentsCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.registered: set[str] = set()
+
+    def register_views(self, refresh: Iterable[str] = ()):
+        """
+        Add every declared persistent view that isn't registered yet, and re-add
+        the ones declared by the modules in refresh (after a reload). Pycord's
+        view store replaces entries by custom_id, so there's no gap in between.
+        """
+        refresh = set(refresh)
+        for name, factory in _views.items():
+            if name in self.registered and factory.__module__ not in refresh:
+                continue
+            self.bot.add_view(factory(self.bot))
+            self.registered.add(name)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Views declared by extensions loaded later; register_views skips what's done
+        self.register_views()
+
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction: discord.Interaction):
+        if interaction.type is not discord.InteractionType.component:
+            return
+        # Already handled by a view in Pycord's view store
+        if interaction.view is not None:
+            return
+        resolved = resolve(interaction.custom_id or "")
+        if resolved is None:
+            return
+
+        handler, params = resolved
+        family = interaction.custom_id.partition(":")[0]
+        try:
+            await metrics.timed("view", f"route:{family}", handler(interaction, params))
+        except Exception as e:
+            print(f"Error handling component {interaction.custom_id}: {e}")
+
+
+def setup(bot: commands.Bot):
+    bot.add_cog(ComponentsCog(bot))
@@ -0,0 +1,324 @@
+"""
+Local registry of consoles seen in SOAP/NNID channels, kept in SQLite.
+Uploaded console files are keyed by their SHA-256 and by the serial read from
+them, and Soapy's outcomes are recorded per serial, so Soapers can see when a
+console has been through a transfer before and whether it is still inside the
+7-day system-transfer cooldown. Queries run on a worker thread.
+
+Serials also get an in-memory index (serial -> SerialRecord), built from the
+database on first use and kept current by every write, so a serial's
+transfers, helpees and open channels are a dict lookup away.
+
+Serials are stored as SecureInfo has them, without the check digit printed on
+the console's sticker; normalize_serial() strips it from entered serials.
+"""
+
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+REGISTRY_FILE = Path(__file__).parent / "console_registry.sqlite3"
+# A system transfer locks both consoles out of another one for this long
+SYSTEM_TRANSFER_COOLDOWN = timedelta(days=7)
+# Outcomes that involved a system transfer (a lottery doesn't)
+COOLDOWN_OUTCOMES = ("SUCCESS",)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    sha256 TEXT NOT NULL,
+    serial TEXT,
+    guild_id INTEGER,
+    channel_id INTEGER NOT NULL,
+    user_id INTEGER,
+    filename TEXT,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS uploads_sha256 ON uploads (sha256);
+CREATE INDEX IF NOT EXISTS uploads_serial ON uploads (serial);
+CREATE INDEX IF NOT EXISTS uploads_channel ON uploads (channel_id);
+CREATE TABLE IF NOT EXISTS transfers (
+    serial TEXT,
+    outcome TEXT NOT NULL,
+    detail TEXT,
+    channel_id INTEGER NOT NULL,
+    user_id INTEGER,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transfers_serial ON transfers (serial);
+CREATE TABLE IF NOT EXISTS serial_entries (
+    serial TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    user_id INTEGER,
+    at REAL NOT NULL
+);
+"""
+
+_conn: sqlite3.Connection | None = None
+_lock = threading.Lock()
+# serial -> record, None until first built (under _lock)
+_index: "dict[str, SerialRecord] | None" = None
+
+
+class Upload:
+    __slots__ = ("sha256", "serial", "channel_id", "user_id", "filename", "at")
+
+    def __init__(self, sha256, serial, channel_id, user_id, filename, at):
+        self.sha256 = sha256
+        self.serial = serial
+        self.channel_id = channel_id
+        self.user_id = user_id
+        self.filename = filename
+        self.at = at
+
+
+class Transfer:
+    __slots__ = ("serial", "outcome", "detail", "channel_id", "user_id", "at")
+
+    def __init__(self, serial, outcome, detail, channel_id, user_id, at):
+        self.serial = serial
+        self.outcome = outcome
+        self.detail = detail
+        self.channel_id = channel_id
+        self.user_id = user_id
+        self.at = at
+
+
+def _cooldown_end(transfers_newest_first) -> datetime | None:
+    for transfer in transfers_newest_first:
+        if transfer.outcome in COOLDOWN_OUTCOMES:
+            ends = datetime.fromtimestamp(transfer.at, timezone.utc) + SYSTEM_TRANSFER_COOLDOWN
+            return ends if ends > datetime.now(timezone.utc) else None
+    return None
+
+
+class SerialRecord:
+    """Everything known about one serial: Soapy outcomes and the channels it was entered in."""
+
+    __slots__ = ("serial", "transfers", "channels")
+
+    def __init__(self, serial: str):
+        self.serial = serial
+        # Oldest first
+        self.transfers: list[Transfer] = []
+        # channel_id -> helpee id, in the order the serial was entered
+        self.channels: dict[int, int | None] = {}
+
+    def cooldown_ends(self) -> datetime | None:
+        """When the system-transfer cooldown from the latest SUCCESS ends, if it hasn't yet."""
+        return _cooldown_end(reversed(self.transfers))
+
+
+class ConsoleHistory:
+    """Past uploads of the same file or serial, and transfers of that serial, newest first."""
+
+    __slots__ = ("uploads", "transfers")
+
+    def __init__(self, uploads: list[Upload], transfers: list[Transfer]):
+        self.uploads = uploads
+        self.transfers = transfers
+
+    def __bool__(self) -> bool:
+        return bool(self.uploads or self.transfers)
+
+    def cooldown_ends(self) -> datetime | None:
+        """When the system-transfer cooldown from the latest SUCCESS ends, if it hasn't yet."""
+        return _cooldown_end(self.transfers)
+
+
+# A sticker serial: the SecureInfo serial (2-3 letters, 8 digits) and a check digit
+_CHECK_DIGIT_SERIAL = re.compile(r"^([A-Z]{2,3}\d{8})\d$")
+
+
+def normalize_serial(serial: str | None) -> str | None:
+    """A serial the way the registry stores it: upper case, no spaces, no check digit."""
+    if serial is None:
+        return None
+    serial = re.sub(r"\s+", "", serial).upper()
+    match = _CHECK_DIGIT_SERIAL.match(serial)
+    return match.group(1) if match else serial
+
+
+def _normalize_stored(conn: sqlite3.Connection):
+    """Strip check digits from serials recorded before they were normalized."""
+    with conn:
+        for table in ("uploads", "transfers", "serial_entries"):
+            rows = conn.execute(f"SELECT DISTINCT serial FROM {table} WHERE serial IS NOT NULL").fetchall()
+            for (serial,) in rows:
+                normalized = normalize_serial(serial)
+                if normalized != serial:
+                    conn.execute(f"UPDATE {table} SET serial = ? WHERE serial = ?", (normalized, serial))
+
+
+def _connection() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(REGISTRY_FILE, check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.executescript(_SCHEMA)
+        _normalize_stored(_conn)
+    return _conn
+
+
+def _write(sql: str, params: tuple):
+    with _lock:
+        conn = _connection()
+        with conn:
+            conn.execute(sql, params)
+
+
+def _record_for(index: dict[str, SerialRecord], serial: str) -> SerialRecord:
+    record = index.get(serial)
+    if record is None:
+        record = index[serial] = SerialRecord(serial)
+    return record
+
+
+def _build_index():
+    """Load the serial index from the database. Call with _lock held."""
+    global _index
+    if _index is not None:
+        return
+    conn = _connection()
+    # Built aside so the loop never sees a half-loaded index
+    index: dict[str, SerialRecord] = {}
+    for row in conn.execute(
+        "SELECT serial, outcome, detail, channel_id, user_id, at FROM transfers "
+        "WHERE serial IS NOT NULL ORDER BY at"
+    ):
+        _record_for(index, row[0]).transfers.append(Transfer(*row))
+    for serial, channel_id, user_id, _ in conn.execute(
+        "SELECT serial, channel_id, user_id, at FROM serial_entries ORDER BY at"
+    ):
+        _record_for(index, serial).channels[channel_id] = user_id
+    _index = index
+
+
+def _load_index():
+    with _lock:
+        _build_index()
+
+
+def _read(sql: str, params: tuple) -> list[tuple]:
+    with _lock:
+        return _connection().execute(sql, params).fetchall()
+
+
+def _lookup(sha256: str | None, serial: str | None, exclude_channel_id: int | None) -> ConsoleHistory:
+    exclude = exclude_channel_id if exclude_channel_id is not None else -1
+    uploads = [
+        Upload(*row)
+        for row in _read(
+            "SELECT sha256, serial, channel_id, user_id, filename, at FROM uploads "
+            "WHERE (sha256 = ? OR serial = ?) AND channel_id != ? ORDER BY at DESC LIMIT 20",
+            (sha256, serial, exclude),
+        )
+    ]
+    transfers = []
+    if serial:
+        transfers = [
+            Transfer(*row)
+            for row in _read(
+                "SELECT serial, outcome, detail, channel_id, user_id, at FROM transfers "
+                "WHERE serial = ? AND channel_id != ? ORDER BY at DESC LIMIT 20",
+                (serial, exclude),
+            )
+        ]
+    return ConsoleHistory(uploads, transfers)
+
+
+def _record_transfer(channel_id, outcome, serial, detail, user_id, at):
+    if serial is None:
+        # Soapy only reports the serial on success; fall back to the channel's upload or entry
+        rows = _read(
+            "SELECT serial, at FROM uploads WHERE channel_id = ? AND serial IS NOT NULL "
+            "UNION ALL SELECT serial, at FROM serial_entries WHERE channel_id = ? "
+            "ORDER BY at DESC LIMIT 1",
+            (channel_id, channel_id),
+        )
+        serial = rows[0][0] if rows else None
+    with _lock:
+        _build_index()
+        conn = _connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO transfers (serial, outcome, detail, channel_id, user_id, at) VALUES (?, ?, ?, ?, ?, ?)",
+                (serial, outcome, detail, channel_id, user_id, at),
+            )
+        if serial is not None:
+            _record_for(_index, serial).transfers.append(Transfer(serial, outcome, detail, channel_id, user_id, at))
+
+
+def _record_serial_entry(serial, channel_id, user_id, at):
+    with _lock:
+        _build_index()
+        conn = _connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO serial_entries (serial, channel_id, user_id, at) VALUES (?, ?, ?, ?)",
+                (serial, channel_id, user_id, at),
+            )
+        _record_for(_index, serial).channels[channel_id] = user_id
+
+
+async def record_upload(
+    sha256: str, serial: str | None, guild_id: int, channel_id: int, user_id: int, filename: str
+):
+    try:
+        await asyncio.to_thread(
+            _write,
+            "INSERT INTO uploads (sha256, serial, guild_id, channel_id, user_id, filename, at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (sha256, normalize_serial(serial), guild_id, channel_id, user_id, filename, time.time()),
+        )
+    except sqlite3.Error as e:
+        print(f"Error recording upload of {filename} in {channel_id}: {e}")
+
+
+async def record_transfer(
+    channel_id: int,
+    outcome: str,
+    serial: str | None = None,
+    detail: str | None = None,
+    user_id: int | None = None,
+):
+    """Record a Soapy outcome. Without a serial, the channel's last uploaded file's serial is used."""
+    try:
+        await asyncio.to_thread(
+            _record_transfer, channel_id, outcome, normalize_serial(serial), detail, user_id, time.time()
+        )
+    except sqlite3.Error as e:
+        print(f"Error recording {outcome} for {channel_id}: {e}")
+
+
+async def record_serial_entry(serial: str, channel_id: int, user_id: int | None):
+    """Record that a helpee entered this serial in a channel (SerialNumberModal)."""
+    try:
+        await asyncio.to_thread(_record_serial_entry, normalize_serial(serial), channel_id, user_id, time.time())
+    except sqlite3.Error as e:
+        print(f"Error recording serial {serial} for {channel_id}: {e}")
+
+
+async def serial_record(serial: str) -> SerialRecord | None:
+    """The index entry for a serial. Only the first call (building the index) leaves the loop."""
+    if _index is None:
+        try:
+            await asyncio.to_thread(_load_index)
+        except sqlite3.Error as e:
+            print(f"Error loading the serial index: {e}")
+            return None
+    return _index.get(normalize_serial(serial))
+
+
+async def lookup(
+    sha256: str | None = None, serial: str | None = None, exclude_channel_id: int | None = None
+) -> ConsoleHistory:
+    """History of a console file or serial outside the given channel."""
+    try:
+        return await asyncio.to_thread(_lookup, sha256, normalize_serial(serial), exclude_channel_id)
+    except sqlite3.Error as e:
+        print(f"Error looking up console {serial or sha256}: {e}")
+        return ConsoleHistory([], [])
@@ -0,0 +1,201 @@
+import discord
+from discord.ext import commands
+from discord.ext.bridge import BridgeOption
+from perms import command_with_perms
+import jobs
+import message_cache
+import metrics
+import profiler
+import watchdog
+from constants import ERROR_LOG_ID
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f}ms" if seconds < 10 else f"{seconds:.0f}s"
+
+
+def _code_block(lines: list[str], limit: int = 1024) -> str:
+    """Fit lines into a code block within an embed field limit."""
+    out = []
+    size = 8  # backticks and newlines
+    for line in lines:
+        if size + len(line) + 1 > limit:
+            break
+        out.append(line)
+        size += len(line) + 1
+    return "```\n" + "\n".join(out) + "\n```"
+
+
+class DiagnosticsCog(commands.Cog):
+    """Developer-only views into the bot's runtime health."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @command_with_perms(
+        min_role="Developer",
+        name="metrics",
+        help="Show handler timings, loop lag and REST usage since startup. Developers only.",
+    )
+    async def metrics_command(self, ctx):
+        """Summarize the slowest handlers, event loop lag and busiest REST routes."""
+        if not metrics.enabled():
+            return await ctx.respond(
+                "Metrics are disabled (METRICS_ENABLED in constants.py).", ephemeral=True
+            )
+
+        embed = discord.Embed(title="📈 Metrics", color=discord.Color.blurple())
+
+        lag = metrics.loop_lag.series.get(("loop",))
+        if lag is not None:
+            q = metrics.Histogram.quantile
+            embed.add_field(
+                name="Event loop lag",
+                value=f"p50 ≤{_ms(q(lag, 0.5))} • p95 ≤{_ms(q(lag, 0.95))} • "
+                f"p99 ≤{_ms(q(lag, 0.99))} • max {_ms(lag.max)} ({lag.count} samples)",
+                inline=False,
+            )
+
+        # Handlers that spent the most total time on the loop
+        handlers = sorted(
+            metrics.handler_seconds.series.items(), key=lambda kv: kv[1].sum, reverse=True
+        )
+        lines = [f"{'handler':<40} {'n':>6} {'avg':>6} {'p95':>7} {'max':>6} err"]
+        for (kind, name), series in handlers[:12]:
+            avg = series.sum / series.count if series.count else 0.0
+            errors = metrics.handler_errors.values.get((kind, name), 0)
+            label = f"{kind[0]} {name}"[:40]
+            lines.append(
+                f"{label:<40} {series.count:>6} {_ms(avg):>6} "
+                f"≤{_ms(metrics.Histogram.quantile(series, 0.95)):>6} {_ms(series.max):>6} {errors}"
+            )
+        embed.add_field(name="Handlers (by total time)", value=_code_block(lines), inline=False)
+
+        inflight = [
+            f"{kind[0]} {name}"[:44] + f" {count}"
+            for (kind, name), count in metrics.handler_inflight.values.items()
+            if count
+        ]
+        if inflight:
+            embed.add_field(name="In flight", value=_code_block(inflight), inline=False)
+
+        routes = sorted(metrics.rest_requests.values.items(), key=lambda kv: kv[1], reverse=True)
+        lines = []
+        for (method, path), count in routes[:10]:
+            series = metrics.rest_seconds.series.get((method, path))
+            avg = series.sum / series.count if series and series.count else 0.0
+            lines.append(f"{count:>6} {_ms(avg):>6} {method} {path}"[:80])
+        if lines:
+            embed.add_field(name="REST calls (count, avg)", value=_code_block(lines), inline=False)
+
+        routes = sorted(metrics.messages_routed.values.items(), key=lambda kv: kv[1], reverse=True)
+        total = sum(count for _, count in routes)
+        lines = [f"{count:>7} {count / total:>4.0%} {route}" for (route,), count in routes]
+        if lines:
+            embed.add_field(name="Messages by route", value=_code_block(lines), inline=False)
+
+        lines = [f"{cached:>7}/{size:<7} {pool}" for pool, (cached, size) in message_cache.stats().items()]
+        embed.add_field(name="Message cache", value=_code_block(lines), inline=False)
+
+        if jobs.queued():
+            counts = await jobs.counts()
+            embed.add_field(
+                name="Job queue",
+                value=" • ".join(f"{n} {status}" for status, n in sorted(counts.items())) or "empty",
+                inline=False,
+            )
+
+        embed.set_footer(text="l=listener c=command v=view m=modal • p95 is a bucket upper bound")
+        await ctx.respond(embed=embed, ephemeral=True)
+
+    @command_with_perms(
+        min_role="Developer",
+        name="stalls",
+        help="Show the code paths that blocked the event loop the longest. Developers only.",
+    )
+    async def stalls(self, ctx):
+        """Summarize captured event-loop stalls, worst offenders first."""
+        rows = watchdog.worst_offenders(limit=8)
+        if not rows:
+            return await ctx.respond(
+                "No event loop stalls captured since startup.", ephemeral=True
+            )
+
+        embed = discord.Embed(
+            title="🐢 Event loop stalls",
+            description=f"{len(watchdog.samples)} stalls over {watchdog.STALL_THRESHOLD_MS}ms captured (by total time blocked).",
+            color=discord.Color.orange(),
+        )
+        for task, location, count, total, worst, sample in rows[:5]:
+            embed.add_field(
+                name=f"{location} • {count}× • total {_ms(total)} • max {_ms(worst)}"[:256],
+                value=f"Task: `{task}`\n" + _code_block(sample.format_stack(limit=5).splitlines(), limit=900),
+                inline=False,
+            )
+        for task, location, count, total, worst, _ in rows[5:]:
+            embed.add_field(
+                name=f"{location}"[:256],
+                value=f"`{task}` • {count}× • total {_ms(total)} • max {_ms(worst)}",
+                inline=False,
+            )
+        await ctx.respond(embed=embed, ephemeral=True)
+
+    @command_with_perms(
+        min_role="Developer",
+        name="profile",
+        help="Profile the bot for N seconds (default 30) and upload the stacks to the error log. Developers only.",
+    )
+    async def profile(
+        self,
+        ctx,
+        seconds: BridgeOption(int, "How long to sample, in seconds", required=False) = 30,
+    ):
+        """Run the sampling profiler and post the collapsed stacks to the error log channel."""
+        if profiler.is_running():
+            return await ctx.respond("A profile is already running.", ephemeral=True)
+        seconds = max(1, min(seconds, profiler.MAX_PROFILE_SECONDS))
+        await ctx.respond(f"🔬 Profiling for {seconds}s...", ephemeral=True)
+
+        try:
+            result = await profiler.profile(seconds)
+        except RuntimeError as e:
+            return await ctx.respond(str(e), ephemeral=True)
+
+        busy = result.busy_samples()
+        embed = discord.Embed(
+            title="🔬 Profile",
+            description=f"{result.samples} samples over {result.duration:.0f}s • "
+            f"loop busy {busy / result.samples:.0%} of the time"
+            if result.samples
+            else "No samples collected.",
+            color=discord.Color.blurple(),
+        )
+
+        def share(count: int) -> str:
+            return f"{count / busy:>4.0%}" if busy else "  -"
+
+        tasks = [f"{share(n)} {task}"[:80] for task, n in result.top_tasks(8)]
+        if tasks:
+            embed.add_field(name="Busy time by task", value=_code_block(tasks), inline=False)
+        functions = [f"{share(n)} {func}"[:80] for func, n in result.top_functions(8)]
+        if functions:
+            embed.add_field(name="Busy time by function", value=_code_block(functions), inline=False)
+        embed.set_footer(
+            text=f"{result.path.name} • collapsed stacks for flamegraph.pl / speedscope"
+        )
+
+        error_log_channel = discord.utils.get(ctx.guild.channels, id=ERROR_LOG_ID)
+        if error_log_channel:
+            try:
+                await error_log_channel.send(
+                    f"Profile requested by {ctx.author.name} - {ctx.author.id}",
+                    embed=embed,
+                    file=discord.File(result.path),
+                )
+            except discord.HTTPException as e:
+                print(f"Error uploading profile {result.path}: {e}")
+        await ctx.respond(embed=embed, ephemeral=True)
+
+
+def setup(bot: commands.Bot):
+    bot.add_cog(DiagnosticsCog(bot))
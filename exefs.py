@@ -0,0 +1,290 @@
+"""
+Pre-validation of essential.exefs uploads in SOAP/NNID channels.
+
+GodMode9's essential.exefs is an ExeFS image: a 0x200-byte header holding ten
+(name[8], offset u32, size u32) file entries, followed by the file data. The
+"secinfo" file is SecureInfo_A, whose serial (0xF bytes, NUL padded, without
+the sticker's check digit) sits at 0x102. Files are parsed as they are
+uploaded, so a broken or mismatched file is rejected seconds later instead of
+after Soapy's queue reports SERIAL_MISMATCH, and known consoles are pointed out
+from console_registry.
+"""
+
+import asyncio
+import hashlib
+import re
+import struct
+
+import aiohttp
+import discord
+from discord.ext import commands
+
+import console_registry
+import journal
+import message_router
+import tracing
+from channel_index import ChannelKind, classify_channel
+
+EXEFS_HEADER_SIZE = 0x200
+EXEFS_ENTRIES = 10
+SECINFO_NAME = "secinfo"
+SECINFO_SIZE = 0x111
+SECINFO_SERIAL_OFFSET = 0x102
+SECINFO_SERIAL_SIZE = 0xF
+# A real essential.exefs is well under this; anything bigger isn't one
+MAX_EXEFS_BYTES = 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 16 * 1024
+# A download taking longer than this has stalled
+DOWNLOAD_TIMEOUT_SECONDS = 30
+
+# Title of the embed SerialNumberModal posts with the entered serial as its description
+SERIAL_RECEIVED_TITLE = "✅ Serial number received"
+
+_ENTRY = struct.Struct("<8sII")
+_SERIAL_RE = re.compile(r"^[A-Z]{2,3}\d{7,9}$")
+
+# channel_id -> serial entered through SerialNumberModal
+_entered_serials: dict[int, str] = {}
+# NNID channel_id -> {filename: serial} of files that passed
+_nnid_uploads: dict[int, dict[str, str]] = {}
+
+
+class ExeFSError(ValueError):
+    """The file isn't a usable essential.exefs. The message is shown to the helpee."""
+
+
+def secinfo_span(header: memoryview) -> tuple[int, int]:
+    """(start, end) of the secinfo file within the image, from the 0x200-byte header."""
+    for i in range(EXEFS_ENTRIES):
+        name, offset, size = _ENTRY.unpack_from(header, i * _ENTRY.size)
+        if name.rstrip(b"\0") != SECINFO_NAME.encode():
+            continue
+        if size < SECINFO_SIZE:
+            raise ExeFSError("the SecureInfo section in this file is truncated.")
+        start = EXEFS_HEADER_SIZE + offset
+        return start, start + size
+    raise ExeFSError(
+        "this file has no SecureInfo section, so it isn't an essential.exefs."
+    )
+
+
+def read_serial(data: memoryview) -> str:
+    """The console serial stored in an essential.exefs image."""
+    if len(data) < EXEFS_HEADER_SIZE:
+        raise ExeFSError("this file is too small to be an essential.exefs.")
+    start, end = secinfo_span(data[:EXEFS_HEADER_SIZE])
+    if len(data) < end:
+        raise ExeFSError("this file is cut off before its SecureInfo section ends.")
+
+    field = data[start + SECINFO_SERIAL_OFFSET : start + SECINFO_SERIAL_OFFSET + SECINFO_SERIAL_SIZE]
+    serial = bytes(field).split(b"\0", 1)[0].decode("ascii", "replace").upper()
+    if not _SERIAL_RE.match(serial):
+        raise ExeFSError("the SecureInfo section in this file doesn't contain a valid serial number.")
+    return serial
+
+
+def serial_matches(entered: str, file_serial: str) -> bool:
+    """The sticker serial is the SecureInfo serial plus an optional check digit."""
+    return entered.startswith(file_serial) and len(entered) - len(file_serial) <= 1
+
+
+async def fetch_exefs(
+    session: aiohttp.ClientSession, attachment: discord.Attachment
+) -> tuple[memoryview, str]:
+    """
+    Stream the attachment into a buffer sized from its metadata, hashing it on
+    the way. Returns the data and its SHA-256. Raises ExeFSError for oversized files.
+    """
+    if attachment.size > MAX_EXEFS_BYTES:
+        raise ExeFSError(
+            f"this file is {attachment.size // 1024} KB, which is far too big for an essential.exefs."
+        )
+    buffer = memoryview(bytearray(attachment.size))
+    filled = 0
+    digest = hashlib.sha256()
+
+    async with session.get(attachment.url) as response:
+        response.raise_for_status()
+        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+            take = min(len(chunk), attachment.size - filled)
+            buffer[filled : filled + take] = chunk[:take]
+            digest.update(buffer[filled : filled + take])
+            filled += take
+            if filled >= attachment.size:
+                break
+    return buffer[:filled], digest.hexdigest()
+
+
+def remember_serial(channel_id: int, serial: str):
+    """Called by SerialNumberModal so uploads can be checked without a history scan."""
+    _entered_serials[channel_id] = serial
+
+
+class ExeFSCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        message_router.add_route(
+            "exefs_upload",
+            self.handle_upload,
+            kinds=[ChannelKind.SOAP_AUTO, ChannelKind.SOAP_MANUAL, ChannelKind.NNID],
+        )
+        # Shared by every download, created on first use (it needs the running loop)
+        self._session: aiohttp.ClientSession | None = None
+
+    def cog_unload(self):
+        message_router.remove_route("exefs_upload")
+        if self._session is not None and not self._session.closed:
+            try:
+                asyncio.get_running_loop().create_task(self._session.close())
+            except RuntimeError:  # no loop left to close it on
+                pass
+
+    def _http(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT_SECONDS)
+            )
+        return self._session
+
+    def export_state(self) -> dict:
+        return {"entered_serials": _entered_serials, "nnid_uploads": _nnid_uploads}
+
+    def import_state(self, state: dict):
+        _entered_serials.update(state["entered_serials"])
+        _nnid_uploads.update(state["nnid_uploads"])
+
+    async def _entered_serial(self, channel: discord.TextChannel) -> str | None:
+        """The serial entered in this channel, from memory or the modal's embed after a restart."""
+        serial = _entered_serials.get(channel.id)
+        if serial is not None:
+            return serial
+        try:
+            async for message in channel.history(limit=50):
+                if message.author.id != self.bot.user.id or not message.embeds:
+                    continue
+                embed = message.embeds[0]
+                if embed.title == SERIAL_RECEIVED_TITLE and embed.description:
+                    serial = embed.description.strip()
+                    _entered_serials[channel.id] = serial
+                    return serial
+        except discord.HTTPException:
+            pass
+        return None
+
+    async def _reject(self, message: discord.Message, attachment: discord.Attachment, reason: str):
+        journal.record(
+            "exefs_rejected",
+            guild_id=message.guild.id,
+            channel_id=message.channel.id,
+            user_id=message.author.id,
+            filename=attachment.filename,
+            reason=reason,
+        )
+        embed = discord.Embed(
+            title=f"❌ {attachment.filename} can't be used",
+            description=(
+                f"{message.author.mention}, {reason}\n\n"
+                "Please make sure you copied `essential.exefs` from `[S:] SYSNAND Virtual` on the console "
+                "you're transferring, then upload it again."
+            ),
+            color=discord.Color.red(),
+        )
+        embed.set_footer(text="Ask a Soaper if you're unsure which file to upload.")
+        try:
+            await message.reply(embed=embed)
+        except discord.HTTPException as e:
+            print(f"Error rejecting {attachment.filename} in {message.channel.id}: {e}")
+
+    async def _show_history(self, message: discord.Message, history: console_registry.ConsoleHistory):
+        """Tell Soapers this console has been seen before, and about an active cooldown."""
+        lines = []
+        for transfer in history.transfers[:5]:
+            lines.append(f"<t:{int(transfer.at)}:d> **{transfer.outcome}** in <#{transfer.channel_id}>")
+        seen_in = list(dict.fromkeys(u.channel_id for u in history.uploads))
+        if seen_in:
+            first = min(u.at for u in history.uploads)
+            lines.append(
+                f"Uploaded in {len(seen_in)} other channel(s) since <t:{int(first)}:d>: "
+                + ", ".join(f"<#{channel_id}>" for channel_id in seen_in[:5])
+            )
+        embed = discord.Embed(
+            title="🔁 This console has been here before",
+            description="\n".join(lines),
+            color=discord.Color.blurple(),
+        )
+        cooldown_ends = history.cooldown_ends()
+        if cooldown_ends:
+            embed.add_field(
+                name="⏳ System transfer cooldown",
+                value=f"Last system transfer was under 7 days ago. It can system transfer again <t:{int(cooldown_ends.timestamp())}:R>.",
+                inline=False,
+            )
+            embed.color = discord.Color.orange()
+        embed.set_footer(text="For Soapers: check the earlier channels before starting another transfer.")
+        try:
+            await message.channel.send(embed=embed)
+        except discord.HTTPException as e:
+            print(f"Error posting console history in {message.channel.id}: {e}")
+
+    async def check_attachment(self, message: discord.Message, kind: ChannelKind, attachment: discord.Attachment):
+        try:
+            data, sha256 = await fetch_exefs(self._http(), attachment)
+            file_serial = read_serial(data)
+        except ExeFSError as e:
+            return await self._reject(message, attachment, str(e))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error downloading {attachment.filename} in {message.channel.id}: {e}")
+            return
+
+        if kind.is_soap:
+            entered = await self._entered_serial(message.channel)
+            if entered and not serial_matches(entered, file_serial):
+                return await self._reject(
+                    message,
+                    attachment,
+                    f"this file is from the console with serial **{file_serial}**, "
+                    f"but the serial number you entered is **{entered}**.",
+                )
+            tracing.mark(message.channel.id, "exefs_checked")
+        else:
+            uploads = _nnid_uploads.setdefault(message.channel.id, {})
+            name = attachment.filename.lower()
+            for other_name, other_serial in uploads.items():
+                if other_name != name and other_serial == file_serial:
+                    return await self._reject(
+                        message,
+                        attachment,
+                        f"this file is from the same console (**{file_serial}**) as `{other_name}`. "
+                        "`SOURCE_essential.exefs` and `TARGET_essential.exefs` must come from different consoles.",
+                    )
+            uploads[name] = file_serial
+
+        history = await console_registry.lookup(sha256, file_serial, exclude_channel_id=message.channel.id)
+        await console_registry.record_upload(
+            sha256, file_serial, message.guild.id, message.channel.id, message.author.id, attachment.filename
+        )
+        if history:
+            await self._show_history(message, history)
+
+        try:
+            await message.add_reaction("✅")
+        except discord.HTTPException:
+            pass
+
+    async def handle_upload(self, message: discord.Message):
+        """Check console files uploaded to SOAP/NNID channels (routed by message_router)."""
+        if message.author.bot or not message.attachments:
+            return
+        kind = classify_channel(message.channel)
+        for attachment in message.attachments:
+            if attachment.filename.lower().endswith(".exefs"):
+                await self.check_attachment(message, kind, attachment)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        _entered_serials.pop(channel.id, None)
+        _nnid_uploads.pop(channel.id, None)
+
+
+def setup(bot: commands.Bot):
+    bot.add_cog(ExeFSCog(bot))
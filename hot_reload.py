@@ -0,0 +1,172 @@
+"""
+In-place extension reloads (.reload), so content and logic fixes ship without
+a restart and the gateway reconnect that comes with it.
+
+An extension is reloaded together with every loaded extension that imports
+it, each after the ones it imports, so nothing keeps calling into the replaced
+module. Cogs hand
+their state to their replacements: just before the old cog is unloaded,
+export_state() is called if it has one, and the returned dict is passed to
+import_state() on the new cog of the same name. Afterwards the reloaded
+modules' persistent views are re-added over the old ones, the new cogs'
+startup warmups run again (re-arming the timers their cog_unload cancelled),
+and application commands are synced.
+"""
+
+import inspect
+import sys
+import time
+
+import discord
+from discord.ext import commands
+from discord.ext.bridge import BridgeOption
+
+import journal
+import startup
+from perms import command_with_perms
+
+
+def _imports(module, name: str) -> bool:
+    """Whether a module holds a reference to the module called name, or to something defined in it."""
+    for value in vars(module).values():
+        if inspect.ismodule(value):
+            if value.__name__ == name:
+                return True
+        elif getattr(value, "__module__", None) == name:
+            return True
+    return False
+
+
+def reload_order(bot: commands.Bot, names: list[str]) -> list[str]:
+    """
+    The extensions to reload for names: those plus everything importing them,
+    directly or not, ordered so each comes after the ones it imports.
+    """
+    loaded = list(bot.extensions)
+    imported_by = {
+        ext: {other for other in loaded if other != ext and _imports(sys.modules[other], ext)}
+        for ext in loaded
+    }
+    targets = set(names)
+    pending = list(names)
+    while pending:
+        for importer in imported_by.get(pending.pop(), ()):
+            if importer not in targets:
+                targets.add(importer)
+                pending.append(importer)
+
+    # Topological sort over the targets, falling back to load order between unrelated ones
+    order: list[str] = []
+    visiting: set[str] = set()
+
+    def visit(ext: str):
+        if ext in order or ext in visiting:  # an import cycle can't be ordered; keep going
+            return
+        visiting.add(ext)
+        for dependency in loaded:
+            if dependency in targets and ext in imported_by[dependency]:
+                visit(dependency)
+        visiting.discard(ext)
+        order.append(ext)
+
+    for ext in loaded:
+        if ext in targets:
+            visit(ext)
+    return order
+
+
+def _cogs_of(bot: commands.Bot, ext: str) -> list[commands.Cog]:
+    return [cog for cog in bot.cogs.values() if type(cog).__module__ == ext]
+
+
+async def reload_extensions(bot: commands.Bot, names: list[str]) -> list[str]:
+    """
+    Reload the given extensions (and their importers), handing cog state over.
+    Returns the extensions reloaded. If one fails, Pycord puts its old module
+    back and the error is raised after the ones already reloaded are wired up.
+    """
+    reloaded: list[str] = []
+    new_cogs: list[commands.Cog] = []
+    error = None
+    for ext in reload_order(bot, names):
+        states = {
+            cog.qualified_name: cog.export_state()
+            for cog in _cogs_of(bot, ext)
+            if hasattr(cog, "export_state")
+        }
+        try:
+            bot.reload_extension(ext)
+        except discord.DiscordException as e:
+            error = e
+        # On failure these are the old module's cogs, set up again from scratch
+        for cog in _cogs_of(bot, ext):
+            state = states.get(cog.qualified_name)
+            if state is not None and hasattr(cog, "import_state"):
+                cog.import_state(state)
+            new_cogs.append(cog)
+        if error is not None:
+            break
+        reloaded.append(ext)
+
+    components_cog = bot.get_cog("ComponentsCog")
+    if components_cog is not None:
+        components_cog.register_views(refresh=reloaded)
+    startup_cog = bot.get_cog("StartupCog")
+    if startup_cog is not None and bot.is_ready():
+        await startup_cog.run_warmups(startup.warmups_of(new_cogs))
+    try:
+        await bot.sync_commands()
+    except discord.HTTPException as e:
+        print(f"Error syncing commands after reload: {e}")
+
+    if error is not None:
+        raise error
+    return reloaded
+
+
+class HotReloadCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @command_with_perms(
+        min_role="Developer",
+        name="reload",
+        help="Reload an extension (and those importing it) or all of them in place. Developers only.",
+    )
+    async def reload_command(
+        self,
+        ctx,
+        extension: BridgeOption(str, "Extension to reload, or 'all'", required=False) = "all",
+    ):
+        """Reload extensions without restarting the bot."""
+        if extension == "all":
+            names = list(self.bot.extensions)
+        elif extension in self.bot.extensions:
+            names = [extension]
+        else:
+            return await ctx.respond(
+                f"`{extension}` isn't loaded. Loaded: {', '.join(f'`{e}`' for e in self.bot.extensions)}",
+                ephemeral=True,
+            )
+
+        await ctx.defer(ephemeral=True)
+        start = time.monotonic()
+        try:
+            reloaded = await reload_extensions(self.bot, names)
+        except discord.DiscordException as e:
+            journal.record("lifecycle.reload_failed", extensions=names, error=repr(e))
+            return await ctx.respond(
+                f"❌ Reload stopped; the failing extension kept its old code: {e}", ephemeral=True
+            )
+
+        seconds = time.monotonic() - start
+        journal.record("lifecycle.reload", extensions=reloaded, seconds=round(seconds, 2))
+        await ctx.respond(
+            f"🔁 Reloaded {len(reloaded)} extension(s) in {seconds:.1f}s: "
+            + ", ".join(f"`{ext}`" for ext in reloaded),
+            ephemeral=True,
+        )
+
+
+def setup(bot: commands.Bot):
+    bot.add_cog(HotReloadCog(bot))
@@ -0,0 +1,322 @@
+"""
+Background jobs. Slow REST-only work (tracker renames, archive channel
+deletions, honeypot purges, log posts) is submitted by name with a JSON
+payload. With JOB_MODE = "inline" a job runs right away in this process, as it
+always has. With JOB_MODE = "queue" it is written to a SQLite queue (JOBS_FILE)
+and run by worker.py processes, which use a REST-only client, so none of it
+competes with interaction handling in the gateway process. SQLite stands in
+for a real broker here; anything with an atomic claim would do.
+
+Job handlers only get a discord.Client and the payload, so they must work from
+IDs over REST and not rely on the gateway cache.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import discord
+
+from constants import JOB_MODE, JOB_POLL_SECONDS
+
+JOBS_FILE = Path(__file__).parent / "jobs.sqlite3"
+# Attempts before a job is marked failed
+MAX_ATTEMPTS = 3
+# A running job claimed longer ago than this belonged to a worker that died
+STALE_CLAIM_SECONDS = 300
+
+Handler = Callable[[discord.Client, dict], Awaitable[None]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    claimed_at REAL,
+    claimed_by TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+_handlers: dict[str, Handler] = {}
+# Client inline jobs run with (the gateway bot), set by install()
+_client: discord.Client | None = None
+_conn: sqlite3.Connection | None = None
+_lock = threading.Lock()
+# (kind, dedupe/coalesce value) of inline jobs running right now -> latest payload for it
+_inline_pending: dict[tuple[str, object], dict] = {}
+
+
+def handler(kind: str):
+    """Register the decorated coroutine as the handler for a job kind."""
+
+    def decorator(func: Handler) -> Handler:
+        _handlers[kind] = func
+        return func
+
+    return decorator
+
+
+def install(client: discord.Client):
+    global _client
+    _client = client
+
+
+def queued() -> bool:
+    return JOB_MODE == "queue"
+
+
+# SQLite queue
+
+def _connection() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        # Several processes share the file; wait for each other's writes
+        _conn = sqlite3.connect(JOBS_FILE, check_same_thread=False, timeout=30)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.executescript(_SCHEMA)
+    return _conn
+
+
+def _enqueue(
+    kind: str, payload: dict, dedupe: str | None = None, coalesce: str | None = None
+) -> int | None:
+    """
+    Queue a job. None if dedupe is set and a job with the same payload[dedupe]
+    is already pending. With coalesce, a queued job with the same
+    payload[coalesce] gets this payload instead of a new job being added.
+    """
+    with _lock:
+        conn = _connection()
+        with conn:
+            if coalesce is not None:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE kind = ? AND status = 'queued' "
+                    "AND json_extract(payload, ?) = ? ORDER BY id DESC LIMIT 1",
+                    (kind, f"$.{coalesce}", payload[coalesce]),
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE jobs SET payload = ? WHERE id = ?", (json.dumps(payload), row[0]))
+                    return row[0]
+            if dedupe is not None and conn.execute(
+                "SELECT 1 FROM jobs WHERE kind = ? AND status IN ('queued', 'running') "
+                "AND json_extract(payload, ?) = ? LIMIT 1",
+                (kind, f"$.{dedupe}", payload[dedupe]),
+            ).fetchone():
+                return None
+            return conn.execute(
+                "INSERT INTO jobs (kind, payload, created_at) VALUES (?, ?, ?)",
+                (kind, json.dumps(payload), time.time()),
+            ).lastrowid
+
+
+def _claim(worker_id: str) -> tuple[int, str, str] | None:
+    """Atomically take the oldest queued (or abandoned) job."""
+    now = time.time()
+    with _lock:
+        conn = _connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id, kind, payload FROM jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND claimed_at < ?) ORDER BY id LIMIT 1",
+                (now - STALE_CLAIM_SECONDS,),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                    "claimed_at = ?, claimed_by = ? WHERE id = ?",
+                    (now, worker_id, row[0]),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return row
+
+
+def _finish(job_id: int, error: str | None):
+    with _lock:
+        conn = _connection()
+        with conn:
+            if error is None:
+                conn.execute("UPDATE jobs SET status = 'done', error = NULL WHERE id = ?", (job_id,))
+            else:
+                # Back in the queue until it runs out of attempts
+                conn.execute(
+                    "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END, "
+                    "error = ? WHERE id = ?",
+                    (MAX_ATTEMPTS, error, job_id),
+                )
+
+
+def _prune(older_than: float):
+    with _lock:
+        conn = _connection()
+        with conn:
+            conn.execute("DELETE FROM jobs WHERE status = 'done' AND created_at < ?", (older_than,))
+
+
+def _counts() -> dict[str, int]:
+    with _lock:
+        return dict(_connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+
+async def counts() -> dict[str, int]:
+    """Jobs in the queue per status."""
+    try:
+        return await asyncio.to_thread(_counts)
+    except sqlite3.Error as e:
+        print(f"Error reading the job queue: {e}")
+        return {}
+
+
+# Running jobs
+
+async def _run(client: discord.Client, kind: str, payload: dict):
+    job = _handlers.get(kind)
+    if job is None:
+        raise LookupError(f"no handler for job {kind!r}")
+    await job(client, payload)
+
+
+async def submit(
+    kind: str,
+    *,
+    dedupe: str | None = None,
+    coalesce: str | None = None,
+    raise_errors: bool = False,
+    **payload,
+):
+    """
+    Run a job: in this process (inline mode, errors are printed, or raised with
+    raise_errors) or by handing it to the workers (queue mode, returns once
+    it's queued; failures show up in the queue's counts). dedupe and
+    coalesce name a payload field, e.g. "channel_id". With dedupe, the job is
+    dropped while one of the same kind for the same value is still pending.
+    With coalesce, it replaces the payload of one that hasn't started yet, so
+    only the latest (say, tracker name) is applied.
+    """
+    if dedupe is not None and coalesce is not None:
+        raise ValueError("Use either dedupe or coalesce, not both")
+    if queued():
+        try:
+            await asyncio.to_thread(_enqueue, kind, payload, dedupe, coalesce)
+            return
+        except sqlite3.Error as e:
+            print(f"Error queueing job {kind}, running it here instead: {e}")
+
+    field = dedupe or coalesce
+    key = (kind, payload[field]) if field is not None else None
+    if key in _inline_pending:
+        # The running job picks up a coalesced payload when it's done
+        if coalesce is not None:
+            _inline_pending[key] = payload
+        return
+    if key is not None:
+        _inline_pending[key] = payload
+    try:
+        while True:
+            try:
+                await _run(_client, kind, payload)
+            except Exception as e:
+                if raise_errors:
+                    raise
+                print(f"Error in job {kind}: {e}")
+            if key is None or _inline_pending[key] is payload:
+                break
+            payload = _inline_pending[key]
+    finally:
+        _inline_pending.pop(key, None)
+
+
+async def run_worker(client: discord.Client, worker_id: str):
+    """Claim and run queued jobs until cancelled (worker.py)."""
+    last_prune = 0.0
+    while True:
+        claimed = await asyncio.to_thread(_claim, worker_id)
+        if claimed is None:
+            if time.time() - last_prune > 3600:
+                last_prune = time.time()
+                await asyncio.to_thread(_prune, last_prune - 86400)
+            await asyncio.sleep(JOB_POLL_SECONDS)
+            continue
+
+        job_id, kind, payload = claimed
+        error = None
+        try:
+            await _run(client, kind, json.loads(payload))
+        except Exception as e:
+            error = repr(e)
+            print(f"[{worker_id}] Job {job_id} ({kind}) failed: {e}")
+        await asyncio.to_thread(_finish, job_id, error)
+
+
+# Handlers
+
+@handler("rename_channel")
+async def _rename_channel(client: discord.Client, payload: dict):
+    await client.http.edit_channel(payload["channel_id"], name=payload["name"])
+
+
+@handler("delete_channel")
+async def _delete_channel(client: discord.Client, payload: dict):
+    """Delete a channel, then post log_embed to log_channel_id if given (only if this deleted it)."""
+    try:
+        await client.http.delete_channel(payload["channel_id"], reason=payload.get("reason"))
+    except discord.NotFound:
+        return
+    if payload.get("log_channel_id") and payload.get("log_embed"):
+        try:
+            await client.http.send_message(payload["log_channel_id"], None, embeds=[payload["log_embed"]])
+        except discord.HTTPException as e:
+            # The channel is gone; retrying the job wouldn't post the log either
+            print(f"Error logging deletion of channel {payload['channel_id']}: {e}")
+
+
+@handler("send_message")
+async def _send_message(client: discord.Client, payload: dict):
+    await client.http.send_message(
+        payload["channel_id"], payload.get("content"), embeds=payload.get("embeds")
+    )
+
+
+@handler("purge_channel")
+async def _purge_channel(client: discord.Client, payload: dict):
+    """Delete the channel's latest messages, except the bot's own embed titled keep_embed_title."""
+    channel_id = payload["channel_id"]
+    keep_title = payload.get("keep_embed_title")
+    # Bulk delete only takes messages under 14 days old
+    bulk_cutoff = time.time() - 14 * 24 * 3600 + 60
+
+    bulk, single = [], []
+    # At most 100, which is also the bulk delete limit
+    for message in await client.http.logs_from(channel_id, min(payload.get("limit", 50), 100)):
+        embeds = message.get("embeds") or []
+        if (
+            keep_title
+            and int(message["author"]["id"]) == client.user.id
+            and embeds
+            and embeds[0].get("title") == keep_title
+        ):
+            continue
+        created = discord.utils.snowflake_time(int(message["id"])).timestamp()
+        (bulk if created > bulk_cutoff else single).append(message["id"])
+
+    if len(bulk) == 1:
+        single += bulk
+    elif bulk:
+        await client.http.delete_messages(channel_id, bulk)
+    for message_id in single:
+        try:
+            await client.http.delete_message(channel_id, message_id)
+        except discord.NotFound:
+            pass
@@ -0,0 +1,207 @@
+"""
+Append-only, rotating JSONL journal of bot events (lifecycle, moderation,
+Soapy status, log-channel posts). Writing happens on a background thread so the
+event loop never blocks on file I/O. Discord log channels are just another
+consumer of the same events.
+
+Run `python3.13 journal.py --help` to stream and filter the journal.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+JOURNAL_DIR = Path(__file__).parent / "journal"
+JOURNAL_FILE = JOURNAL_DIR / "events.jsonl"
+# Rotate at this size, keeping events.jsonl.1 (newest) .. events.jsonl.N (oldest)
+JOURNAL_MAX_BYTES = 5 * 1024 * 1024
+JOURNAL_BACKUPS = 5
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_writer: threading.Thread | None = None
+_writer_lock = threading.Lock()
+
+
+def record(event: str, **fields) -> None:
+    """Queue an event for the journal. Never blocks and never raises."""
+    entry = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "event": event,
+    }
+    entry.update(fields)
+    _queue.put(entry)
+    if _writer is None:
+        _start_writer()
+
+
+def _start_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name="journal-writer", daemon=True)
+            _writer.start()
+            atexit.register(_stop_writer)
+
+
+def _stop_writer():
+    _queue.put(None)
+    if _writer is not None:
+        _writer.join(timeout=5)
+
+
+def _rotate():
+    for i in range(JOURNAL_BACKUPS - 1, 0, -1):
+        src = JOURNAL_FILE.with_name(f"{JOURNAL_FILE.name}.{i}")
+        if src.exists():
+            src.replace(JOURNAL_FILE.with_name(f"{JOURNAL_FILE.name}.{i + 1}"))
+    JOURNAL_FILE.replace(JOURNAL_FILE.with_name(f"{JOURNAL_FILE.name}.1"))
+
+
+def _write_loop():
+    try:
+        JOURNAL_DIR.mkdir(exist_ok=True)
+        f = open(JOURNAL_FILE, "a", encoding="utf-8")
+    except OSError as e:
+        print(f"Journal disabled - could not open {JOURNAL_FILE}: {e}")
+        return
+
+    stopping = False
+    while not stopping:
+        batch = [_queue.get()]
+        # Write whatever else piled up in one go
+        while True:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            for entry in batch:
+                if entry is None:
+                    stopping = True
+                    continue
+                f.write(json.dumps(entry, default=str, ensure_ascii=False) + "\n")
+            f.flush()
+            if f.tell() >= JOURNAL_MAX_BYTES:
+                f.close()
+                _rotate()
+                f = open(JOURNAL_FILE, "a", encoding="utf-8")
+        except OSError as e:
+            print(f"Error writing journal: {e}")
+    f.close()
+
+
+# CLI
+
+
+def _journal_files() -> list[Path]:
+    """Journal files oldest first."""
+    backups = [
+        JOURNAL_FILE.with_name(f"{JOURNAL_FILE.name}.{i}")
+        for i in range(JOURNAL_BACKUPS, 0, -1)
+    ]
+    return [p for p in backups + [JOURNAL_FILE] if p.exists()]
+
+
+def _entry_ids(entry: dict) -> set[str]:
+    """All values of *_id / *_ids fields, as strings."""
+    ids = set()
+    for key, value in entry.items():
+        if key.endswith("_id"):
+            ids.add(str(value))
+        elif key.endswith("_ids") and isinstance(value, list):
+            ids.update(str(v) for v in value)
+    return ids
+
+
+def _matches(entry: dict, args) -> bool:
+    if args.event and not any(entry.get("event", "").startswith(e) for e in args.event):
+        return False
+    if args.id is not None and args.id not in _entry_ids(entry):
+        return False
+    if args.since is not None and entry.get("ts", "") < args.since:
+        return False
+    return True
+
+
+def _print_entry(entry: dict, raw: bool):
+    if raw:
+        print(json.dumps(entry, ensure_ascii=False))
+        return
+    extras = " ".join(
+        f"{k}={v}" for k, v in entry.items() if k not in ("ts", "event")
+    )
+    print(f"{entry.get('ts', '?')}  {entry.get('event', '?'):<28} {extras}")
+
+
+def _emit_line(line: str, args):
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return
+    if _matches(entry, args):
+        _print_entry(entry, args.raw)
+
+
+def _follow(args):
+    """Tail the current journal file, reopening it after rotation."""
+    f = open(JOURNAL_FILE, encoding="utf-8") if JOURNAL_FILE.exists() else None
+    if f is not None:
+        f.seek(0, 2)
+    while True:
+        line = f.readline() if f is not None else ""
+        if line:
+            _emit_line(line, args)
+            continue
+        time.sleep(0.5)
+        try:
+            rotated = f is None or JOURNAL_FILE.stat().st_ino != os.fstat(f.fileno()).st_ino
+        except FileNotFoundError:
+            continue
+        if rotated:
+            if f is not None:
+                # Finish the old file before switching
+                for line in f:
+                    _emit_line(line, args)
+                f.close()
+            f = open(JOURNAL_FILE, encoding="utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream and filter the Maidy event journal.")
+    parser.add_argument(
+        "-e", "--event", action="append",
+        help="Only events starting with this prefix (e.g. moderation., soap_status). Repeatable.",
+    )
+    parser.add_argument("--id", help="Only events mentioning this user/channel/guild ID.")
+    parser.add_argument(
+        "--last", type=float, metavar="HOURS", help="Only events from the last N hours."
+    )
+    parser.add_argument("-f", "--follow", action="store_true", help="Keep streaming new events.")
+    parser.add_argument("--raw", action="store_true", help="Print raw JSON lines.")
+    args = parser.parse_args(argv)
+    args.since = (
+        (datetime.now(timezone.utc) - timedelta(hours=args.last)).isoformat(timespec="milliseconds")
+        if args.last is not None
+        else None
+    )
+
+    try:
+        for path in _journal_files():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    _emit_line(line, args)
+        if args.follow:
+            _follow(args)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
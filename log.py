@@ -1,5 +1,8 @@
 import discord
 import exceptions
+import log_sink
+import journal
+from log_sink import Priority
 from discord.ext import commands
 from constants import SOAP_LOG_ID, MOD_LOG_ID, ERROR_LOG_ID
 
@@ -21,41 +24,57 @@ async def log_to(
     channel_id: int,
     title: str | None = None,
 ):
+    # Handle Context, Interaction, and bridge contexts safely
+    if isinstance(ctx, discord.Interaction):
+        author = ctx.user
+        action = "Interaction"
+    else:
+        message = getattr(ctx, "message", None)
+        if message is not None:
+            author = message.author
+            action = message.content
+        else:
+            # Bridge / application context without a backing message
+            author = getattr(ctx, "author", getattr(ctx, "user", None))
+            action = getattr(
+                getattr(ctx, "command", None),
+                "qualified_name",
+                "Application command",
+            )
+
+    # Journal first so the event is kept even if the log channel is gone
+    journal.record(
+        "log",
+        log_channel_id=channel_id,
+        title=title,
+        user_id=author.id if author else None,
+        channel_id=getattr(ctx, "channel_id", None) or getattr(getattr(ctx, "channel", None), "id", None),
+        action=action,
+    )
+
     log_channel = discord.utils.get(ctx.guild.channels, id=channel_id)
     if log_channel:
         log_embed = discord.Embed(title=title)
-
-        # Handle Context, Interaction, and bridge contexts safely
-        if isinstance(ctx, discord.Interaction):
-            author = ctx.user
-            action = "Interaction"
-        else:
-            message = getattr(ctx, "message", None)
-            if message is not None:
-                author = message.author
-                action = message.content
-            else:
-                # Bridge / application context without a backing message
-                author = getattr(ctx, "author", getattr(ctx, "user", None))
-                action = getattr(
-                    getattr(ctx, "command", None),
-                    "qualified_name",
-                    "Application command",
-                )
-
         log_embed.add_field(
             name="Action made by:",
             value=f"{author.name} - {author.id}",
             inline=False,
         )
         log_embed.add_field(name="Action: ", value=action, inline=False)
-        await log_channel.send(embed=log_embed)
+        log_sink.enqueue(log_channel, embed=log_embed)
     else:
         raise LogChannelNotFound(channel_id)
 
 
 # On errors
 async def error_log(ctx: commands.Context, error: Exception):
+    journal.record(
+        "error",
+        user_id=ctx.message.author.id,
+        channel_id=ctx.channel.id,
+        action=ctx.message.content,
+        error=repr(error),
+    )
     error_log_channel = discord.utils.get(ctx.guild.channels, id=ERROR_LOG_ID)
     if error_log_channel:
         error_log_embed = discord.Embed(
@@ -71,7 +90,7 @@ async def error_log(ctx: commands.Context, error: Exception):
             name="Action:", value=ctx.message.content, inline=False
         )
 
-        await error_log_channel.send(embed=error_log_embed)
+        log_sink.enqueue(error_log_channel, embed=error_log_embed, priority=Priority.HIGH)
         raise error
     else:  # last ditch effort to at least display SOMETHING if no error log is found for some reason
         raise ErrorLogChannelNotFound(ERROR_LOG_ID, error) from error
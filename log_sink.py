@@ -0,0 +1,188 @@
+import discord
+import asyncio
+import jobs
+from collections import deque
+from enum import IntEnum
+
+# Discord limits for a single message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+MAX_CONTENT_CHARS = 2000
+
+# How long an entry may wait for company before its channel is flushed
+LOG_FLUSH_SECONDS = 2.0
+# Queued entries per channel before low-priority entries start being dropped
+LOG_QUEUE_LIMIT = 200
+
+
+class Priority(IntEnum):
+    HIGH = 0  # errors, moderation actions - sent right away, never dropped
+    NORMAL = 1  # staff action logs - batched, never dropped
+    LOW = 2  # join/leave, message edits/deletes - batched, dropped under backpressure
+
+
+class _Entry:
+    __slots__ = ("content", "embed", "priority")
+
+    def __init__(self, content: str | None, embed: discord.Embed | None, priority: Priority):
+        self.content = content
+        self.embed = embed
+        self.priority = priority
+
+
+class _ChannelQueue:
+    """Pending log entries for one destination channel and the task flushing them."""
+
+    def __init__(self, channel: discord.abc.Messageable):
+        self.channel = channel
+        self.entries: deque[_Entry] = deque()
+        self.wake = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.dropped = 0  # dropped since the last flush, reported in the next message
+        self.dropped_total = 0
+        self.messages_sent = 0
+        self.entries_sent = 0
+
+    def add(self, entry: _Entry) -> bool:
+        if len(self.entries) >= LOG_QUEUE_LIMIT:
+            if entry.priority is Priority.LOW:
+                self._drop()
+                return False
+            # Make room by dropping the oldest low-priority entry, if any
+            for queued in self.entries:
+                if queued.priority is Priority.LOW:
+                    self.entries.remove(queued)
+                    self._drop()
+                    break
+        self.entries.append(entry)
+
+        embeds = sum(1 for e in self.entries if e.embed is not None)
+        if entry.priority is Priority.HIGH or embeds >= MAX_EMBEDS_PER_MESSAGE:
+            self.wake.set()
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+        return True
+
+    def _drop(self):
+        self.dropped += 1
+        self.dropped_total += 1
+
+    def _take_batch(self) -> tuple[str | None, list[discord.Embed]]:
+        """Pop as many entries, in order, as fit into a single message."""
+        lines: list[str] = []
+        content_len = 0
+        embeds: list[discord.Embed] = []
+        embed_chars = 0
+
+        if self.dropped:
+            note = f"-# Dropped {self.dropped} low-priority log entries (backlog)"
+            lines.append(note)
+            content_len = len(note)
+            self.dropped = 0
+
+        while self.entries:
+            entry = self.entries[0]
+            if entry.content:
+                extra = len(entry.content) + (1 if lines else 0)
+                if lines and content_len + extra > MAX_CONTENT_CHARS:
+                    break
+            if entry.embed is not None:
+                size = len(entry.embed)
+                if embeds and (
+                    len(embeds) >= MAX_EMBEDS_PER_MESSAGE
+                    or embed_chars + size > MAX_EMBED_CHARS_PER_MESSAGE
+                ):
+                    break
+            self.entries.popleft()
+            if entry.content:
+                lines.append(entry.content[:MAX_CONTENT_CHARS])
+                content_len += extra
+            if entry.embed is not None:
+                embeds.append(entry.embed)
+                embed_chars += size
+
+        return ("\n".join(lines) or None), embeds
+
+    async def _run(self):
+        while self.entries:
+            if not self.wake.is_set():
+                try:
+                    await asyncio.wait_for(self.wake.wait(), LOG_FLUSH_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+            self.wake.clear()
+            await self._flush()
+
+    async def _flush(self, drain: bool = False):
+        while self.entries:
+            sent = len(self.entries)
+            content, embeds = self._take_batch()
+            sent -= len(self.entries)
+            try:
+                if jobs.queued():
+                    # A worker posts it; this loop only batches
+                    await jobs.submit(
+                        "send_message",
+                        channel_id=self.channel.id,
+                        content=content,
+                        embeds=[e.to_dict() for e in embeds] or None,
+                    )
+                else:
+                    await self.channel.send(content=content, embeds=embeds or None)
+                self.messages_sent += 1
+                self.entries_sent += sent
+            except Exception as e:
+                print(f"Log sink: failed to send to #{getattr(self.channel, 'name', self.channel)}: {e}")
+            if drain:
+                continue
+            # Keep filling the next message only while a full one is waiting
+            embeds_waiting = sum(1 for e in self.entries if e.embed is not None)
+            if embeds_waiting < MAX_EMBEDS_PER_MESSAGE and not any(
+                e.priority is Priority.HIGH for e in self.entries
+            ):
+                return
+
+
+# channel_id -> queue
+_queues: dict[int, _ChannelQueue] = {}
+
+
+def enqueue(
+    channel: discord.abc.Messageable,
+    content: str | None = None,
+    *,
+    embed: discord.Embed | None = None,
+    priority: Priority = Priority.NORMAL,
+) -> bool:
+    """
+    Queue a log entry for a channel. Entries are coalesced into messages of up to
+    10 embeds, sent when a message fills up, a HIGH entry arrives, or after
+    LOG_FLUSH_SECONDS. Returns False if the entry was dropped.
+    """
+    if not content and embed is None:
+        return False
+    queue = _queues.get(channel.id)
+    if queue is None:
+        queue = _queues[channel.id] = _ChannelQueue(channel)
+    else:
+        queue.channel = channel
+    return queue.add(_Entry(content, embed, priority))
+
+
+async def flush_all():
+    """Send everything still queued (e.g. before shutdown or reload)."""
+    for queue in list(_queues.values()):
+        await queue._flush(drain=True)
+
+
+def stats() -> dict[int, dict[str, int]]:
+    """Per-channel queue depth and counters."""
+    return {
+        channel_id: {
+            "queued": len(queue.entries),
+            "messages_sent": queue.messages_sent,
+            "entries_sent": queue.entries_sent,
+            "dropped": queue.dropped_total,
+        }
+        for channel_id, queue in _queues.items()
+    }
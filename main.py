@@ -1,25 +1,55 @@
+import startup  # first, so its clock starts with the process
+import asyncio
+import signal
 import discord
 import traceback
+import jobs
+import journal
+import metrics
+import watchdog
 from log import ErrorLogChannelNotFound, error_log
 from discord.ext import commands, bridge
-from constants import KEY, SOAP_LOG_ID
-from soap import ArchiveView
+from constants import KEY, CHUNK_MEMBERS_AT_STARTUP
 
 intent = discord.Intents().default()
 intent.message_content = True
 intent.members = True
-bot = bridge.Bot(command_prefix=".", intents=intent)
-bot.load_extension("help")
-bot.load_extension("moderation")
-bot.load_extension("soap")
-bot.load_extension("soap_request")
-bot.load_extension("soap_automation")
-# bot.load_extension("dynamic_cmds")
-bot.load_extension("text_commands")
-bot.load_extension("nnid")
-bot.load_extension("nnid_request")
-bot.load_extension("tracker")
-bot.load_extension("soap_helper")
+bot = bridge.Bot(
+    command_prefix=".",
+    intents=intent,
+    chunk_guilds_at_startup=CHUNK_MEMBERS_AT_STARTUP,
+    max_messages=None,  # message_cache keeps what the logs need instead
+)
+metrics.install(bot)
+watchdog.install(bot)
+jobs.install(bot)
+startup.install(bot)
+EXTENSIONS = [
+    "perms",
+    "channel_index",
+    "components",
+    "message_router",
+    "member_cache",
+    "message_cache",
+    "help",
+    "moderation",
+    "soap",
+    "soap_request",
+    "soap_helper",
+    "exefs",
+    "soap_automation",
+    # "dynamic_cmds",
+    "text_commands",
+    "nnid",
+    "nnid_request",
+    "tracker",
+    "diagnostics",
+    "hot_reload",
+]
+# Dependencies first: an extension imported by an earlier one would be run twice
+for extension in startup.load_order(EXTENSIONS):
+    bot.load_extension(extension)
+startup.mark("extensions loaded")
 
 
 @bot.event  # actually show things on error
@@ -70,30 +100,43 @@ async def on_application_command_error(ctx, error: commands.CommandError):
             )
             # Log to console for debugging; prefix error_log handles prefix commands.
             print(f"Application command error: {error}")
+            journal.record(
+                "error",
+                command=getattr(ctx.command, "qualified_name", None),
+                user_id=ctx.author.id if ctx.author else None,
+                channel_id=ctx.channel_id,
+                error=repr(error),
+            )
     except Exception as unknown:
         print(f"Error while handling application command error: {unknown}")
 
 
 @bot.event
-async def on_ready():
-    print(f"Logged-in as {bot.user}")
-    bot.add_view(ArchiveView(0, 0, bot))
-    log_channel = bot.get_channel(SOAP_LOG_ID)
-    if log_channel:
-        embed = discord.Embed(
-            title="Ready!",
-            description=f"{bot.user.name} has just restarted.",
-            color=discord.Color.blue(),
-        )
-        embed.set_footer(
-            text="Button interactions created before the restart might be broken now."
-        )
-        await log_channel.send(embed=embed)
-    else:
-        raise ErrorLogChannelNotFound(SOAP_LOG_ID)
+async def on_disconnect():
+    journal.record("lifecycle.disconnect")
+
+
+@bot.event
+async def on_resumed():
+    journal.record("lifecycle.resumed")
+
 
-    # dynamic_setup = bot.get_cog("DynamicCommandsCog").setup_commands()
-    # print(f"Loaded dynamic commands: {dynamic_setup}")
+async def main():
+    # Stop cleanly on SIGTERM like bot.run() did
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:  # Windows
+        pass
+    async with bot:
+        # Views need a running loop, and are live before the first interaction arrives
+        bot.get_cog("ComponentsCog").register_views()
+        startup.mark("views registered")
+        await bot.start(KEY)
 
 
-bot.run(KEY)
+journal.record("lifecycle.start")
+try:
+    asyncio.run(main())
+except (KeyboardInterrupt, asyncio.CancelledError):
+    pass
+journal.record("lifecycle.stop")
@@ -0,0 +1,159 @@
+"""
+Member cache policy. With MEMBER_CACHE_POLICY = "relevant", Pycord only keeps
+members the bot actually works with: Soapers, helpees, anyone with a role a
+command requires (or higher), and owners of open SOAP/NNID channels. Everyone else is fetched on demand through
+get_member() and remembered for MEMBER_FETCH_TTL_SECONDS. Pair it with
+CHUNK_MEMBERS_AT_STARTUP = False to skip downloading the whole member list on
+connect.
+
+Pycord only dispatches member_remove and member_update for cached members, so
+listeners that have to see everyone use the raw events instead
+(raw_member_remove, raw_audit_log_entry for timeouts).
+
+The policy works by wrapping Pycord's private Guild._add_member. It is only
+installed on the Pycord version it was written against (requirements.txt pins
+it); on any other version every member is cached and a warning is printed.
+"""
+
+import time
+from collections import OrderedDict
+
+import discord
+from discord.ext import commands
+
+from channel_index import is_channel_owner
+from perms import _has_role_or_higher, get_role_named, invalidate_member, required_roles
+from constants import (
+    HELPEE_ROLE_ID,
+    MEMBER_CACHE_POLICY,
+    MEMBER_FETCH_TTL_SECONDS,
+    SOAPER_ROLE_ID,
+)
+
+# Most on-demand fetches kept at once
+MAX_FETCHED_MEMBERS = 5000
+# Pycord release the Guild._add_member wrapper is written against
+PYCORD_VERSION = "2.7."
+
+_KEEP_ROLE_IDS = frozenset(r for r in (SOAPER_ROLE_ID, HELPEE_ROLE_ID) if r)
+
+# (guild_id, user_id) -> (member or None if not in the guild, expires at)
+_fetched: OrderedDict[tuple[int, int], tuple[discord.Member | None, float]] = OrderedDict()
+
+stats = {
+    "kept": 0,
+    "skipped": 0,
+    "trimmed": 0,
+    "fetch_hits": 0,
+    "fetches": 0,
+}
+
+
+def keeps(member: discord.Member) -> bool:
+    """Whether the policy keeps this member in Pycord's cache."""
+    if MEMBER_CACHE_POLICY != "relevant" or not hasattr(discord.Guild._add_member, "original"):
+        return True
+    guild = member.guild
+    if member.id == guild._state.self_id:
+        return True
+    if any(member._roles.has(role_id) for role_id in _KEEP_ROLE_IDS):
+        return True
+    # Members who can run restricted commands stay cached for the permission checks
+    for name in required_roles:
+        role = get_role_named(guild, name)
+        if role is not None and _has_role_or_higher(member, role):
+            return True
+    return is_channel_owner(guild.id, member.id)
+
+
+def _install():
+    # Every path that caches a member (chunks, joins, updates, interactions) goes through here.
+    # Wrap Pycord's own method even if this module is reloaded.
+    if not discord.__version__.startswith(PYCORD_VERSION):
+        print(
+            f"Member cache policy disabled: written for Pycord {PYCORD_VERSION}x, "
+            f"running {discord.__version__}. Every member will be cached."
+        )
+        return
+    add_member = getattr(discord.Guild._add_member, "original", discord.Guild._add_member)
+
+    def _add_member(self, member, /):
+        # Role changes of uncached members don't dispatch member_update, so
+        # drop their permission decisions whenever fresh member data comes in
+        invalidate_member(self.id, member.id)
+        if keeps(member):
+            stats["kept"] += 1
+            add_member(self, member)
+        else:
+            stats["skipped"] += 1
+
+    _add_member.original = add_member
+    discord.Guild._add_member = _add_member
+
+
+async def get_member(guild: discord.Guild, user_id: int) -> discord.Member | None:
+    """A guild member from the cache, the recent-fetch cache, or the API. None if they aren't in the guild."""
+    member = guild.get_member(user_id)
+    if member is not None:
+        return member
+
+    key = (guild.id, user_id)
+    entry = _fetched.get(key)
+    now = time.monotonic()
+    if entry is not None and entry[1] > now:
+        stats["fetch_hits"] += 1
+        return entry[0]
+
+    stats["fetches"] += 1
+    try:
+        member = await guild.fetch_member(user_id)
+    except discord.NotFound:
+        member = None
+    _fetched[key] = (member, now + MEMBER_FETCH_TTL_SECONDS)
+    _fetched.move_to_end(key)
+    while len(_fetched) > MAX_FETCHED_MEMBERS:
+        _fetched.popitem(last=False)
+    return member
+
+
+def forget(guild_id: int, user_id: int):
+    _fetched.pop((guild_id, user_id), None)
+
+
+def cached_members(bot: commands.Bot) -> int:
+    return sum(len(guild._members) for guild in bot.guilds)
+
+
+class MemberCacheCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    def export_state(self) -> dict:
+        return {"fetched": _fetched, "stats": stats}
+
+    def import_state(self, state: dict):
+        _fetched.update(state["fetched"])
+        stats.update(state["stats"])
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        forget(after.guild.id, after.id)
+        # Lost the roles that kept them cached
+        if not keeps(after):
+            after.guild._remove_member(after)
+            stats["trimmed"] += 1
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        forget(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        forget(payload.guild_id, payload.user.id)
+
+
+_install()
+
+
+def setup(bot: commands.Bot):
+    bot.add_cog(MemberCacheCog(bot))
@@ -0,0 +1,199 @@
+"""
+Bounded message cache for the edit/delete logs. Pycord's own message cache is
+turned off (max_messages=None) since one global deque lets busy public
+channels evict SOAP-channel messages. Instead, messages are kept as compact
+records in one pool per channel class: MESSAGE_CACHE_TRANSFER_SIZE across
+SOAP/NNID channels, MESSAGE_CACHE_GENERAL_SIZE across everything else, and
+nothing for the bots-only and honeypot channels. Raw edit/delete events are
+resolved against these pools and re-dispatched as on_cached_message_edit
+(before, after) and on_cached_message_delete(message).
+"""
+
+from collections import OrderedDict
+
+import discord
+from discord.ext import commands
+
+import message_router
+from channel_index import ChannelKind, classify_channel
+from constants import (
+    BOTS_ONLY_CHANNEL_ID,
+    MESSAGE_CACHE_GENERAL_SIZE,
+    MESSAGE_CACHE_TRANSFER_SIZE,
+    SPAM_BOT_CHANNEL_ID,
+)
+
+TRANSFER = "transfer"
+GENERAL = "general"
+
+_UNCACHED_CHANNEL_IDS = frozenset(c for c in (BOTS_ONLY_CHANNEL_ID, SPAM_BOT_CHANNEL_ID) if c)
+
+_sizes = {TRANSFER: MESSAGE_CACHE_TRANSFER_SIZE, GENERAL: MESSAGE_CACHE_GENERAL_SIZE}
+# pool -> message_id -> record, oldest first
+_pools: dict[str, OrderedDict[int, "CachedMessage"]] = {name: OrderedDict() for name in _sizes}
+
+
+class CachedMessage:
+    """What the logs need from a message, without the Message object."""
+
+    __slots__ = (
+        "id",
+        "guild_id",
+        "channel_id",
+        "author_id",
+        "author_name",
+        "author_avatar",
+        "content",
+        "attachments",
+    )
+
+    def __init__(self, id, guild_id, channel_id, author_id, author_name, author_avatar, content, attachments):
+        self.id = id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.author_name = author_name
+        self.author_avatar = author_avatar
+        self.content = content
+        # Attachment filenames (their URLs stop working once the message is gone)
+        self.attachments = attachments
+
+    @classmethod
+    def from_message(cls, message: discord.Message) -> "CachedMessage":
+        return cls(
+            message.id,
+            message.guild.id,
+            message.channel.id,
+            message.author.id,
+            str(message.author),
+            message.author.display_avatar.url,
+            message.content,
+            tuple(a.filename for a in message.attachments),
+        )
+
+    def edited(self, data: dict) -> "CachedMessage":
+        """A copy with the content and attachments from a MESSAGE_UPDATE payload."""
+        attachments = data.get("attachments")
+        return CachedMessage(
+            self.id,
+            self.guild_id,
+            self.channel_id,
+            self.author_id,
+            self.author_name,
+            self.author_avatar,
+            data.get("content", self.content),
+            self.attachments if attachments is None else tuple(a["filename"] for a in attachments),
+        )
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/{self.guild_id}/{self.channel_id}/{self.id}"
+
+
+def pool_for(channel) -> str | None:
+    """Which pool a channel's messages go to, or None if they aren't cached."""
+    if channel.id in _UNCACHED_CHANNEL_IDS:
+        return None
+    kind = classify_channel(channel)
+    if kind.is_transfer or kind is ChannelKind.ARCHIVED:
+        return TRANSFER
+    return GENERAL
+
+
+def add(message: discord.Message):
+    pool_name = pool_for(message.channel)
+    if pool_name is None or not _sizes[pool_name]:
+        return
+    pool = _pools[pool_name]
+    pool[message.id] = CachedMessage.from_message(message)
+    if len(pool) > _sizes[pool_name]:
+        pool.popitem(last=False)
+
+
+def get(message_id: int) -> CachedMessage | None:
+    for pool in _pools.values():
+        cached = pool.get(message_id)
+        if cached is not None:
+            return cached
+    return None
+
+
+def _replace(cached: CachedMessage):
+    for pool in _pools.values():
+        if cached.id in pool:
+            pool[cached.id] = cached
+            return
+
+
+def pop(message_id: int) -> CachedMessage | None:
+    for pool in _pools.values():
+        cached = pool.pop(message_id, None)
+        if cached is not None:
+            return cached
+    return None
+
+
+def forget_channel(channel_id: int):
+    for pool in _pools.values():
+        for message_id in [m for m, cached in pool.items() if cached.channel_id == channel_id]:
+            del pool[message_id]
+
+
+def stats() -> dict[str, tuple[int, int]]:
+    """pool -> (messages cached, capacity)"""
+    return {name: (len(pool), _sizes[name]) for name, pool in _pools.items()}
+
+
+class MessageCacheCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        # Every channel; pool_for() decides what's kept
+        message_router.add_route("message_cache", self.handle_message, kinds=list(ChannelKind))
+
+    def cog_unload(self):
+        message_router.remove_route("message_cache")
+
+    def export_state(self) -> dict:
+        return {"pools": _pools}
+
+    def import_state(self, state: dict):
+        for name, pool in state["pools"].items():
+            if name in _pools:
+                _pools[name].update(pool)
+                # The sizes may have shrunk with the reload
+                while len(_pools[name]) > _sizes[name]:
+                    _pools[name].popitem(last=False)
+
+    async def handle_message(self, message: discord.Message):
+        # The logs ignore bots, so don't spend the budget on them
+        if not message.author.bot:
+            add(message)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        before = get(payload.message_id)
+        if before is None:
+            return
+        after = before.edited(payload.data)
+        _replace(after)
+        self.bot.dispatch("cached_message_edit", before, after)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        cached = pop(payload.message_id)
+        if cached is not None:
+            self.bot.dispatch("cached_message_delete", cached)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        # Purges aren't logged message by message
+        for message_id in payload.message_ids:
+            pop(message_id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        forget_channel(channel.id)
+
+
+def setup(bot: commands.Bot):
+    bot.add_cog(MessageCacheCog(bot))
@@ -0,0 +1,87 @@
+"""
+One on_message listener for the whole bot. Cogs register handlers for a fixed
+channel ID (the bots-only channel, the honeypot) or for a kind of channel
+(SOAP/NNID channels), and each message is dispatched from a per-channel table
+built on first sight, so a message nobody handles costs one dict lookup.
+Messages per route, including "unrouted", are counted in metrics.
+"""
+
+from typing import Awaitable, Callable, Iterable
+
+import discord
+from discord.ext import commands
+
+import metrics
+from channel_index import ChannelKind, classify_channel
+
+Handler = Callable[[discord.Message], Awaitable[None]]
+
+UNROUTED = "unrouted"
+
+# route name -> (handler, channel ids, channel kinds)
+_routes: dict[str, tuple[Handler, frozenset[int], frozenset[ChannelKind]]] = {}
+# channel_id -> ((route name, handler), ...) resolved from _routes, dropped on
+# route or channel changes
+_table: dict[int, tuple[tuple[str, Handler], ...]] = {}
+
+
+def add_route(
+    name: str,
+    handler: Handler,
+    *,
+    channel_ids: Iterable[int] = (),
+    kinds: Iterable[ChannelKind] = (),
+):
+    """Send guild messages in the given channels, or channels of the given kinds, to handler."""
+    _routes[name] = (handler, frozenset(c for c in channel_ids if c), frozenset(kinds))
+    _table.clear()
+
+
+def remove_route(name: str):
+    if _routes.pop(name, None) is not None:
+        _table.clear()
+
+
+def _resolve(channel) -> tuple[tuple[str, Handler], ...]:
+    kind = classify_channel(channel)
+    return tuple(
+        (name, handler)
+        for name, (handler, channel_ids, kinds) in _routes.items()
+        if channel.id in channel_ids or kind in kinds
+    )
+
+
+class MessageRouterCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.guild is None:
+            return
+        routes = _table.get(message.channel.id)
+        if routes is None:
+            routes = _table[message.channel.id] = _resolve(message.channel)
+        if not routes:
+            metrics.messages_routed.inc((UNROUTED,))
+            return
+
+        for name, handler in routes:
+            metrics.messages_routed.inc((name,))
+            try:
+                await metrics.timed("listener", f"on_message:{name}", handler(message))
+            except Exception as e:
+                print(f"Error in message route {name}: {e}")
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        # A move between categories can change the channel's kind
+        _table.pop(after.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        _table.pop(channel.id, None)
+
+
+def setup(bot: commands.Bot):
+    bot.add_cog(MessageRouterCog(bot))
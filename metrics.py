@@ -0,0 +1,304 @@
+"""
+Lightweight in-process metrics: counters, histograms and in-flight gauges for
+every event listener, command, view/modal callback and REST route, plus an
+event-loop lag sampler. Nothing is patched unless METRICS_ENABLED is set, so
+the disabled cost is zero.
+"""
+
+import asyncio
+import time
+import discord
+from discord.ui.modal import ModalStore
+from constants import METRICS_ENABLED, METRICS_HTTP_PORT
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# How often the loop lag sampler wakes up
+LAG_SAMPLE_INTERVAL = 0.5
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values: dict[tuple, int] = {}
+
+    def inc(self, labels: tuple, amount: int = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class Gauge(Counter):
+    def dec(self, labels: tuple, amount: int = 1):
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+    def set(self, labels: tuple, value: float):
+        self.values[labels] = value
+
+
+class _Series:
+    __slots__ = ("buckets", "count", "sum", "max")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+
+class Histogram:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.series: dict[tuple, _Series] = {}
+
+    def observe(self, labels: tuple, seconds: float):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = _Series()
+        i = 0
+        while i < len(BUCKETS) and seconds > BUCKETS[i]:
+            i += 1
+        series.buckets[i] += 1
+        series.count += 1
+        series.sum += seconds
+        if seconds > series.max:
+            series.max = seconds
+
+    @staticmethod
+    def quantile(series: _Series, q: float) -> float:
+        """Upper bound of the bucket holding the q-th (0-1) observation."""
+        if not series.count:
+            return 0.0
+        target = q * series.count
+        seen = 0
+        for i, n in enumerate(series.buckets):
+            seen += n
+            if seen >= target:
+                return BUCKETS[i] if i < len(BUCKETS) else series.max
+        return series.max
+
+
+# labels for handler metrics: (kind, name) with kind in listener/command/view/modal
+handler_seconds = Histogram("maidy_handler_seconds", "Time spent in a handler")
+handler_errors = Counter("maidy_handler_errors_total", "Handlers that raised")
+handler_inflight = Gauge("maidy_handler_inflight", "Handlers currently running")
+# labels: (method, route path template)
+rest_requests = Counter("maidy_rest_requests_total", "REST calls per route")
+rest_seconds = Histogram("maidy_rest_seconds", "REST call latency per route")
+loop_lag = Histogram("maidy_loop_lag_seconds", "Event loop scheduling delay")
+# labels: (message_router route name, or "unrouted")
+messages_routed = Counter("maidy_messages_total", "Guild messages per on_message route")
+
+ALL_METRICS = (
+    handler_seconds,
+    handler_errors,
+    handler_inflight,
+    rest_requests,
+    rest_seconds,
+    loop_lag,
+    messages_routed,
+)
+
+_installed = False
+_started = False
+_lag_task: asyncio.Task | None = None
+
+
+async def timed(kind: str, name: str, coro):
+    """Await a coroutine, recording its duration, errors and in-flight count."""
+    labels = (kind, name)
+    handler_inflight.inc(labels)
+    start = time.perf_counter()
+    try:
+        return await coro
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        handler_errors.inc(labels)
+        raise
+    finally:
+        handler_seconds.observe(labels, time.perf_counter() - start)
+        handler_inflight.dec(labels)
+
+
+def _handler_name(func) -> str:
+    return getattr(func, "__qualname__", None) or getattr(func, "__name__", repr(func))
+
+
+def _install_bot(bot):
+    # Every @event handler and Cog listener is scheduled through here
+    schedule_event = bot._schedule_event
+
+    def _schedule_event(coro, event_name, *args, **kwargs):
+        name = _handler_name(coro)
+        if not name.endswith(event_name):
+            name = f"{event_name}:{name}"
+
+        async def run(*a, **kw):
+            return await timed("listener", name, coro(*a, **kw))
+
+        return schedule_event(run, event_name, *args, **kwargs)
+
+    bot._schedule_event = _schedule_event
+
+    # Prefix (and bridge prefix) commands
+    invoke = bot.invoke
+
+    async def _invoke(ctx):
+        # Messages that aren't commands reach invoke too; only time real commands
+        if ctx.command is None:
+            return await invoke(ctx)
+        return await timed("command", ctx.command.qualified_name, invoke(ctx))
+
+    bot.invoke = _invoke
+
+    # Slash (and bridge slash) commands
+    invoke_application_command = bot.invoke_application_command
+
+    async def _invoke_application_command(ctx):
+        if ctx.command is None:
+            return await invoke_application_command(ctx)
+        return await timed("command", ctx.command.qualified_name, invoke_application_command(ctx))
+
+    bot.invoke_application_command = _invoke_application_command
+
+
+def _install_ui_and_http():
+    # View item callbacks (buttons, selects)
+    scheduled_task = discord.ui.View._scheduled_task
+
+    async def _scheduled_task(self, item, interaction):
+        name = f"{type(self).__name__}:{getattr(item, 'custom_id', None) or type(item).__name__}"
+        return await timed("view", name, scheduled_task(self, item, interaction))
+
+    discord.ui.View._scheduled_task = _scheduled_task
+
+    # Modal submissions
+    modal_dispatch = ModalStore.dispatch
+
+    async def _modal_dispatch(self, user_id, custom_id, interaction):
+        modal = self._modals.get((user_id, custom_id))
+        name = type(modal).__name__ if modal is not None else "unknown"
+        return await timed("modal", name, modal_dispatch(self, user_id, custom_id, interaction))
+
+    ModalStore.dispatch = _modal_dispatch
+
+    # REST calls, labelled by route template (e.g. /channels/{channel_id}/messages)
+    request = discord.http.HTTPClient.request
+
+    async def _request(self, route, **kwargs):
+        labels = (route.method, route.path)
+        rest_requests.inc(labels)
+        start = time.perf_counter()
+        try:
+            return await request(self, route, **kwargs)
+        finally:
+            rest_seconds.observe(labels, time.perf_counter() - start)
+
+    discord.http.HTTPClient.request = _request
+
+
+async def _sample_loop_lag():
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + LAG_SAMPLE_INTERVAL
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        loop_lag.observe(("loop",), max(0.0, loop.time() - expected))
+
+
+def install(bot):
+    """Patch the bot and Pycord's UI/HTTP layers to record metrics. No-op when disabled."""
+    global _installed
+    if not METRICS_ENABLED or _installed:
+        return
+    _installed = True
+    _install_bot(bot)
+    _install_ui_and_http()
+
+    async def start_background(*_):
+        global _started, _lag_task
+        if _started:
+            return
+        _started = True
+        _lag_task = asyncio.create_task(_sample_loop_lag(), name="maidy: loop lag sampler")
+        if METRICS_HTTP_PORT:
+            try:
+                await asyncio.start_server(_serve_http, "127.0.0.1", METRICS_HTTP_PORT)
+            except OSError as e:
+                print(f"Metrics endpoint disabled - could not bind port {METRICS_HTTP_PORT}: {e}")
+
+    bot.add_listener(start_background, "on_connect")
+
+
+def enabled() -> bool:
+    return _installed
+
+
+# Prometheus text exposition
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+_LABEL_NAMES = {
+    "maidy_handler_seconds": ("kind", "name"),
+    "maidy_handler_errors_total": ("kind", "name"),
+    "maidy_handler_inflight": ("kind", "name"),
+    "maidy_rest_requests_total": ("method", "route"),
+    "maidy_rest_seconds": ("method", "route"),
+    "maidy_loop_lag_seconds": ("source",),
+    "maidy_messages_total": ("route",),
+}
+
+
+def render_prometheus() -> str:
+    lines = []
+    for metric in ALL_METRICS:
+        names = _LABEL_NAMES[metric.name]
+        if isinstance(metric, Histogram):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} histogram")
+            for labels, series in metric.series.items():
+                cumulative = 0
+                for bound, n in zip(BUCKETS + (float("inf"),), series.buckets):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    bucket_labels = _label_str(names, labels, f'le="{le}"')
+                    lines.append(f"{metric.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{metric.name}_sum{_label_str(names, labels)} {series.sum}")
+                lines.append(f"{metric.name}_count{_label_str(names, labels)} {series.count}")
+        else:
+            kind = "gauge" if isinstance(metric, Gauge) else "counter"
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {kind}")
+            for labels, value in metric.values.items():
+                lines.append(f"{metric.name}{_label_str(names, labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+async def _serve_http(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        # Drain the request head; every path serves the metrics page
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        body = render_prometheus().encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/plain; version=0.0.4\r\n"
+            + f"Content-Length: {len(body)}\r\n".encode()
+            + b"Connection: close\r\n\r\n"
+            + body
+        )
+        await writer.drain()
+    except Exception:
+        pass
+    finally:
+        writer.close()
@@ -1,20 +1,39 @@
 import discord
 import asyncio
+import time
 from datetime import datetime, timezone, timedelta
 from discord.ext import commands
 from perms import command_with_perms
+from audit_log import find_entry
+import components
+import log_sink
+import journal
+import jobs
+import message_router
+import startup
+from log_sink import Priority
+from message_cache import CachedMessage
 from constants import (
     JOIN_LEAVE_LOG_ID,
     SPAM_BOT_CHANNEL_ID,
     BAN_LOG_ID,
     MESSAGE_LOG_ID,
     RESTRICTED_ROLE_ID,
-    SOAP_CHANNEL_SUFFIX,
-    NNID_CHANNEL_SUFFIX,
-    SOAP_CHANNEL_CATEGORY_ID,
-    MANUAL_SOAP_CATEGORY_ID,
-    NNID_CHANNEL_CATEGORY_ID,
 )
+from channel_index import ChannelKind, classify_channel, channels_owned_by
+
+# Seconds a ban/unban/timeout listener waits for its audit log entry to appear
+AUDIT_WAIT_SECONDS = 3
+
+# Honeypot: messages arriving this close together are banned as one wave
+HONEYPOT_WAVE_SECONDS = 1.0
+# Honeypot: one cleanup purge per this many seconds, however many bots hit it
+HONEYPOT_PURGE_DELAY = 30
+HONEYPOT_BAN_REASON = "Spam bot auto-ban/unban"
+HONEYPOT_UNBAN_REASON = "Spam bot auto-unban"
+
+# Leaves are collected for this long and alerted in one pass (raids / mass kicks)
+LEAVE_ALERT_BATCH_SECONDS = 2.0
 
 
 def _format_account_age(created_at: datetime) -> str:
@@ -103,23 +122,15 @@ class HelpeeLeftView(discord.ui.View):
             pass
 
         channel = interaction.channel
-        if not channel or not channel.category:
+        if not channel:
             return
 
-        is_soap = (
-            channel.category.id == SOAP_CHANNEL_CATEGORY_ID
-            and channel.name.endswith(SOAP_CHANNEL_SUFFIX)
-        ) or channel.category.id == MANUAL_SOAP_CATEGORY_ID
-        is_nnid = (
-            channel.category.id == NNID_CHANNEL_CATEGORY_ID
-            and channel.name.endswith(NNID_CHANNEL_SUFFIX)
-        )
-
-        if is_soap:
+        kind = classify_channel(channel)
+        if kind.is_soap:
             soap_cog = interaction.client.get_cog("SoapCog")
             if soap_cog:
                 await soap_cog.deletesoap(channel, interaction)
-        elif is_nnid:
+        elif kind is ChannelKind.NNID:
             nnid_cog = interaction.client.get_cog("NNIDCog")
             if nnid_cog:
                 await nnid_cog.deletennid(channel, interaction)
@@ -130,10 +141,51 @@ class ModerationCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # member_id -> (guild, user who left) waiting for the next helpee-left flush
+        self._pending_leaves: dict[int, tuple[discord.Guild, discord.User]] = {}
+        self._leave_flush_task: asyncio.Task | None = None
+        self.leave_stats = {
+            "leaves": 0,
+            "batches": 0,
+            "largest_batch": 0,
+            "rejoined": 0,
+            "alerts": 0,
+            "lookup_ms_total": 0.0,
+            "lookup_ms_max": 0.0,
+        }
+        # Honeypot pipeline: queue of (guild, user), ids already queued or being
+        # banned, the worker draining the queue and the pending cleanup purge
+        self._honeypot_queue: asyncio.Queue = asyncio.Queue()
+        self._honeypot_inflight: set[int] = set()
+        self._honeypot_worker: asyncio.Task | None = None
+        self._honeypot_purge_task: asyncio.Task | None = None
+        message_router.add_route(
+            "honeypot", self.handle_honeypot_message, channel_ids=[SPAM_BOT_CHANNEL_ID]
+        )
+        startup.add_warmup("honeypot_info", self.warm_up)
+
+    def cog_unload(self):
+        message_router.remove_route("honeypot")
+        startup.remove_warmup("honeypot_info")
+
+    def export_state(self) -> dict:
+        # The honeypot worker and leave flush finish on the old cog
+        return {"leave_stats": self.leave_stats}
 
-    async def _send_member_log(self, member: discord.Member, joined: bool):
+    def import_state(self, state: dict):
+        self.leave_stats.update(state["leave_stats"])
+
+    async def _send_member_log(
+        self, guild: discord.Guild, member: discord.Member | discord.User, joined: bool
+    ):
         """Send a join/leave embed to the JOIN_LEAVE_LOG_ID channel."""
-        guild = member.guild
+        journal.record(
+            "member.join" if joined else "member.leave",
+            guild_id=guild.id,
+            user_id=member.id,
+            user=str(member),
+            created_at=member.created_at,
+        )
         channel = guild.get_channel(JOIN_LEAVE_LOG_ID)
         if channel is None:
             return
@@ -159,7 +211,7 @@ class ModerationCog(commands.Cog):
         timestamp = _format_pst_time()
         embed.set_footer(text=f"ID: {member.id} • {timestamp}")
 
-        await channel.send(embed=embed)
+        log_sink.enqueue(channel, embed=embed, priority=Priority.LOW)
 
     async def _log_mod_action(
         self,
@@ -173,6 +225,16 @@ class ModerationCog(commands.Cog):
         timeout_until: datetime | None = None,
     ):
         """Log moderation actions (ban, kick, timeout, restrict, etc.) to the ban log channel."""
+        journal.record(
+            f"moderation.{action.lower()}",
+            guild_id=guild.id,
+            user_id=user.id,
+            user=str(user),
+            moderator_id=moderator.id if moderator else None,
+            reason=reason,
+            source=source,
+            timeout_until=timeout_until,
+        )
         if not BAN_LOG_ID:
             return
 
@@ -249,10 +311,7 @@ class ModerationCog(commands.Cog):
                 inline=False,
             )
 
-        try:
-            await log_channel.send(embed=embed)
-        except Exception:
-            pass
+        log_sink.enqueue(log_channel, embed=embed, priority=Priority.HIGH)
 
     async def _ensure_spam_bot_info_message(self, guild: discord.Guild):
         """Ensure the spam bot channel has the info embed present."""
@@ -307,20 +366,23 @@ class ModerationCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
-        await self._send_member_log(member, joined=True)
+        await self._send_member_log(member.guild, member, joined=True)
 
     @commands.Cog.listener()
-    async def on_member_remove(self, member: discord.Member):
-        await self._send_member_log(member, joined=False)
-        # Also check if this was a kick and log it
-        await self._maybe_log_kick(member)
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        # Raw, since member_remove only fires for members in the member cache
+        guild = self.bot.get_guild(payload.guild_id)
+        if guild is None:
+            return
+        user = payload.user
         # If the member had a SOAP/NNID channel, alert in that channel with a close button
-        await self._maybe_alert_helpee_left(member)
+        self._queue_helpee_left(guild, user)
+        await self._send_member_log(guild, user, joined=False)
+        # Also check if this was a kick and log it
+        await self._maybe_log_kick(guild, user)
 
-    @commands.Cog.listener()
-    async def on_ready(self):
+    async def warm_up(self):
         """On startup, ensure the spam bot info message exists in each guild."""
-        self.bot.add_view(HelpeeLeftView())
         for guild in self.bot.guilds:
             await self._ensure_spam_bot_info_message(guild)
 
@@ -330,22 +392,14 @@ class ModerationCog(commands.Cog):
         if not BAN_LOG_ID:
             return
 
-        moderator = None
-        reason = None
-
-        try:
-            async for entry in guild.audit_logs(
-                action=discord.AuditLogAction.ban, limit=5
-            ):
-                if entry.target.id == user.id:
-                    moderator = entry.user
-                    reason = entry.reason
-                    break
-        except Exception:
-            pass
+        entry = await find_entry(
+            guild, discord.AuditLogAction.ban, user.id, wait=AUDIT_WAIT_SECONDS
+        )
+        moderator = entry.user if entry else None
+        reason = entry.reason if entry else None
 
-        # Skip if this was the honeypot ban (already logged)
-        if reason == "Spam bot auto-ban/unban":
+        # Skip if this was the honeypot ban (already logged per wave)
+        if reason == HONEYPOT_BAN_REASON:
             return
 
         await self._log_mod_action(
@@ -363,19 +417,15 @@ class ModerationCog(commands.Cog):
         if not BAN_LOG_ID:
             return
 
-        moderator = None
-        reason = None
+        entry = await find_entry(
+            guild, discord.AuditLogAction.unban, user.id, wait=AUDIT_WAIT_SECONDS
+        )
+        moderator = entry.user if entry else None
+        reason = entry.reason if entry else None
 
-        try:
-            async for entry in guild.audit_logs(
-                action=discord.AuditLogAction.unban, limit=5
-            ):
-                if entry.target.id == user.id:
-                    moderator = entry.user
-                    reason = entry.reason
-                    break
-        except Exception:
-            pass
+        # Skip the honeypot's own unban (already logged per wave)
+        if reason == HONEYPOT_UNBAN_REASON:
+            return
 
         await self._log_mod_action(
             guild=guild,
@@ -386,75 +436,65 @@ class ModerationCog(commands.Cog):
             source=None,
         )
 
+    async def _resolve_user(self, guild: discord.Guild, user_id: int | None):
+        """The member, or the user if they aren't cached as a member, for an ID from a raw event."""
+        if user_id is None:
+            return None
+        user = guild.get_member(user_id) or self.bot.get_user(user_id)
+        if user is None:
+            try:
+                user = await self.bot.fetch_user(user_id)
+            except discord.HTTPException:
+                return None
+        return user
+
     @commands.Cog.listener()
-    async def on_member_update(self, before: discord.Member, after: discord.Member):
-        """Log timeout actions when a member's timeout status changes."""
-        if not BAN_LOG_ID:
+    async def on_raw_audit_log_entry(self, payload: discord.RawAuditLogEntryEvent):
+        """
+        Log timeouts and their removal from the audit log entry itself. Members
+        outside the member cache get no member_update, so this is the one event
+        that sees every timeout, and it names the moderator directly.
+        """
+        if not BAN_LOG_ID or payload.action_type is not discord.AuditLogAction.member_update:
+            return
+        change = next(
+            (c for c in payload.changes or () if c.get("key") == "communication_disabled_until"),
+            None,
+        )
+        if change is None:
             return
+        before_timeout = change.get("old_value")
+        after_timeout = change.get("new_value")
+        if (before_timeout is None) == (after_timeout is None):
+            return  # timeout extended or shortened, not applied or removed
 
-        # Check if timeout status changed (Pycord uses communication_disabled_until for timeouts)
-        before_timeout = getattr(before, "communication_disabled_until", None)
-        after_timeout = getattr(after, "communication_disabled_until", None)
+        guild = self.bot.get_guild(payload.guild_id)
+        if guild is None:
+            return
+        user = await self._resolve_user(guild, payload.target_id)
+        if user is None:
+            return
+        moderator = await self._resolve_user(guild, payload.user_id)
 
         # Timeout was applied
-        if before_timeout is None and after_timeout is not None:
-            moderator = None
-            reason = None
-
-            try:
-                async for entry in after.guild.audit_logs(
-                    action=discord.AuditLogAction.member_update, limit=10
-                ):
-                    if (
-                        entry.target.id == after.id
-                        and getattr(entry.after, "communication_disabled_until", None)
-                        is not None
-                        and getattr(entry.before, "communication_disabled_until", None)
-                        is None
-                    ):
-                        moderator = entry.user
-                        reason = entry.reason
-                        break
-            except Exception:
-                pass
-
+        if after_timeout is not None:
             await self._log_mod_action(
-                guild=after.guild,
-                user=after,
+                guild=guild,
+                user=user,
                 action="timeout",
                 moderator=moderator,
-                reason=reason,
+                reason=payload.reason,
                 source=None,
-                timeout_until=after_timeout,
+                timeout_until=datetime.fromisoformat(after_timeout),
             )
-        # Timeout was removed
-        elif before_timeout is not None and after_timeout is None:
-            moderator = None
-            reason = None
-
-            try:
-                async for entry in after.guild.audit_logs(
-                    action=discord.AuditLogAction.member_update, limit=10
-                ):
-                    if (
-                        entry.target.id == after.id
-                        and getattr(entry.after, "communication_disabled_until", None)
-                        is None
-                        and getattr(entry.before, "communication_disabled_until", None)
-                    ):
-                        moderator = entry.user
-                        reason = entry.reason
-                        break
-            except Exception:
-                pass
-
-            # Log as "untimeout"
+        # Timeout was removed, logged as "untimeout"
+        else:
             await self._log_mod_action(
-                guild=after.guild,
-                user=after,
+                guild=guild,
+                user=user,
                 action="untimeout",
                 moderator=moderator,
-                reason=reason,
+                reason=payload.reason,
                 source=None,
             )
 
@@ -472,36 +512,30 @@ class ModerationCog(commands.Cog):
         return None
 
     @commands.Cog.listener()
-    async def on_message_edit(self, before: discord.Message, after: discord.Message):
+    async def on_cached_message_edit(self, before: CachedMessage, after: CachedMessage):
         """Log message edits in the message log channel (Dyno-style)."""
-        # Ignore DMs and bots
-        if not after.guild or after.author.bot:
+        guild = self.bot.get_guild(after.guild_id)
+        if guild is None:
             return
 
         # No channel configured
-        log_channel = self._get_message_log_channel(after.guild)
+        log_channel = self._get_message_log_channel(guild)
         if log_channel is None:
             return
 
-        # Skip if content didn't actually change or we don't have old content
+        # Skip if content didn't actually change (e.g. an embed unfurled)
         if before.content == after.content:
             return
 
         # Build embed
         embed = discord.Embed(color=discord.Color.blurple())
         # Author is the user who edited the message
-        embed.set_author(
-            name=str(after.author),
-            icon_url=after.author.display_avatar.url,
-        )
+        embed.set_author(name=after.author_name, icon_url=after.author_avatar)
 
         # One-line description with channel and jump link
-        desc = f"Message edited in {after.channel.mention}"
-        try:
-            desc += f" • [Jump to Message]({after.jump_url})"
-        except Exception:
-            pass
-        embed.description = desc
+        embed.description = (
+            f"Message edited in <#{after.channel_id}> • [Jump to Message]({after.jump_url})"
+        )
 
         before_text = before.content or "*no content*"
         after_text = after.content or "*no content*"
@@ -516,46 +550,43 @@ class ModerationCog(commands.Cog):
         embed.add_field(name="After", value=after_text, inline=False)
 
         timestamp = _format_pst_time()
-        embed.set_footer(text=f"User ID: {after.author.id} • {timestamp}")
+        embed.set_footer(text=f"User ID: {after.author_id} • {timestamp}")
 
-        try:
-            await log_channel.send(embed=embed)
-        except Exception:
-            pass
+        log_sink.enqueue(log_channel, embed=embed, priority=Priority.LOW)
 
     @commands.Cog.listener()
-    async def on_message_delete(self, message: discord.Message):
+    async def on_cached_message_delete(self, message: CachedMessage):
         """Log message deletions in the message log channel (Dyno-style)."""
-        # Ignore DMs and bots
-        if not message.guild or message.author.bot:
+        guild = self.bot.get_guild(message.guild_id)
+        if guild is None:
             return
 
-        log_channel = self._get_message_log_channel(message.guild)
+        log_channel = self._get_message_log_channel(guild)
         if log_channel is None:
             return
 
         embed = discord.Embed(color=discord.Color.red())
-        embed.set_author(
-            name=str(message.author),
-            icon_url=message.author.display_avatar.url,
-        )
+        embed.set_author(name=message.author_name, icon_url=message.author_avatar)
 
         content = message.content or "*no content*"
         if len(content) > 1024:
             content = content[:1021] + "..."
 
-        first_line = f"**Message sent by {message.author.mention} • Deleted in {message.channel.mention}**"
+        first_line = f"**Message sent by <@{message.author_id}> • Deleted in <#{message.channel_id}>**"
         embed.description = f"{first_line}\n{content}"
+        if message.attachments:
+            embed.add_field(
+                name="Attachments",
+                value=", ".join(message.attachments)[:1024],
+                inline=False,
+            )
 
         timestamp = _format_pst_time()
         embed.set_footer(
-            text=f"Author: {message.author.id} | Message ID: {message.id} • {timestamp}"
+            text=f"Author: {message.author_id} | Message ID: {message.id} • {timestamp}"
         )
 
-        try:
-            await log_channel.send(embed=embed)
-        except Exception:
-            pass
+        log_sink.enqueue(log_channel, embed=embed, priority=Priority.LOW)
 
     @command_with_perms(
         min_role="Developer",
@@ -795,151 +826,277 @@ class ModerationCog(commands.Cog):
 
         await ctx.respond(embed=embed, ephemeral=True)
 
-    async def _maybe_log_kick(self, member: discord.Member):
+    async def _maybe_log_kick(self, guild: discord.Guild, member: discord.Member | discord.User):
         """Check recent audit logs to see if the member was kicked and log it."""
         if not BAN_LOG_ID:
             return
 
-        guild = member.guild
+        # Every leave comes through here, so don't wait around - only kicks
+        # already in the audit log within the last ~10 seconds count
+        entry = await find_entry(guild, discord.AuditLogAction.kick, member.id, max_age=10)
+        if entry is not None:
+            await self._log_mod_action(
+                guild=guild,
+                user=member,
+                action="kick",
+                moderator=entry.user,
+                reason=entry.reason,
+                source=None,
+            )
+
+    def _queue_helpee_left(self, guild: discord.Guild, member: discord.Member | discord.User):
+        """Queue a departed member for the next batched helpee-left alert pass."""
+        self.leave_stats["leaves"] += 1
+        self._pending_leaves[member.id] = (guild, member)
+        if self._leave_flush_task is None or self._leave_flush_task.done():
+            self._leave_flush_task = asyncio.create_task(self._flush_helpee_left())
+
+    async def _flush_helpee_left(self):
+        """Alert SOAP/NNID channels of everyone who left during the batch window."""
+        stats = self.leave_stats
+        while self._pending_leaves:
+            await asyncio.sleep(LEAVE_ALERT_BATCH_SECONDS)
+            pending, self._pending_leaves = self._pending_leaves, {}
+            stats["batches"] += 1
+            stats["largest_batch"] = max(stats["largest_batch"], len(pending))
+
+            started = time.perf_counter()
+            # channel_id -> (channel, members who owned it)
+            alerts: dict[int, tuple[discord.TextChannel, list[discord.Member]]] = {}
+            for guild, member in pending.values():
+                # Rejoined within the window - nothing to alert about
+                if guild.get_member(member.id) is not None:
+                    stats["rejoined"] += 1
+                    continue
+                for ch in channels_owned_by(guild, member.id):
+                    alerts.setdefault(ch.id, (ch, []))[1].append(member)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stats["lookup_ms_total"] += elapsed_ms
+            stats["lookup_ms_max"] = max(stats["lookup_ms_max"], elapsed_ms)
+
+            for ch, members in alerts.values():
+                await self._alert_helpee_left(ch, members)
+
+    async def _alert_helpee_left(
+        self, ch: discord.TextChannel, members: list[discord.Member]
+    ):
+        """Send the helpee-left alert with a close button to a SOAP/NNID channel."""
+        embed = discord.Embed(
+            title="⚠️ Helpee Left the Server",
+            description="\n".join(
+                f"{member} (ID: {member.id}) has left the server." for member in members
+            ),
+            color=discord.Color.orange(),
+        )
+        embed.set_footer(text="Click the button below to close this channel.")
         try:
-            async for entry in guild.audit_logs(
-                action=discord.AuditLogAction.kick, limit=5
-            ):
-                if entry.target.id == member.id:
-                    # Only log if the kick is recent (within ~10 seconds)
-                    if (
-                        datetime.now(timezone.utc) - entry.created_at
-                    ).total_seconds() <= 10:
-                        await self._log_mod_action(
-                            guild=guild,
-                            user=member,
-                            action="kick",
-                            moderator=entry.user,
-                            reason=entry.reason,
-                            source=None,
-                        )
-                    break
+            await ch.send(embed=embed, view=HelpeeLeftView())
+            self.leave_stats["alerts"] += 1
         except Exception:
             pass
 
-    async def _maybe_alert_helpee_left(self, member: discord.Member):
-        """If the member had a SOAP or NNID channel, send an alert with a close button."""
-        guild = member.guild
-        mention_plain = f"<@{member.id}>"
-        mention_nick = f"<@!{member.id}>"
-
-        for ch in guild.text_channels:
-            if not ch.category or not isinstance(ch, discord.TextChannel):
-                continue
-            topic = getattr(ch, "topic", None) or ""
-            if mention_plain not in topic and mention_nick not in topic:
-                continue
-            # Channel belongs to this member - check if it's SOAP or NNID
-            is_soap = (
-                ch.category.id == SOAP_CHANNEL_CATEGORY_ID
-                and ch.name.endswith(SOAP_CHANNEL_SUFFIX)
-            ) or ch.category.id == MANUAL_SOAP_CATEGORY_ID
-            is_nnid = ch.category.id == NNID_CHANNEL_CATEGORY_ID and ch.name.endswith(
-                NNID_CHANNEL_SUFFIX
-            )
-            if not (is_soap or is_nnid):
-                continue
-
-            transfer_type = "SOAP" if is_soap else "NNID"
-            embed = discord.Embed(
-                title="⚠️ Helpee Left the Server",
-                description=f"{member} (ID: {member.id}) has left the server.",
-                color=discord.Color.orange(),
-            )
-            embed.set_footer(text="Click the button below to close this channel.")
-            try:
-                await ch.send(embed=embed, view=HelpeeLeftView())
-            except Exception:
-                pass
-
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        """Handle spam bot channel - auto ban/unban users without sending DMs"""
-        # Only process messages in the spam bot channel
-        if not message.guild or message.channel.id != SPAM_BOT_CHANNEL_ID:
-            return
+    @command_with_perms(
+        min_role="Developer",
+        name="leavestats",
+        help="Show helpee-left batching and lookup stats. Developers only.",
+    )
+    async def leave_stats_command(self, ctx):
+        """Show how much work member-leave handling has done since startup."""
+        stats = self.leave_stats
+        batches = stats["batches"]
+        avg_ms = stats["lookup_ms_total"] / batches if batches else 0.0
+        embed = discord.Embed(title="Helpee-left stats", color=discord.Color.blurple())
+        embed.add_field(name="Leaves", value=str(stats["leaves"]), inline=True)
+        embed.add_field(name="Batches", value=str(batches), inline=True)
+        embed.add_field(
+            name="Largest batch", value=str(stats["largest_batch"]), inline=True
+        )
+        embed.add_field(name="Rejoined", value=str(stats["rejoined"]), inline=True)
+        embed.add_field(name="Alerts sent", value=str(stats["alerts"]), inline=True)
+        embed.add_field(
+            name="Pending", value=str(len(self._pending_leaves)), inline=True
+        )
+        embed.add_field(
+            name="Lookup time",
+            value=f"avg {avg_ms:.2f} ms / max {stats['lookup_ms_max']:.2f} ms per batch",
+            inline=False,
+        )
+        await ctx.respond(embed=embed, ephemeral=True)
 
+    async def handle_honeypot_message(self, message: discord.Message):
+        """Handle spam bot channel (routed by message_router) - auto ban/unban users without sending DMs"""
         # Ignore bot messages
         if message.author.bot:
             return
 
+        # Already queued for this wave - the ban clears their messages anyway
+        if message.author.id in self._honeypot_inflight:
+            return
+        self._honeypot_inflight.add(message.author.id)
+
         # Delete the message
         try:
             await message.delete()
         except Exception:
             pass
 
-        channel_id = message.channel.id
-        guild = message.guild
-        user = message.author
+        self._schedule_honeypot_purge(message.guild)
+        self._honeypot_queue.put_nowait((message.guild, message.author))
+        if self._honeypot_worker is None or self._honeypot_worker.done():
+            self._honeypot_worker = asyncio.create_task(self._run_honeypot_worker())
+
+    def _schedule_honeypot_purge(self, guild: discord.Guild):
+        """Purge leftovers once, 30s after the first hit, in case deletes failed (e.g. rate limit)."""
+        if self._honeypot_purge_task is not None and not self._honeypot_purge_task.done():
+            return
 
-        # Schedule a retry purge 30s later in case the delete failed (e.g. rate limit)
-        async def retry_honeypot_purge():
-            await asyncio.sleep(30)
-            ch = guild.get_channel(channel_id)
+        async def purge_honeypot():
+            await asyncio.sleep(HONEYPOT_PURGE_DELAY)
+            ch = guild.get_channel(SPAM_BOT_CHANNEL_ID)
             if ch is None or not isinstance(ch, discord.TextChannel):
                 return
+            # Keeps the info embed
+            await jobs.submit(
+                "purge_channel", channel_id=ch.id, limit=50, keep_embed_title="🍯 Honeypot"
+            )
+            await self._ensure_spam_bot_info_message(guild)
+
+        self._honeypot_purge_task = asyncio.create_task(purge_honeypot())
+
+    async def _run_honeypot_worker(self):
+        """Drain the honeypot queue one wave at a time: ban all, wait once, unban all."""
+        while not self._honeypot_queue.empty():
+            # Give the rest of the wave a moment to arrive
+            await asyncio.sleep(HONEYPOT_WAVE_SECONDS)
+            waves: dict[int, tuple[discord.Guild, list]] = {}
+            while not self._honeypot_queue.empty():
+                guild, user = self._honeypot_queue.get_nowait()
+                waves.setdefault(guild.id, (guild, []))[1].append(user)
+            for guild, users in waves.values():
+                try:
+                    await self._honeypot_wave(guild, users)
+                finally:
+                    self._honeypot_inflight.difference_update(u.id for u in users)
+
+    async def _honeypot_wave(self, guild: discord.Guild, users: list):
+        """Ban (clearing the last hour of messages) and immediately unban a wave of spam bots."""
+        banned = []
+        failed = []
+        bulk = True
+        # bulk_ban takes at most 200 users per request
+        for i in range(0, len(users), 200):
+            chunk = users[i : i + 200]
+            if not bulk:
+                await self._honeypot_ban_each(guild, chunk, banned, failed)
+                continue
             try:
+                ok, bad = await guild.bulk_ban(
+                    *chunk, delete_message_seconds=3600, reason=HONEYPOT_BAN_REASON
+                )
+                banned.extend(ok)
+                failed.extend(bad)
+            except discord.Forbidden:
+                # Bulk ban also needs Manage Server; ban one by one with just Ban Members
+                print(f"Bulk ban not permitted, banning {len(chunk)} spam bot(s) one by one")
+                bulk = False
+                await self._honeypot_ban_each(guild, chunk, banned, failed)
+            except discord.HTTPException as e:
+                # Log HTTP errors for debugging
+                print(f"Failed to ban {len(chunk)} spam bot(s) - HTTP error: {e}")
+                failed.extend(chunk)
+            except Exception as e:
+                # Log other errors
+                print(f"Failed to ban {len(chunk)} spam bot(s) - error: {e}")
+                failed.extend(chunk)
+
+        if not banned and not failed:
+            return
 
-                def keep_info_embed(m: discord.Message) -> bool:
-                    if m.author != self.bot.user or not m.embeds:
-                        return False
-                    return m.embeds[0].title == "🍯 Honeypot"
+        # Log the whole wave as one moderated ban entry, failures included
+        await self._log_honeypot_wave(guild, banned, failed)
+        if not banned:
+            return
 
-                await ch.purge(limit=50, check=lambda m: not keep_info_embed(m))
-            except Exception:
-                pass
-            await self._ensure_spam_bot_info_message(guild)
+        # Small delay to ensure bans are processed
+        await asyncio.sleep(0.5)
 
-        asyncio.create_task(retry_honeypot_purge())
+        # Unban everyone immediately
+        for user in banned:
+            try:
+                await guild.unban(user, reason=HONEYPOT_UNBAN_REASON)
+            except discord.NotFound:
+                # User wasn't banned (shouldn't happen, but handle gracefully)
+                pass
+            except discord.HTTPException as e:
+                # Log HTTP errors for debugging
+                print(f"Failed to unban {user} - HTTP error: {e}")
+            except Exception as e:
+                # Log other errors
+                print(f"Failed to unban {user} - error: {e}")
+
+    async def _honeypot_ban_each(self, guild: discord.Guild, users: list, banned: list, failed: list):
+        """Ban users one at a time, sorting them into banned and failed."""
+        for user in users:
+            try:
+                await guild.ban(user, delete_message_seconds=3600, reason=HONEYPOT_BAN_REASON)
+                banned.append(user)
+            except discord.Forbidden:
+                # Bot doesn't have ban permissions (or the user is above it)
+                print(f"Failed to ban {user} - missing ban permissions")
+                failed.append(user)
+            except discord.HTTPException as e:
+                print(f"Failed to ban {user} - HTTP error: {e}")
+                failed.append(user)
+
+    async def _log_honeypot_wave(self, guild: discord.Guild, banned: list, failed: list):
+        """Log a honeypot wave: the usual ban embed for one bot, a summary embed for many."""
+        journal.record(
+            "moderation.honeypot_wave",
+            guild_id=guild.id,
+            user_ids=[user.id for user in banned],
+            failed_ids=[user.id for user in failed],
+        )
+        if len(banned) == 1 and not failed:
+            return await self._log_mod_action(
+                guild=guild,
+                user=banned[0],
+                action="ban",
+                moderator=guild.me,
+                reason=HONEYPOT_BAN_REASON,
+                source="Honeypot",
+            )
 
-        # Ban the user (clearing messages from the last hour)
-        reason = "Spam bot auto-ban/unban"
-        try:
-            await guild.ban(user, delete_message_seconds=3600, reason=reason)
-        except discord.Forbidden:
-            # Bot doesn't have ban permissions
-            print(f"Failed to ban {user} - missing ban permissions")
-            return
-        except discord.HTTPException as e:
-            # Log HTTP errors for debugging
-            print(f"Failed to ban {user} - HTTP error: {e}")
-            return
-        except Exception as e:
-            # Log other errors
-            print(f"Failed to ban {user} - error: {e}")
+        log_channel = guild.get_channel(BAN_LOG_ID) if BAN_LOG_ID else None
+        if log_channel is None:
             return
 
-        # Log the honeypot ban as a moderated ban
-        await self._log_mod_action(
-            guild=guild,
-            user=user,
-            action="ban",
-            moderator=guild.me,
-            reason=reason,
-            source="Honeypot",
+        lines = [f"{user.mention} {user} ({user.id})" for user in banned]
+        description = "\n".join(lines)
+        if len(description) > 4000:
+            # Embed descriptions cap at 4096 characters
+            description = description[:4000].rsplit("\n", 1)[0] + "\n…"
+        embed = discord.Embed(
+            title=f"🔨 Honeypot Wave - {len(banned)} Members Banned",
+            description=description or None,
+            color=discord.Color.red(),
+        )
+        embed.set_author(
+            name="Honeypot",
+            icon_url=self.bot.user.display_avatar.url if self.bot.user else None,
         )
+        embed.add_field(name="Reason", value=HONEYPOT_BAN_REASON, inline=False)
+        if failed:
+            embed.add_field(
+                name=f"Failed ({len(failed)})",
+                value=", ".join(f"{user.mention} ({user.id})" for user in failed)[:1024],
+                inline=False,
+            )
+        embed.set_footer(text=_format_pst_time())
 
-        # Small delay to ensure ban is processed
-        await asyncio.sleep(0.5)
+        log_sink.enqueue(log_channel, embed=embed)
 
-        # Unban the user immediately
-        try:
-            await guild.unban(user, reason="Spam bot auto-unban")
-        except discord.NotFound:
-            # User wasn't banned (shouldn't happen, but handle gracefully)
-            pass
-        except discord.HTTPException as e:
-            # Log HTTP errors for debugging
-            print(f"Failed to unban {user} - HTTP error: {e}")
-        except Exception as e:
-            # Log other errors
-            print(f"Failed to unban {user} - error: {e}")
+
+components.persistent_view("HelpeeLeftView", lambda bot: HelpeeLeftView())
 
 
 def setup(bot: commands.Bot):
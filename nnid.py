@@ -3,6 +3,8 @@ import asyncio
 from perms import command_with_perms
 from exceptions import CategoryNotFound
 from log import log_to_soaper_log
+from channel_index import create_channel_once
+import member_cache
 from discord.ext import commands
 from discord.ext.bridge import BridgeOption
 import re
@@ -10,7 +12,6 @@ from constants import (
     NNID_CHANNEL_SUFFIX,
     BOOM_EMOTE_ID,
     NNID_CHANNEL_CATEGORY_ID,
-    TEMP_ARCHIVE_CATEGORY_ID,
     HELPEE_ROLE_ID,
     is_late_night_hours,
 )
@@ -72,32 +73,29 @@ class NNIDCog(commands.Cog):  # NNID commands
         # strip leading/trailing periods and then replace remaining periods with dashes
         safe_user_name = user.name.lstrip(".").rstrip(".").lower().replace(".", "-")
         channel_name = safe_user_name + NNID_CHANNEL_SUFFIX
-        existing_channel = None
-
-        # Only check channels in the NNID category (exclude archived)
-        for channel in guild.text_channels:
-            if channel.name == channel_name and channel.category:
-                if channel.category.id == NNID_CHANNEL_CATEGORY_ID:
-                    existing_channel = channel
-                    break
-
-        if existing_channel:
-            return (
-                False,
-                existing_channel,
-                f"NNID channel already made for `{user.name}`",
-            )
 
         category = discord.utils.get(guild.categories, id=NNID_CHANNEL_CATEGORY_ID)
         if not category:
             return False, None, "NNID category not found"
 
         try:
-            new_channel = await guild.create_text_channel(
-                name=channel_name,
-                category=category,
-                topic=f"This is the NNID channel for <@{user.id}>, please follow all provided instructions.",
+            # Concurrent requests for this user (double clicks, .creatennid) get the same channel
+            new_channel, created = await create_channel_once(
+                guild,
+                "nnid",
+                user.id,
+                lambda: guild.create_text_channel(
+                    name=channel_name,
+                    category=category,
+                    topic=f"This is the NNID channel for <@{user.id}>, please follow all provided instructions.",
+                ),
             )
+            if not created:
+                return (
+                    False,
+                    new_channel,
+                    f"NNID channel already made for `{user.name}`",
+                )
 
             await new_channel.set_permissions(user, read_messages=True)
 
@@ -139,7 +137,7 @@ class NNIDCog(commands.Cog):  # NNID commands
                     m = re.search(r"<@!?(\d+)>", topic)
                     if m:
                         user_id = int(m.group(1))
-                        member = channel.guild.get_member(user_id)
+                        member = await member_cache.get_member(channel.guild, user_id)
                         if member and isinstance(member, discord.Member):
                             role = channel.guild.get_role(HELPEE_ROLE_ID)
                             if role and role in member.roles:
@@ -170,33 +168,25 @@ class NNIDCog(commands.Cog):  # NNID commands
         channel_name = (
             user.name.lower().replace(".", "-") + NNID_CHANNEL_SUFFIX
         )  # channels can't have periods
-        channel = discord.utils.get(ctx.guild.channels, name=channel_name)
-        # Don't count archived channels as existing
-        if (
-            channel
-            and TEMP_ARCHIVE_CATEGORY_ID
-            and channel.category
-            and channel.category.id == TEMP_ARCHIVE_CATEGORY_ID
-        ):
-            channel = None
-
-        if channel:
+        category = discord.utils.get(ctx.guild.categories, id=NNID_CHANNEL_CATEGORY_ID)
+
+        async def create():
+            if not category:
+                raise CategoryNotFound(NNID_CHANNEL_CATEGORY_ID)
+            return await ctx.guild.create_text_channel(
+                name=channel_name,
+                category=category,
+                topic=f"This is the NNID channel for <@{user.id}>, please follow all provided instructions.",
+            )
+
+        # Shares the in-flight creation with a button flow for the same user
+        new, created = await create_channel_once(ctx.guild, "nnid", user.id, create)
+
+        if not created:
             await ctx.respond(
-                f"NNID channel already made for `{user.name}` at {channel.jump_url}"
+                f"NNID channel already made for `{user.name}` at {new.jump_url}"
             )
         else:
-            category = discord.utils.get(
-                ctx.guild.categories, id=NNID_CHANNEL_CATEGORY_ID
-            )
-            if category:
-                new = await ctx.guild.create_text_channel(
-                    name=channel_name,
-                    category=category,
-                    topic=f"This is the NNID channel for <@{user.id}>, please follow all provided instructions.",
-                )
-            else:
-                raise CategoryNotFound(NNID_CHANNEL_CATEGORY_ID)
-
             await new.set_permissions(user, read_messages=True)
             await self.create_nnid_interface(new, user)
             await ctx.respond(new.jump_url)
@@ -2,10 +2,11 @@ from pathlib import Path
 import discord
 from discord.ext import commands
 from perms import command_with_perms
+from channel_index import nnid_channels_owned_by
+import components
+import request_embeds
 from constants import (
     REQUEST_NNID_CHANNEL_ID,
-    NNID_CHANNEL_SUFFIX,
-    NNID_CHANNEL_CATEGORY_ID,
     RESTRICTED_ROLE_ID,
 )
 
@@ -399,17 +400,8 @@ class NNIDRequestView(discord.ui.View):
         self, button: discord.ui.Button, interaction: discord.Interaction
     ):
         # check if user already has a NNID channel
-        channel_name = (
-            interaction.user.name.lower().replace(".", "-") + NNID_CHANNEL_SUFFIX
-        )
-        existing_channel = None
-
-        # only check channels in the NNID category
-        for channel in interaction.guild.text_channels:
-            if channel.name == channel_name and channel.category:
-                if channel.category.id == NNID_CHANNEL_CATEGORY_ID:
-                    existing_channel = channel
-                    break
+        owned = nnid_channels_owned_by(interaction.guild, interaction.user.id)
+        existing_channel = owned[0] if owned else None
 
         if existing_channel:
             embed = discord.Embed(
@@ -422,10 +414,7 @@ class NNIDRequestView(discord.ui.View):
             return
 
         # check if user has the restricted role (set role in constants.py)
-        restricted_role = discord.utils.get(
-            interaction.guild.roles, id=RESTRICTED_ROLE_ID
-        )
-        if restricted_role in interaction.user.roles:
+        if interaction.user.get_role(RESTRICTED_ROLE_ID) is not None:
             embed = discord.Embed(
                 title="⛔ Restricted from Bluehax Services",
                 description="You are unable to request a new NNID transfer. This restriction may be temporary or permanent, depending on the reason.\n\nYou may still receive help with previously completed NNID transfers in #soap-help.",
@@ -475,22 +464,15 @@ class NNIDRequestCog(commands.Cog):
         embed.set_footer(text="Click the button below to request a NNID transfer.")
         view = NNIDRequestView()
 
-        # Try to load the image file
-        file = None
-        try:
-            path = Path(__file__).parent / "assets" / "NNIDTransfer.webp"
-            file = discord.File(fp=path, filename="NNIDTransfer.webp")
-            embed.set_image(url="attachment://NNIDTransfer.webp")
-        except FileNotFoundError as e:
-            print(f"Error: Could not find assets/NNIDTransfer.webp - {e}")
-            pass
-
-        return embed, view, file
+        # Use the image if it's there
+        image = Path(__file__).parent / "assets" / "NNIDTransfer.webp"
+        if image.exists():
+            embed.set_image(url=f"attachment://{image.name}")
+        else:
+            print("Error: Could not find assets/NNIDTransfer.webp")
+            image = None
 
-    # This fixes broken embeds if the bot stops.
-    @commands.Cog.listener()
-    async def on_ready(self):
-        self.bot.add_view(NNIDRequestView())
+        return embed, view, image
 
     @command_with_perms(
         name="requestnnid",
@@ -498,19 +480,19 @@ class NNIDRequestCog(commands.Cog):
         help="Creates an embed with a button for NNID transfer requests",
     )
     async def requestnnid(self, ctx):
+        embed, view, image = self._create_nnid_request_embed_and_view()
         if ctx.channel.id == REQUEST_NNID_CHANNEL_ID:
-            try:
-                await ctx.channel.purge(limit=None)
-            except discord.Forbidden:
-                print("No permission to clear messages in request NNID channel")
-            except Exception as e:
-                print(f"Error clearing request NNID channel: {e}")
-        embed, view, file = self._create_nnid_request_embed_and_view()
-        if file:
-            await ctx.respond(embed=embed, view=view, file=file)
+            # Edited in place, and only when something changed
+            return await request_embeds.refresh_for_command(ctx, embed, view, image)
+        if image:
+            await ctx.respond(embed=embed, view=view, file=discord.File(fp=image, filename=image.name))
         else:
             await ctx.respond(embed=embed, view=view)
 
 
+# This fixes broken embeds if the bot stops.
+components.persistent_view("NNIDRequestView", lambda bot: NNIDRequestView())
+
+
 def setup(bot):
     return bot.add_cog(NNIDRequestCog(bot))
@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands, bridge
-from constants import SOAP_USABLE_IDS, NNID_CHANNEL_CATEGORY_ID, NNID_CHANNEL_SUFFIX
+from channel_index import ChannelKind, classify_channel, is_soap_usable
 
 
 def _get_member(ctx) -> discord.Member | None:
@@ -14,9 +14,64 @@ def _get_member(ctx) -> discord.Member | None:
     return None
 
 
+# guild_id -> {role name: role}, rebuilt whenever the guild's roles change
+_role_index: dict[int, dict[str, discord.Role]] = {}
+# (guild_id, member_id) -> {requirement: whether the member passes it}
+_decision_cache: dict[tuple[int, int], dict[tuple, bool]] = {}
+_DECISION_CACHE_MAX = 10000
+# Names of the roles some command requires (min_role or allowed_roles)
+required_roles: set[str] = set()
+
+
+def _rebuild_role_index(guild: discord.Guild) -> dict[str, discord.Role]:
+    """Index the guild's roles by name. Lowest role wins on duplicate names, like discord.utils.get."""
+    index: dict[str, discord.Role] = {}
+    for role in guild.roles:
+        index.setdefault(role.name, role)
+    _role_index[guild.id] = index
+    return index
+
+
+def get_role_named(guild: discord.Guild, name: str) -> discord.Role | None:
+    """Look up a role by name through the per-guild index."""
+    index = _role_index.get(guild.id)
+    if index is None:
+        index = _rebuild_role_index(guild)
+    return index.get(name)
+
+
+def invalidate_guild(guild_id: int) -> None:
+    """Drop every cached permission decision for a guild (roles were created, moved or deleted)."""
+    for key in [k for k in _decision_cache if k[0] == guild_id]:
+        del _decision_cache[key]
+
+
+def invalidate_member(guild_id: int, member_id: int) -> None:
+    """Drop cached permission decisions for one member (their roles changed)."""
+    _decision_cache.pop((guild_id, member_id), None)
+
+
 def _has_role_or_higher(member: discord.Member, role: discord.Role) -> bool:
     """Check if member has the role or a higher-positioned role."""
-    return role in member.roles or member.top_role.position > role.position
+    return (
+        member.get_role(role.id) is not None
+        or member.top_role.position > role.position
+    )
+
+
+def _check_requirement(
+    member: discord.Member, min_role: str, allowed_roles: list[str] | None
+) -> bool:
+    """Uncached permission check against the role index."""
+    if allowed_roles is not None:
+        for role_name in allowed_roles:
+            role = get_role_named(member.guild, role_name)
+            if role and member.get_role(role.id) is not None:
+                return True
+        return False
+
+    role = get_role_named(member.guild, min_role)
+    return role is not None and _has_role_or_higher(member, role)
 
 
 def command_with_perms(
@@ -31,26 +86,38 @@ def command_with_perms(
     if allowed_roles is not None and min_role != "Default":
         raise ValueError("Use either min_role or allowed_roles, not both")
 
+    if allowed_roles is not None:
+        requirement = ("any", tuple(allowed_roles))
+        missing = " or ".join(allowed_roles)
+        required_roles.update(allowed_roles)
+    else:
+        requirement = ("min", min_role)
+        missing = min_role
+        if min_role != "Default":
+            required_roles.add(min_role)
+
     def check_perms(ctx) -> bool:
         member = _get_member(ctx)
         if member is None:
             raise commands.CheckFailure("Could not determine member from context")
 
-        if allowed_roles is not None:
-            for role_name in allowed_roles:
-                role = discord.utils.get(ctx.guild.roles, name=role_name)
-                if role and role in member.roles:
-                    return True
-            raise commands.MissingRole(" or ".join(allowed_roles))
-
         # Default = no restriction
-        if min_role == "Default":
+        if allowed_roles is None and min_role == "Default":
             return True
 
-        role = discord.utils.get(ctx.guild.roles, name=min_role)
-        if role is None or not _has_role_or_higher(member, role):
-            raise commands.MissingRole(min_role)
+        decisions = _decision_cache.get((member.guild.id, member.id))
+        if decisions is None:
+            if len(_decision_cache) >= _DECISION_CACHE_MAX:
+                _decision_cache.clear()
+            decisions = _decision_cache[(member.guild.id, member.id)] = {}
+        allowed = decisions.get(requirement)
+        if allowed is None:
+            allowed = decisions[requirement] = _check_requirement(
+                member, min_role, allowed_roles
+            )
 
+        if not allowed:
+            raise commands.MissingRole(missing)
         return True
 
     def decorator(func):
@@ -89,8 +156,7 @@ def soap_channels_only():  # lock command to SOAP, NNID and dev channels only
     def decorator(func):
         async def soap_chan(ctx):
             """Check that the command is used in an allowed SOAP/NNID/dev channel."""
-            category = getattr(ctx.channel, "category", None)
-            if category and category.id in SOAP_USABLE_IDS:
+            if is_soap_usable(ctx.channel):
                 return True
             raise WrongChannel(ctx.command.name, ctx.channel.mention)
 
@@ -104,16 +170,45 @@ def nnid_channels_only():
 
     def decorator(func):
         async def nnid_chan(ctx):
-            category = getattr(ctx.channel, "category", None)
-            is_nnid = (
-                category
-                and category.id == NNID_CHANNEL_CATEGORY_ID
-                and getattr(ctx.channel, "name", "").endswith(NNID_CHANNEL_SUFFIX)
-            )
-            if is_nnid:
+            if classify_channel(ctx.channel) is ChannelKind.NNID:
                 return True
             raise WrongChannel(ctx.command.name, ctx.channel.mention)
 
         return commands.check(nnid_chan)(func)
 
     return decorator
+
+
+class PermsCog(commands.Cog):
+    """Keeps the role index and permission decision cache in sync with the guild."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    def _roles_changed(self, guild: discord.Guild):
+        _rebuild_role_index(guild)
+        invalidate_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self._roles_changed(role.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        self._roles_changed(after.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self._roles_changed(role.guild)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        invalidate_member(after.guild.id, after.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        invalidate_member(member.guild.id, member.id)
+
+
+def setup(bot: commands.Bot):
+    bot.add_cog(PermsCog(bot))
@@ -0,0 +1,140 @@
+"""
+On-demand sampling profiler. While running, a background thread snapshots the
+event-loop thread's stack every PROFILE_INTERVAL seconds and folds the samples
+into collapsed-stack lines ("task;frame;frame count") that flamegraph.pl or
+speedscope read directly. Each stack is rooted at the asyncio task name, so
+samples are attributed to the Pycord event, view or command that was running.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_DIR = Path(__file__).parent / "profiles"
+# Seconds between samples (~100Hz keeps overhead to a few percent)
+PROFILE_INTERVAL = 0.01
+MAX_PROFILE_SECONDS = 300
+# Innermost frames kept per sample
+MAX_PROFILE_FRAMES = 64
+
+IDLE = "(idle)"
+
+
+class ProfileResult:
+    __slots__ = ("started_at", "duration", "samples", "stacks", "path")
+
+    def __init__(self, started_at: datetime, duration: float, stacks: Counter, path: Path):
+        self.started_at = started_at
+        self.duration = duration
+        self.samples = sum(stacks.values())
+        self.stacks = stacks
+        self.path = path
+
+    def busy_samples(self) -> int:
+        return self.samples - self.stacks.get(IDLE, 0)
+
+    def top_tasks(self, limit: int = 10) -> list[tuple[str, int]]:
+        """(task name, samples) summed over each stack's root, idle excluded."""
+        roots: Counter = Counter()
+        for stack, count in self.stacks.items():
+            if stack != IDLE:
+                roots[stack.split(";", 1)[0]] += count
+        return roots.most_common(limit)
+
+    def top_functions(self, limit: int = 10) -> list[tuple[str, int]]:
+        """(innermost bot frame, samples), the functions that were on-CPU themselves."""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            if stack == IDLE:
+                continue
+            frames = stack.split(";")[1:]
+            own = [f for f in frames if not f.startswith(("discord.", "aiohttp.", "asyncio."))]
+            leaves[(own or frames or ["?"])[-1]] += count
+        return leaves.most_common(limit)
+
+
+_running = threading.Lock()
+
+
+def is_running() -> bool:
+    return _running.locked()
+
+
+def _frame_label(frame) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    code = frame.f_code
+    # co_qualname carries the class, e.g. soap_automation.SOAPAutomationCog.on_message
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _sample(loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> str | None:
+    frame = sys._current_frames().get(loop_thread_id)
+    if frame is None:
+        return None
+
+    frames = []
+    in_callback = False
+    while frame is not None:
+        code = frame.f_code
+        # Drop the loop machinery below the callback that's actually running
+        if code.co_name == "_run" and code.co_filename.endswith(("asyncio/events.py", "asyncio\\events.py")):
+            in_callback = True
+            break
+        frames.append(_frame_label(frame))
+        frame = frame.f_back
+    if not in_callback:
+        # Between callbacks: waiting in select() or doing loop bookkeeping
+        return IDLE
+    frames = frames[:MAX_PROFILE_FRAMES]
+    frames.reverse()
+
+    try:
+        task = asyncio.current_task(loop)
+    except RuntimeError:
+        task = None
+    root = task.get_name() if task is not None else "(callback)"
+    return ";".join([root.replace(";", ","), *frames])
+
+
+def _collect(loop: asyncio.AbstractEventLoop, loop_thread_id: int, seconds: float) -> Counter:
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline and not loop.is_closed():
+        stack = _sample(loop, loop_thread_id)
+        if stack is not None:
+            stacks[stack] += 1
+        time.sleep(PROFILE_INTERVAL)
+    return stacks
+
+
+def _write(stacks: Counter, started_at: datetime) -> Path:
+    PROFILE_DIR.mkdir(exist_ok=True)
+    path = PROFILE_DIR / f"profile-{started_at:%Y%m%d-%H%M%S}.folded"
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    return path
+
+
+async def profile(seconds: float) -> ProfileResult:
+    """
+    Sample the running loop for `seconds` and write the collapsed stacks to
+    PROFILE_DIR. Raises RuntimeError if a profile is already running.
+    """
+    if not _running.acquire(blocking=False):
+        raise RuntimeError("A profile is already running.")
+    try:
+        seconds = max(1.0, min(float(seconds), MAX_PROFILE_SECONDS))
+        loop = asyncio.get_running_loop()
+        started_at = datetime.now()
+        start = time.monotonic()
+        stacks = await asyncio.to_thread(_collect, loop, threading.get_ident(), seconds)
+        duration = time.monotonic() - start
+        path = await asyncio.to_thread(_write, stacks, started_at)
+        return ProfileResult(started_at, duration, stacks, path)
+    finally:
+        _running.release()
@@ -0,0 +1,160 @@
+"""
+Request-channel embeds (.requestsoap / .requestnnid), kept up to date in
+place. The posted message's ID and a hash of its content are stored per
+channel in REQUEST_EMBEDS_FILE, so a refresh
+- does nothing if the message is still there and unchanged,
+- edits it if the embed or buttons changed, keeping its uploaded image
+  (the embed keeps pointing at attachment://<image> on the same message),
+- posts a new one, uploading the image, only if the message is gone or the
+  image itself changed.
+Other messages in the channel are purged, but only if there are any.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import discord
+
+REQUEST_EMBEDS_FILE = Path(__file__).parent / "request_embeds.json"
+
+UNCHANGED = "unchanged"
+EDITED = "edited"
+POSTED = "posted"
+
+
+def _load() -> dict[str, dict]:
+    try:
+        with open(REQUEST_EMBEDS_FILE, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Error reading {REQUEST_EMBEDS_FILE.name}: {e}")
+        return {}
+
+
+def _save(entries: dict[str, dict]):
+    try:
+        with open(REQUEST_EMBEDS_FILE, "w") as f:
+            json.dump(entries, f, indent=2)
+    except (IOError, PermissionError) as e:
+        print(f"Error saving {REQUEST_EMBEDS_FILE.name}: {e}")
+
+
+def _file_hash(path: Path | None) -> str | None:
+    if path is None:
+        return None
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def content_hash(embed: discord.Embed, view: discord.ui.View) -> str:
+    data = json.dumps(
+        {"embed": embed.to_dict(), "components": view.to_components()},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+async def _fetch(channel: discord.TextChannel, message_id: int | None) -> discord.Message | None:
+    if message_id is None:
+        return None
+    try:
+        return await channel.fetch_message(message_id)
+    except discord.NotFound:
+        return None
+
+
+async def _purge_strays(channel: discord.TextChannel, keep_id: int | None):
+    """Delete every message but keep_id, skipping the full purge when there's nothing to delete."""
+    has_strays = False
+    async for message in channel.history(limit=5):
+        if message.id != keep_id:
+            has_strays = True
+            break
+    if not has_strays:
+        return
+    try:
+        await channel.purge(limit=None, check=lambda m: m.id != keep_id)
+    except discord.Forbidden:
+        print(f"No permission to clear messages in request channel {channel.id}")
+    except discord.HTTPException as e:
+        print(f"Error clearing request channel {channel.id}: {e}")
+
+
+async def refresh(
+    channel: discord.TextChannel,
+    embed: discord.Embed,
+    view: discord.ui.View,
+    image: Path | None = None,
+) -> str:
+    """
+    Make the channel show exactly this request embed. image is the file the
+    embed references as attachment://<name>. Returns UNCHANGED, EDITED or POSTED.
+    """
+    entries = _load()
+    entry = entries.get(str(channel.id), {})
+    new_hash = content_hash(embed, view)
+    image_hash = _file_hash(image)
+
+    message = await _fetch(channel, entry.get("message_id"))
+    if message is not None and entry.get("image_hash") != image_hash:
+        # The image itself changed, so it has to be uploaded again
+        try:
+            await message.delete()
+        except discord.NotFound:
+            pass
+        message = None
+
+    if message is not None and entry.get("hash") == new_hash:
+        outcome = UNCHANGED
+    elif message is not None:
+        await message.edit(embed=embed, view=view)
+        outcome = EDITED
+    else:
+        if image_hash is not None:
+            file = discord.File(fp=image, filename=image.name)
+            message = await channel.send(embed=embed, view=view, file=file)
+        else:
+            message = await channel.send(embed=embed, view=view)
+        outcome = POSTED
+
+    await _purge_strays(channel, message.id)
+    if outcome is not UNCHANGED:
+        entries[str(channel.id)] = {"message_id": message.id, "hash": new_hash, "image_hash": image_hash}
+        _save(entries)
+    return outcome
+
+
+async def refresh_for_command(ctx, embed: discord.Embed, view: discord.ui.View, image: Path | None = None):
+    """refresh() for a request command used in its request channel, reporting the outcome to the caller."""
+    is_slash = hasattr(ctx, "followup")
+    if is_slash:
+        await ctx.defer(ephemeral=True)
+    else:
+        # The command message would be a stray itself
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            pass
+
+    try:
+        outcome = await refresh(ctx.channel, embed, view, image)
+    except discord.HTTPException as e:
+        print(f"Error refreshing request embed in {ctx.channel.id}: {e}")
+        text = f"❌ Couldn't refresh the request embed: {e}"
+    else:
+        text = {
+            UNCHANGED: "✅ The request embed is already up to date.",
+            EDITED: "✅ Updated the request embed in place.",
+            POSTED: "✅ Posted the request embed.",
+        }[outcome]
+
+    if is_slash:
+        await ctx.respond(text, ephemeral=True)
+    else:
+        await ctx.send(text, delete_after=5)
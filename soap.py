@@ -5,6 +5,14 @@ from datetime import datetime, timezone, timedelta
 from perms import command_with_perms
 from exceptions import CategoryNotFound
 from log import log_to_soaper_log
+import components
+import member_cache
+import jobs
+import log_sink
+import startup
+import journal
+import tracing
+from log_sink import Priority
 from discord.ext import commands
 from discord.ext.bridge import BridgeOption
 from constants import (
@@ -13,14 +21,19 @@ from constants import (
     SOAP_CHANNEL_CATEGORY_ID,
     MANUAL_SOAP_CATEGORY_ID,
     NNID_CHANNEL_SUFFIX,
-    NNID_CHANNEL_CATEGORY_ID,
     TEMP_ARCHIVE_CATEGORY_ID,
     ARCHIVE_CHANNEL_SUFFIX,
     SOAP_LOG_ID,
     ERROR_LOG_ID,
     HELPEE_ROLE_ID,
 )
-from perms import _has_role_or_higher
+from perms import _has_role_or_higher, get_role_named
+from channel_index import (
+    ChannelKind,
+    classify_channel,
+    create_channel_once,
+    invalidate_channel,
+)
 
 # Topic format for archived channels: "Archived. Deletion scheduled: YYYY-MM-DD HH:MM:SS UTC. " + original
 ARCHIVE_PREFIX = "Archived. Deletion scheduled: "
@@ -37,21 +50,24 @@ async def _send_to_log(
     content: str | None = None,
     *,
     embed: discord.Embed | None = None,
+    priority: Priority = Priority.NORMAL,
 ) -> bool:
-    """Send a message to a log channel. Returns True if sent."""
+    """Queue a message for a log channel. Returns True if queued."""
     if not guild or not channel_id or (not content and not embed):
         return False
+    journal.record(
+        "log",
+        guild_id=guild.id,
+        log_channel_id=channel_id,
+        title=embed.title if embed else None,
+        content=content,
+    )
     ch = guild.get_channel(channel_id)
     if not ch:
         return False
-    try:
-        if embed:
-            await ch.send(embed=embed)
-        else:
-            await ch.send(content)
-        return True
-    except Exception:
-        return False
+    if embed:
+        return log_sink.enqueue(ch, embed=embed, priority=priority)
+    return log_sink.enqueue(ch, content, priority=priority)
 
 
 async def _try_log_soap(ctx, title: str) -> None:
@@ -115,6 +131,7 @@ async def _edit_channel_with_retry(channel, *, max_attempts=3, **edit_kwargs):
     for attempt in range(max_attempts):
         try:
             await channel.edit(**edit_kwargs)
+            invalidate_channel(channel.id)
             return True
         except discord.NotFound:
             raise
@@ -198,7 +215,7 @@ class ArchiveView(discord.ui.View):
         if not isinstance(interaction.user, discord.Member):
             await interaction.response.send_message("Could not verify your role.", ephemeral=True)
             return
-        staff_role = discord.utils.get(interaction.guild.roles, name="Staff")
+        staff_role = get_role_named(interaction.guild, "Staff")
         if not staff_role or not _has_role_or_higher(interaction.user, staff_role):
             await interaction.response.send_message(
                 "You must be Staff or higher to delete archived channels.", ephemeral=True
@@ -228,6 +245,9 @@ class SoapCog(commands.Cog):  # SOAP commands
         self.bot = bot
         self._archive_checker_task = None
         self._next_archive_check_time: datetime | None = None
+        # Archived channels past their deletion time, whose delete may still be queued
+        self._deleting: set[int] = set()
+        startup.add_warmup("archive_checker", self.warm_up)
 
     def cog_load(self):
         """Start the periodic archive checker when the cog loads."""
@@ -238,16 +258,22 @@ class SoapCog(commands.Cog):  # SOAP commands
         if self._archive_checker_task is None or self._archive_checker_task.done():
             self._archive_checker_task = asyncio.create_task(self._archive_checker_loop())
 
-    @commands.Cog.listener()
-    async def on_ready(self):
+    async def warm_up(self):
         """Ensure archive checker is running."""
         self._start_archive_checker()
 
     def cog_unload(self):
         """Cancel the archive checker when the cog unloads."""
+        startup.remove_warmup("archive_checker")
         if self._archive_checker_task and not self._archive_checker_task.done():
             self._archive_checker_task.cancel()
 
+    def export_state(self) -> dict:
+        return {"next_archive_check_time": self._next_archive_check_time}
+
+    def import_state(self, state: dict):
+        self._next_archive_check_time = state["next_archive_check_time"]
+
     async def _archive_checker_loop(self):
         """Periodically check archived channels and delete them."""
         await self.bot.wait_until_ready()
@@ -344,7 +370,11 @@ class SoapCog(commands.Cog):  # SOAP commands
             temp_cat = discord.utils.get(guild.categories, id=TEMP_ARCHIVE_CATEGORY_ID)
             if not temp_cat:
                 continue
-            text_channels = [c for c in temp_cat.channels if isinstance(c, discord.TextChannel)]
+            text_channels = [
+                c
+                for c in temp_cat.channels
+                if isinstance(c, discord.TextChannel) and c.id not in self._deleting
+            ]
             count = len(text_channels)
             new_name = f"CYA Archive [{count}]"
             if temp_cat.name != new_name:
@@ -358,6 +388,7 @@ class SoapCog(commands.Cog):  # SOAP commands
         if not TEMP_ARCHIVE_CATEGORY_ID:
             return
         now = datetime.now(timezone.utc)
+        self._deleting.clear()
         for guild in self.bot.guilds:
             temp_cat = discord.utils.get(guild.categories, id=TEMP_ARCHIVE_CATEGORY_ID)
             if not temp_cat:
@@ -374,21 +405,29 @@ class SoapCog(commands.Cog):  # SOAP commands
                         match.group(1), "%Y-%m-%d %H:%M:%S"
                     ).replace(tzinfo=timezone.utc)
                     if deletion_dt <= now:
-                        try:
-                            await channel.delete()
-                            embed = discord.Embed(
-                                title="Auto-deleted archived channel",
-                                description=f"#{channel.name}",
-                                color=discord.Color.orange(),
-                            )
-                            embed.add_field(
-                                name="Deletion time",
-                                value=f"{match.group(1)} UTC",
-                                inline=False,
-                            )
-                            await _send_to_log(guild, SOAP_LOG_ID, embed=embed)
-                        except discord.NotFound:
-                            pass
+                        embed = discord.Embed(
+                            title="Auto-deleted archived channel",
+                            description=f"#{channel.name}",
+                            color=discord.Color.orange(),
+                        )
+                        embed.add_field(
+                            name="Deletion time",
+                            value=f"{match.group(1)} UTC",
+                            inline=False,
+                        )
+                        # The job posts the log once the channel is actually deleted;
+                        # a delete that's still pending from an earlier check is skipped.
+                        # Inline failures reach the archive checker's error log.
+                        await jobs.submit(
+                            "delete_channel",
+                            dedupe="channel_id",
+                            raise_errors=True,
+                            channel_id=channel.id,
+                            log_channel_id=SOAP_LOG_ID,
+                            log_embed=embed.to_dict(),
+                        )
+                        # Not counted in the category name while the delete is queued
+                        self._deleting.add(channel.id)
                 except (ValueError, TypeError):
                     continue
         await self._update_archive_category_name()
@@ -411,6 +450,7 @@ class SoapCog(commands.Cog):  # SOAP commands
             await asyncio.sleep(2.75)
         except discord.NotFound:
             return
+        tracing.finish(channel.id, "archived")
 
         topic = channel.topic or ""
         user_id = _get_user_id_from_topic(topic)
@@ -442,7 +482,7 @@ class SoapCog(commands.Cog):  # SOAP commands
         # Revoke helpee role when channel is closed
         if HELPEE_ROLE_ID:
             try:
-                member = channel.guild.get_member(user_id)
+                member = await member_cache.get_member(channel.guild, user_id)
                 if member and isinstance(member, discord.Member):
                     role = channel.guild.get_role(HELPEE_ROLE_ID)
                     if role and role in member.roles:
@@ -493,7 +533,9 @@ class SoapCog(commands.Cog):  # SOAP commands
                         color=discord.Color.red(),
                     )
                     err_embed.add_field(name="Channel", value=channel.mention, inline=False)
-                    await _send_to_log(channel.guild, ERROR_LOG_ID, embed=err_embed)
+                    await _send_to_log(
+                        channel.guild, ERROR_LOG_ID, embed=err_embed, priority=Priority.HIGH
+                    )
                 return
 
         async def send_archive_message():
@@ -518,6 +560,7 @@ class SoapCog(commands.Cog):  # SOAP commands
                         await _send_to_log(
                             channel.guild, ERROR_LOG_ID,
                             f"Failed to send archive message to #{channel.name}: {e}",
+                            priority=Priority.HIGH,
                         )
 
         asyncio.create_task(send_archive_message())
@@ -539,35 +582,30 @@ class SoapCog(commands.Cog):  # SOAP commands
         # strip leading/trailing periods and then replace remaining periods with dashes
         safe_user_name = user.name.lstrip(".").rstrip(".").lower().replace(".", "-")
         channel_name = safe_user_name + SOAP_CHANNEL_SUFFIX
-        existing_channel = None
-
-        # Only check channels in the SOAP categories (exclude archived)
-        for channel in guild.text_channels:
-            if channel.name == channel_name and channel.category:
-                if channel.category.id in [
-                    SOAP_CHANNEL_CATEGORY_ID,
-                    MANUAL_SOAP_CATEGORY_ID,
-                ]:
-                    existing_channel = channel
-                    break
-
-        if existing_channel:
-            return (
-                False,
-                existing_channel,
-                f"Soap channel already made for `{user.name}`",
-            )
 
         category = discord.utils.get(guild.categories, id=SOAP_CHANNEL_CATEGORY_ID)
         if not category:
             return False, None, "SOAP category not found"
 
         try:
-            new_channel = await guild.create_text_channel(
-                name=channel_name,
-                category=category,
-                topic=f"This is the SOAP channel for <@{user.id}>, please follow all provided instructions.",
+            # Concurrent requests for this user (double clicks, .createsoap) get the same channel
+            new_channel, created = await create_channel_once(
+                guild,
+                "soap",
+                user.id,
+                lambda: guild.create_text_channel(
+                    name=channel_name,
+                    category=category,
+                    topic=f"This is the SOAP channel for <@{user.id}>, please follow all provided instructions.",
+                ),
             )
+            if not created:
+                return (
+                    False,
+                    new_channel,
+                    f"Soap channel already made for `{user.name}`",
+                )
+            tracing.bind_channel(user.id, new_channel.id)
 
             await new_channel.set_permissions(user, read_messages=True)
 
@@ -590,6 +628,7 @@ class SoapCog(commands.Cog):  # SOAP commands
                     "9. Send the `essential.exefs` file to this chat as well as your serial number from your console. The serial number should be a two or three-letter prefix followed by nine numbers.\n"
                     "10. Please wait for a Soaper to assist you\n"
                 )
+            tracing.mark(new_channel.id, "channel_ready")
 
             if ctx:
                 try:
@@ -783,29 +822,18 @@ class SoapCog(commands.Cog):  # SOAP commands
         if not target_channel:
             return await ctx.respond("Channel not found.", ephemeral=True)
 
-        is_archived = (
-            target_channel.category
-            and TEMP_ARCHIVE_CATEGORY_ID
-            and target_channel.category.id == TEMP_ARCHIVE_CATEGORY_ID
-        )
-        if is_archived:
+        kind = classify_channel(target_channel)
+        if kind is ChannelKind.ARCHIVED:
             return await ctx.respond("Cannot move archived channels.", ephemeral=True)
 
-        is_soap = (
-            target_channel.category
-            and (
-                (target_channel.category.id == SOAP_CHANNEL_CATEGORY_ID and target_channel.name.endswith(SOAP_CHANNEL_SUFFIX))
-                or target_channel.category.id == MANUAL_SOAP_CATEGORY_ID
-            )
-        )
-        if not is_soap:
+        if not kind.is_soap:
             return await ctx.respond(f"{target_channel.mention} is not a SOAP channel!", ephemeral=True)
 
         category = discord.utils.get(ctx.guild.categories, id=target_category_id)
         if not category:
             return await ctx.respond("Category not found.", ephemeral=True)
 
-        if target_channel.category and target_channel.category.id == target_category_id:
+        if target_channel.category_id == target_category_id:
             return await ctx.respond(f"Channel is already in the {category_name} category.", ephemeral=True)
 
         try:
@@ -830,28 +858,25 @@ class SoapCog(commands.Cog):  # SOAP commands
         channel_name = (
             user.name.lower().replace(".", "-") + SOAP_CHANNEL_SUFFIX
         )  # channels can't have periods
-        channel = discord.utils.get(ctx.guild.channels, name=channel_name)
-        # Don't count archived channels as existing
-        if channel and TEMP_ARCHIVE_CATEGORY_ID and channel.category and channel.category.id == TEMP_ARCHIVE_CATEGORY_ID:
-            channel = None
+        category = discord.utils.get(ctx.guild.categories, id=MANUAL_SOAP_CATEGORY_ID)
 
-        if channel:
+        async def create():
+            if not category:
+                raise CategoryNotFound(MANUAL_SOAP_CATEGORY_ID)
+            return await ctx.guild.create_text_channel(
+                name=channel_name,
+                category=category,
+                topic=f"This is the SOAP channel for <@{user.id}>, please follow all provided instructions.",
+            )
+
+        # Shares the in-flight creation with a button flow for the same user
+        new, created = await create_channel_once(ctx.guild, "soap", user.id, create)
+
+        if not created:
             await ctx.respond(
-                f"Soap channel already made for `{user.name}` at {channel.jump_url}"
+                f"Soap channel already made for `{user.name}` at {new.jump_url}"
             )
         else:
-            category = discord.utils.get(
-                ctx.guild.categories, id=MANUAL_SOAP_CATEGORY_ID
-            )
-            if category:
-                new = await ctx.guild.create_text_channel(
-                    name=channel_name,
-                    category=category,
-                    topic=f"This is the SOAP channel for <@{user.id}>, please follow all provided instructions.",
-                )
-            else:
-                raise CategoryNotFound(MANUAL_SOAP_CATEGORY_ID)
-
             await new.set_permissions(user, read_messages=True)
 
             # Use the SOAPAutomationCog's interface so manual SOAPs get the same welcome embed
@@ -875,6 +900,7 @@ class SoapCog(commands.Cog):  # SOAP commands
                     "9. Send the `essential.exefs` file to this chat as well as your serial number from your console. The serial number should be a two or three-letter prefix followed by nine numbers.\n"
                     "10. Please wait for further instructions\n"
                 )
+            tracing.mark(new.id, "channel_ready")
             await ctx.respond(new.jump_url)
             await log_to_soaper_log(ctx, "Created SOAP Channel")
             if HELPEE_ROLE_ID:
@@ -934,12 +960,8 @@ class SoapCog(commands.Cog):  # SOAP commands
             return await ctx.respond("Channel not found for the given user/channel.")
 
         # Block .boom on archived channels first (use Delete early button instead)
-        is_archived = (
-            channel.category
-            and TEMP_ARCHIVE_CATEGORY_ID
-            and channel.category.id == TEMP_ARCHIVE_CATEGORY_ID
-        )
-        if is_archived:
+        kind = classify_channel(channel)
+        if kind is ChannelKind.ARCHIVED:
             msg = "Cannot use .boom on an archived channel. Use the **Delete early** button in the channel instead."
             if hasattr(ctx, "respond"):
                 await ctx.respond(msg, ephemeral=True)
@@ -947,23 +969,7 @@ class SoapCog(commands.Cog):  # SOAP commands
                 await ctx.send(msg)
             return
         
-        # Check if it's a SOAP channel
-        is_soap = (
-            channel.category
-            and (
-                (channel.category.id == SOAP_CHANNEL_CATEGORY_ID and channel.name.endswith(SOAP_CHANNEL_SUFFIX))
-                or channel.category.id == MANUAL_SOAP_CATEGORY_ID
-            )
-        )
-        
-        # Check if it's a NNID channel
-        is_nnid = (
-            channel.category
-            and channel.category.id == NNID_CHANNEL_CATEGORY_ID
-            and channel.name.endswith(NNID_CHANNEL_SUFFIX)
-        )
-
-        if not (is_soap or is_nnid):
+        if not kind.is_transfer:
             return await ctx.respond(f"{channel.mention} is not a SOAP or NNID channel!")
         
         # For slash/bridge invocations, acknowledge the interaction by deferring it
@@ -974,9 +980,9 @@ class SoapCog(commands.Cog):  # SOAP commands
                 # Some contexts don't support 'ephemeral' kwarg; fall back to plain defer
                 await ctx.defer()
         
-        if is_soap:
+        if kind.is_soap:
             await self.deletesoap(channel, ctx)
-        elif is_nnid:
+        elif kind is ChannelKind.NNID:
             nnid_cog = self.bot.get_cog("NNIDCog")
             if nnid_cog:
                 await nnid_cog.deletennid(channel, ctx)
@@ -1027,5 +1033,8 @@ class SoapCog(commands.Cog):  # SOAP commands
         await self._perform_deletechannel(ctx, user=user, channel=channel)
 
 
+components.persistent_view("ArchiveView", lambda bot: ArchiveView(0, 0, bot))
+
+
 def setup(bot):
     return bot.add_cog(SoapCog(bot))
@@ -2,12 +2,19 @@ import discord
 import re
 import asyncio
 from discord.ext import commands
+from discord.ext.bridge import BridgeOption
 from perms import command_with_perms
 from log import log_to_soaper_log
+import components
+import console_registry
+import exefs
+import journal
+import member_cache
+import message_router
+import tracing
+from channel_index import ChannelKind, SOAP_CATEGORY_IDS, channel_owner, classify_channel
 from constants import (
     BOTS_ONLY_CHANNEL_ID,
-    SOAP_CHANNEL_CATEGORY_ID,
-    MANUAL_SOAP_CATEGORY_ID,
     LOADING_EMOTE_ID,
     SOAP_COMPLETION_AUTO_CLOSE_MINUTES,
     SOAPER_ROLE_ID,
@@ -48,8 +55,8 @@ class CompletionFollowUpView(discord.ui.View):
                 if not channel:
                     return
                 if (
-                    not channel.category
-                    or channel.category.id == MANUAL_SOAP_CATEGORY_ID
+                    channel.category_id is None
+                    or classify_channel(channel) is ChannelKind.SOAP_MANUAL
                 ):
                     return
 
@@ -66,7 +73,7 @@ class CompletionFollowUpView(discord.ui.View):
 
                     if user_id:
                         try:
-                            user = guild.get_member(user_id)
+                            user = await member_cache.get_member(guild, user_id)
                             if user:
                                 ctx = type(
                                     "Context",
@@ -173,10 +180,7 @@ class CompletionFollowUpView(discord.ui.View):
             mention_plain = f"<@{user_id}>"
             mention_nick = f"<@!{user_id}>"
             for ch in interaction.guild.text_channels:
-                if ch.category and ch.category.id in [
-                    SOAP_CHANNEL_CATEGORY_ID,
-                    MANUAL_SOAP_CATEGORY_ID,
-                ]:
+                if ch.category_id in SOAP_CATEGORY_IDS:
                     topic = getattr(ch, "topic", None)
                     if topic and (mention_plain in topic or mention_nick in topic):
                         channel = ch
@@ -232,6 +236,54 @@ class CopySerialView(discord.ui.View):
                 "Could not find serial number.", ephemeral=True
             )
 
+# Soapy's status lines in the bots-only channel
+_STATUS_RE = re.compile(
+    r"^SOAP_STATUS\s+(\d{15,25})\s+([A-Z_]+)(?:\s+([A-Z0-9_]+))?\s*$", re.IGNORECASE
+)
+
+
+async def _warn_if_serial_busy(interaction: discord.Interaction, serial: str):
+    """Record the entered serial and warn if the console can't be transferred right now."""
+    record = await console_registry.serial_record(serial)
+    await console_registry.record_serial_entry(serial, interaction.channel_id, interaction.user.id)
+    if record is None:
+        return
+
+    warnings = []
+    cooldown_ends = record.cooldown_ends()
+    if cooldown_ends:
+        ts = int(cooldown_ends.timestamp())
+        warnings.append(
+            f"This console had a system transfer less than 7 days ago. It can't system transfer again until "
+            f"<t:{ts}:f> (<t:{ts}:R>), so a SOAP transfer will most likely fail before then."
+        )
+    # Snapshot: the registry's worker thread adds to record.channels
+    open_elsewhere = [
+        channel_id
+        for channel_id in tuple(record.channels)
+        if channel_id != interaction.channel_id
+        and classify_channel(interaction.guild.get_channel(channel_id)).is_transfer
+    ]
+    if open_elsewhere:
+        warnings.append(
+            "This serial was also entered in "
+            + ", ".join(f"<#{channel_id}>" for channel_id in open_elsewhere)
+            + ", which is still open."
+        )
+    if not warnings:
+        return
+
+    embed = discord.Embed(
+        title="⚠️ Check this console before starting the transfer",
+        description="\n\n".join(warnings),
+        color=discord.Color.orange(),
+    )
+    embed.set_footer(text="For Soapers: resolve this before running Soapy.")
+    try:
+        await interaction.followup.send(embed=embed)
+    except discord.HTTPException as e:
+        print(f"Error warning about serial {serial} in {interaction.channel_id}: {e}")
+
 
 class SerialNumberModal(discord.ui.Modal):
     """Modal for submitting serial number (2–3 letters + 8-9 digits)."""
@@ -257,8 +309,10 @@ class SerialNumberModal(discord.ui.Modal):
                 ephemeral=True,
             )
             return
+        tracing.mark(interaction.channel_id, "serial_submitted")
+        exefs.remember_serial(interaction.channel_id, serial)
         serial_embed = discord.Embed(
-            title="✅ Serial number received",
+            title=exefs.SERIAL_RECEIVED_TITLE,
             description=serial,
             color=discord.Color.green(),
         )
@@ -298,6 +352,8 @@ class SerialNumberModal(discord.ui.Modal):
         )
         await interaction.followup.send(embed=exefs_embed)
 
+        await _warn_if_serial_busy(interaction, serial)
+
 
 class SerialNumberCheckView(discord.ui.View):
     """View for serial number prompt buttons in new SOAP channels"""
@@ -444,6 +500,7 @@ class EshopVerificationView(discord.ui.View):
         self, button: discord.ui.Button, interaction: discord.Interaction
     ):
         """Send completion ephemeral with follow-up questions"""
+        tracing.mark(interaction.channel_id, "eshop_verified")
         # Disable all buttons
         for item in self.children:
             item.disabled = True
@@ -457,11 +514,7 @@ class EshopVerificationView(discord.ui.View):
         channel = interaction.channel
 
         # Check if channel is in manual SOAP category
-        is_manual_soap = (
-            channel
-            and channel.category
-            and channel.category.id == MANUAL_SOAP_CATEGORY_ID
-        )
+        is_manual_soap = classify_channel(channel) is ChannelKind.SOAP_MANUAL
 
         if is_manual_soap:
             completion_embed = discord.Embed(
@@ -545,6 +598,12 @@ class EshopVerificationView(discord.ui.View):
 class SOAPAutomationCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        message_router.add_route(
+            "soapy_status", self.handle_status_message, channel_ids=[BOTS_ONLY_CHANNEL_ID]
+        )
+
+    def cog_unload(self):
+        message_router.remove_route("soapy_status")
 
     def _generate_progress_bar(self, percentage: int) -> str:
         """Generate an ASCII progress bar based on percentage (wider version)"""
@@ -676,38 +735,68 @@ class SOAPAutomationCog(commands.Cog):
         await ctx.respond("Running full channel setup here...", ephemeral=True)
         await self.create_soap_interface(ctx.channel, member)
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        """Register persistent views on bot startup"""
-        self.bot.add_view(EshopVerificationView())
-        self.bot.add_view(SerialNumberCheckView())
-        self.bot.add_view(SerialNumberFollowUpView())
-        self.bot.add_view(CopySerialView())
-
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        """Listen for status updates in the processing channel and respond in the user's SOAP channel."""
-        # Bots only channel only
-        if not message.guild or message.channel.id != BOTS_ONLY_CHANNEL_ID:
-            return
+    @staticmethod
+    def _format_seconds(seconds: float) -> str:
+        if seconds < 60:
+            return f"{seconds:.0f}s"
+        if seconds < 3600:
+            return f"{seconds // 60:.0f}m{seconds % 60:02.0f}s"
+        return f"{seconds // 3600:.0f}h{seconds % 3600 // 60:02.0f}m"
+
+    @command_with_perms(
+        min_role="Staff",
+        name="transferstats",
+        help="Show p50/p95/p99 time per SOAP stage over the last N hours (default 24).",
+    )
+    async def transferstats(
+        self,
+        ctx,
+        hours: BridgeOption(int, "Window in hours", required=False) = 24,
+    ):
+        """Report how long each SOAP milestone takes, to spot the bottleneck."""
+        rows = tracing.stage_stats(hours * 3600)
+        if not rows:
+            return await ctx.respond(
+                f"No finished SOAP traces in the last {hours}h.", ephemeral=True
+            )
+
+        fmt = self._format_seconds
+        lines = [f"{'stage':<38} {'n':>4} {'p50':>7} {'p95':>7} {'p99':>7}"]
+        for stage, count, p50, p95, p99 in rows:
+            lines.append(
+                f"{stage[:38]:<38} {count:>4} {fmt(p50):>7} {fmt(p95):>7} {fmt(p99):>7}"
+            )
+        embed = discord.Embed(
+            title=f"⏱️ SOAP stage timings (last {hours}h)",
+            description="```\n" + "\n".join(lines)[:4000] + "\n```",
+            color=discord.Color.blurple(),
+        )
+        embed.set_footer(
+            text=f"Time since the previous milestone • {tracing.active_count()} transfers in progress"
+        )
+        await ctx.respond(embed=embed, ephemeral=True)
 
+    async def handle_status_message(self, message: discord.Message):
+        """Handle status updates in the processing channel (routed by message_router) and respond in the user's SOAP channel."""
         # Ignore self messages
         if message.author.id == self.bot.user.id:
             return
 
-        content = (message.content or "").strip()
-        match = re.match(
-            r"^SOAP_STATUS\s+(\d{15,25})\s+([A-Z_]+)(?:\s+([A-Z0-9_]+))?\s*$",
-            content,
-            re.IGNORECASE,
-        )
+        match = _STATUS_RE.match((message.content or "").strip())
         if not match:
-            print(f"No match found for {content}")
             return
 
         channel_id = int(match.group(1))
         status_text = match.group(2).upper()
         status_detail = match.group(3).upper() if match.group(3) else None
+        journal.record(
+            "soap_status",
+            guild_id=message.guild.id,
+            channel_id=channel_id,
+            status=status_text,
+            detail=status_detail,
+            message_id=message.id,
+        )
 
         serial_number = status_detail if status_text in ["SUCCESS", "LOTTERY"] else None
 
@@ -729,6 +818,23 @@ class SOAPAutomationCog(commands.Cog):
         if target_channel is None:
             return
 
+        if status_text == "PROGRESS":
+            if status_detail == "START":
+                tracing.mark(channel_id, "soapy_start")
+            elif status_detail:
+                tracing.mark(channel_id, f"progress:{status_detail.lower()}")
+        elif status_text in ("SUCCESS", "LOTTERY", "ERROR"):
+            tracing.mark(channel_id, status_text.lower())
+            asyncio.create_task(
+                console_registry.record_transfer(
+                    channel_id,
+                    status_text,
+                    serial=serial_number if serial_number != "SKIP" else None,
+                    detail=status_detail if status_text == "ERROR" else None,
+                    user_id=channel_owner(target_channel),
+                )
+            )
+
         # Progress status mapping
         progress_percentages = {
             "START": 0,
@@ -928,5 +1034,11 @@ class SOAPAutomationCog(commands.Cog):
                 await target_channel.send(embed=embed)
 
 
+components.persistent_view("EshopVerificationView", lambda bot: EshopVerificationView())
+components.persistent_view("SerialNumberCheckView", lambda bot: SerialNumberCheckView())
+components.persistent_view("SerialNumberFollowUpView", lambda bot: SerialNumberFollowUpView())
+components.persistent_view("CopySerialView", lambda bot: CopySerialView())
+
+
 def setup(bot):
     return bot.add_cog(SOAPAutomationCog(bot))
@@ -4,6 +4,7 @@ import re
 from pathlib import Path
 from discord.ext import commands
 from perms import command_with_perms
+import components
 from constants import (
     SOAPER_ROLE_ID,
     AWAITING_EMOTE_ID,
@@ -305,7 +306,8 @@ class ErrorCodeModal(discord.ui.Modal):
 
             target_message = getattr(self, "target_message", None)
             view = InvalidErrorCodeView(
-                target_message=target_message, context=self.context
+                target_id=target_message.id if target_message is not None else None,
+                context=self.context,
             )
 
             if target_message is not None:
@@ -410,164 +412,130 @@ class ErrorCodeModal(discord.ui.Modal):
             )
 
 
+def _parse_params(params: str) -> tuple[str | None, int | None]:
+    """(context, target message id) from a routed custom_id's "<context>[:<message id>]" params."""
+    context, _, target = params.partition(":")
+    return context or None, int(target) if target.isdigit() else None
+
+
 class AwaitingErrorCodeView(discord.ui.View):
     """View that provides a button to open the error code modal."""
 
     def __init__(self, context=None):
-        super().__init__(timeout=None)
+        # Not stored: the buttons are routed by custom_id (see the handlers below)
+        super().__init__(timeout=None, store=False)
         self.context = context
         # Encode context in custom_id so it persists after bot restart
         ctx_suffix = context or ""
 
-        # Dynamically create buttons with context-encoded custom_ids
-        enter_button = discord.ui.Button(
-            label="🔢 Enter Error Code",
-            style=discord.ButtonStyle.primary,
-            custom_id=f"error_code_input_button:{ctx_suffix}",
+        self.add_item(
+            discord.ui.Button(
+                label="🔢 Enter Error Code",
+                style=discord.ButtonStyle.primary,
+                custom_id=f"error_code_input_button:{ctx_suffix}",
+            )
         )
-        enter_button.callback = self._input_error_callback
-        self.add_item(enter_button)
-
-        something_else_button = discord.ui.Button(
-            label="⚠️ I need something else",
-            style=discord.ButtonStyle.danger,
-            custom_id=f"awaiting_error_no_code:{ctx_suffix}",
+        self.add_item(
+            discord.ui.Button(
+                label="⚠️ I need something else",
+                style=discord.ButtonStyle.danger,
+                custom_id=f"awaiting_error_no_code:{ctx_suffix}",
+            )
         )
-        something_else_button.callback = self._no_code_callback
-        self.add_item(something_else_button)
-
-    async def _input_error_callback(self, interaction: discord.Interaction):
-        """Open the error code modal, tied to this awaiting message."""
-        # Extract context from custom_id if self.context is None (after bot restart)
-        context = self.context
-        if context is None:
-            custom_id = interaction.custom_id
-            if ":" in custom_id:
-                ctx_suffix = custom_id.split(":", 1)[1]
-                context = ctx_suffix if ctx_suffix else None
-
-        modal = ErrorCodeModal(context=context)
-        modal.target_message = interaction.message
-        await interaction.response.send_modal(modal)
-
-    async def _no_code_callback(self, interaction: discord.Interaction):
-        """User doesn't have / want to enter an error code – go back to SOAP helper."""
-        # Extract context from custom_id if self.context is None (after bot restart)
-        context = self.context
-        if context is None:
-            custom_id = interaction.custom_id
-            if ":" in custom_id:
-                ctx_suffix = custom_id.split(":", 1)[1]
-                context = ctx_suffix if ctx_suffix else None
-
-        # Disable buttons on the original awaiting message
-        for child in self.children:
-            child.disabled = True
-
-        try:
-            if interaction.response.is_done():
-                await interaction.message.edit(view=self)
-            else:
-                await interaction.response.edit_message(view=self)
-        except Exception:
-            pass
-
-        embed = discord.Embed(
-            title="🔍 SOAP Helper",
-            description=(
-                "Need help with your SOAP transfer? We're here to help. Select the issue you're having from the dropdown below.\n\n"
-                "If you can't find what you're looking for, select **'My option is not listed here.'** "
-                "to request assistance from a Soaper."
-            ),
-            color=discord.Color.red(),
-        )
-        embed.set_footer(text="Select an option from the dropdown menu below.")
-        view = SoapHelperView(context=context)
-        if interaction.response.is_done():
-            await interaction.followup.send(embed=embed, view=view)
-        else:
-            await interaction.response.send_message(embed=embed, view=view)
 
 
 class InvalidErrorCodeView(discord.ui.View):
     """Shown when the user enters an incorrectly-formatted error code."""
 
-    def __init__(self, target_message: discord.Message | None, context=None):
-        super().__init__(timeout=None)
-        self.target_message = target_message
+    def __init__(self, target_id: int | None = None, context=None):
+        # Not stored: the buttons are routed by custom_id (see the handlers below)
+        super().__init__(timeout=None, store=False)
+        self.target_id = target_id
         self.context = context
-        # Encode context in custom_id so it persists after bot restart
-        ctx_suffix = context or ""
-
-        # Dynamically create buttons with context-encoded custom_ids
-        reenter_button = discord.ui.Button(
-            label="🔢 Enter Error Code",
-            style=discord.ButtonStyle.primary,
-            custom_id=f"invalid_error_reenter:{ctx_suffix}",
+        # Encode context and the awaiting message to edit in custom_id so they persist after bot restart
+        params = context or ""
+        if target_id is not None:
+            params += f":{target_id}"
+
+        self.add_item(
+            discord.ui.Button(
+                label="🔢 Enter Error Code",
+                style=discord.ButtonStyle.primary,
+                custom_id=f"invalid_error_reenter:{params}",
+            )
         )
-        reenter_button.callback = self._reenter_callback
-        self.add_item(reenter_button)
-
-        something_else_button = discord.ui.Button(
-            label="⚠️ I need something else",
-            style=discord.ButtonStyle.danger,
-            custom_id=f"invalid_error_no_code:{ctx_suffix}",
+        self.add_item(
+            discord.ui.Button(
+                label="⚠️ I need something else",
+                style=discord.ButtonStyle.danger,
+                custom_id=f"invalid_error_no_code:{params}",
+            )
         )
-        something_else_button.callback = self._no_code_callback
-        self.add_item(something_else_button)
-
-    async def _reenter_callback(self, interaction: discord.Interaction):
-        """Re-open the error code modal."""
-        # Extract context from custom_id if self.context is None (after bot restart)
-        context = self.context
-        if context is None:
-            custom_id = interaction.custom_id
-            if ":" in custom_id:
-                ctx_suffix = custom_id.split(":", 1)[1]
-                context = ctx_suffix if ctx_suffix else None
 
-        modal = ErrorCodeModal(context=context)
-        if self.target_message is not None:
-            modal.target_message = self.target_message
-        await interaction.response.send_modal(modal)
 
-    async def _no_code_callback(self, interaction: discord.Interaction):
-        """Return the user to the main SOAP helper menu."""
-        # Extract context from custom_id if self.context is None (after bot restart)
-        context = self.context
-        if context is None:
-            custom_id = interaction.custom_id
-            if ":" in custom_id:
-                ctx_suffix = custom_id.split(":", 1)[1]
-                context = ctx_suffix if ctx_suffix else None
-
-        # First disable these buttons on the original message
-        for child in self.children:
-            child.disabled = True
-
-        try:
-            if interaction.response.is_done():
-                await interaction.message.edit(view=self)
-            else:
-                await interaction.response.edit_message(view=self)
-        except Exception:
-            pass
+async def _back_to_helper(interaction: discord.Interaction, view: discord.ui.View, context):
+    """Disable the buttons on the clicked message and send the main SOAP helper menu."""
+    for child in view.children:
+        child.disabled = True
 
-        embed = discord.Embed(
-            title="🔍 SOAP Helper",
-            description=(
-                "Need help with your SOAP transfer? We're here to help. Select the issue you're having from the dropdown below.\n\n"
-                "If you can't find what you're looking for, select **'My option is not listed here.'** "
-                "to request assistance from a Soaper."
-            ),
-            color=discord.Color.red(),
-        )
-        embed.set_footer(text="Select an option from the dropdown menu below.")
-        view = SoapHelperView(context=context)
+    try:
         if interaction.response.is_done():
-            await interaction.followup.send(embed=embed, view=view)
+            await interaction.message.edit(view=view)
         else:
-            await interaction.response.send_message(embed=embed, view=view)
+            await interaction.response.edit_message(view=view)
+    except Exception:
+        pass
+
+    embed = discord.Embed(
+        title="🔍 SOAP Helper",
+        description=(
+            "Need help with your SOAP transfer? We're here to help. Select the issue you're having from the dropdown below.\n\n"
+            "If you can't find what you're looking for, select **'My option is not listed here.'** "
+            "to request assistance from a Soaper."
+        ),
+        color=discord.Color.red(),
+    )
+    embed.set_footer(text="Select an option from the dropdown menu below.")
+    view = SoapHelperView(context=context)
+    if interaction.response.is_done():
+        await interaction.followup.send(embed=embed, view=view)
+    else:
+        await interaction.response.send_message(embed=embed, view=view)
+
+
+@components.route("error_code_input_button")
+async def _input_error_code(interaction: discord.Interaction, params: str):
+    """Open the error code modal, tied to this awaiting message."""
+    context, _ = _parse_params(params)
+    modal = ErrorCodeModal(context=context)
+    modal.target_message = interaction.message
+    await interaction.response.send_modal(modal)
+
+
+@components.route("awaiting_error_no_code")
+async def _awaiting_no_code(interaction: discord.Interaction, params: str):
+    """User doesn't have / want to enter an error code – go back to SOAP helper."""
+    context, _ = _parse_params(params)
+    await _back_to_helper(interaction, AwaitingErrorCodeView(context=context), context)
+
+
+@components.route("invalid_error_reenter")
+async def _reenter_error_code(interaction: discord.Interaction, params: str):
+    """Re-open the error code modal."""
+    context, target_id = _parse_params(params)
+    modal = ErrorCodeModal(context=context)
+    if target_id is not None:
+        modal.target_message = interaction.channel.get_partial_message(target_id)
+    await interaction.response.send_modal(modal)
+
+
+@components.route("invalid_error_no_code")
+async def _invalid_no_code(interaction: discord.Interaction, params: str):
+    """Return the user to the main SOAP helper menu."""
+    context, target_id = _parse_params(params)
+    await _back_to_helper(
+        interaction, InvalidErrorCodeView(target_id=target_id, context=context), context
+    )
 
 
 class SoapHelperDropdown(discord.ui.Select):
@@ -656,202 +624,196 @@ class SoapHelperDropdown(discord.ui.Select):
             custom_id=f"soap_helper_dropdown:{ctx_suffix}",
         )
 
-    async def callback(self, interaction: discord.Interaction):
-        """Handle dropdown selection"""
-        value = self.values[0]
-
-        # Extract context from custom_id if self.context is None (after bot restart)
-        context = self.context
-        if context is None:
-            custom_id = self.custom_id
-            if ":" in custom_id:
-                ctx_suffix = custom_id.split(":", 1)[1]
-                context = ctx_suffix if ctx_suffix else None
-
-        # Disable the dropdown after use to prevent spam
-        if self.view is not None:
-            for child in self.view.children:
-                if isinstance(child, discord.ui.Select):
-                    child.disabled = True
-            try:
-                await interaction.message.edit(view=self.view)
-            except Exception:
-                pass
 
-        # Create response embed based on selection
-        if value in ("eshop_not_working", "pokemon_bank_not_working"):
-            # Shared flow for both eShop and Pokémon Bank error-code paths
-            awaiting_emoji = discord.utils.get(
-                interaction.guild.emojis, id=AWAITING_EMOTE_ID
-            )
-            title_prefix = f"{awaiting_emoji} " if awaiting_emoji else ""
-            awaiting_embed = discord.Embed(
-                title=f"{title_prefix}Awaiting Error Code",
-                description=(
-                    f"{interaction.user.mention}, enter the code shown on your console in the form that just opened.\n"
-                    "If you closed it by accident, you can click **Enter Error Code** below to reopen it."
-                ),
-                color=discord.Color.orange(),
-            )
-            awaiting_msg = await interaction.channel.send(
-                embed=awaiting_embed,
-                view=AwaitingErrorCodeView(context=context),
-            )
+@components.route("soap_helper_dropdown")
+async def _helper_selected(interaction: discord.Interaction, params: str):
+    """Handle dropdown selection"""
+    value = interaction.data["values"][0]
+    context, _ = _parse_params(params)
 
-            modal = ErrorCodeModal(context=context)
-            modal.target_message = awaiting_msg
-            await interaction.response.send_modal(modal)
-            return
+    # Disable the dropdown after use to prevent spam
+    view = SoapHelperView(context=context)
+    for child in view.children:
+        child.disabled = True
+    try:
+        await interaction.message.edit(view=view)
+    except Exception:
+        pass
+
+    # Create response embed based on selection
+    if value in ("eshop_not_working", "pokemon_bank_not_working"):
+        # Shared flow for both eShop and Pokémon Bank error-code paths
+        awaiting_emoji = discord.utils.get(
+            interaction.guild.emojis, id=AWAITING_EMOTE_ID
+        )
+        title_prefix = f"{awaiting_emoji} " if awaiting_emoji else ""
+        awaiting_embed = discord.Embed(
+            title=f"{title_prefix}Awaiting Error Code",
+            description=(
+                f"{interaction.user.mention}, enter the code shown on your console in the form that just opened.\n"
+                "If you closed it by accident, you can click **Enter Error Code** below to reopen it."
+            ),
+            color=discord.Color.orange(),
+        )
+        awaiting_msg = await interaction.channel.send(
+            embed=awaiting_embed,
+            view=AwaitingErrorCodeView(context=context),
+        )
 
-        elif value == "pretendo_switch":
-            embed = discord.Embed(
-                title="🌐 Switching Between Pretendo and Nintendo Network",
-                description=(
-                    "If you're using Pretendo and need to access Nintendo services:\n\n"
-                    "**1.** Open the **Nimbus** app on your 3DS.\n"
-                    "**2.** Select **Nintendo**.\n"
-                    "**3.** Your console will reboot.\n"
-                    "**4.** You can now access Nintendo services like the eShop.\n\n"
-                    "To switch back to Pretendo, use Nimbus again and select **Pretendo**."
-                ),
-                color=discord.Color.blue(),
-            )
-            embed.set_footer(text="You'll need to reboot each time you switch.")
+        modal = ErrorCodeModal(context=context)
+        modal.target_message = awaiting_msg
+        await interaction.response.send_modal(modal)
+        return
 
-        elif value == "serial_number":
-            embed = discord.Embed(
-                title="📂 Finding Your Serial Number",
-                description=(
-                    "Follow these instructions to find your console's serial number.\n\n"
-                    "**To find your console's serial number:**\n"
-                    "- Hold START while powering on your console. This will boot you into GodMode9.\n"
-                    "- Go to `[2:] SYSNAND TWLN` -> `sys` -> `log` -> `inspect.log`\n"
-                    "- Select `Open in Textviewer`.\n\n"
-                    "The correct serial number (three-letter prefix followed by nine numbers) should be in the file."
-                ),
-                color=discord.Color.blue(),
-            )
-            embed.set_footer(text="You may also send us a picture if you're unsure.")
+    elif value == "pretendo_switch":
+        embed = discord.Embed(
+            title="🌐 Switching Between Pretendo and Nintendo Network",
+            description=(
+                "If you're using Pretendo and need to access Nintendo services:\n\n"
+                "**1.** Open the **Nimbus** app on your 3DS.\n"
+                "**2.** Select **Nintendo**.\n"
+                "**3.** Your console will reboot.\n"
+                "**4.** You can now access Nintendo services like the eShop.\n\n"
+                "To switch back to Pretendo, use Nimbus again and select **Pretendo**."
+            ),
+            color=discord.Color.blue(),
+        )
+        embed.set_footer(text="You'll need to reboot each time you switch.")
 
-        elif value == "region_settings":  # "What is a SOAP lottery?"
-            embed = discord.Embed(
-                title="❓ What is a SOAP Lottery?",
-                description=(
-                    "A **SOAP lottery** occurs when your SOAP transfer doesn't require a system transfer to complete.\n\n"
-                    "**Normal SOAP:**\n"
-                    "Most SOAP transfers require a system transfer from a donor console, which means you'll need to "
-                    "wait **7 days** before you can do another system transfer from your old console to this one.\n\n"
-                    "**SOAP Lottery:**\n"
-                    "If you win the SOAP lottery, no system transfer was needed! This means:\n"
-                    "• You can do a system transfer from another 3DS right away if you want\n"
-                    "• No waiting period required\n"
-                    "• Your SOAP transfer completed successfully without needing a donor console\n\n"
-                    "You'll know if you won the lottery because the completion message will mention it!"
-                ),
-                color=discord.Color.green(),
-            )
-            embed.set_footer(
-                text="Winning the lottery is random and depends on your console's state."
-            )
+    elif value == "serial_number":
+        embed = discord.Embed(
+            title="📂 Finding Your Serial Number",
+            description=(
+                "Follow these instructions to find your console's serial number.\n\n"
+                "**To find your console's serial number:**\n"
+                "- Hold START while powering on your console. This will boot you into GodMode9.\n"
+                "- Go to `[2:] SYSNAND TWLN` -> `sys` -> `log` -> `inspect.log`\n"
+                "- Select `Open in Textviewer`.\n\n"
+                "The correct serial number (three-letter prefix followed by nine numbers) should be in the file."
+            ),
+            color=discord.Color.blue(),
+        )
+        embed.set_footer(text="You may also send us a picture if you're unsure.")
 
-        elif value == "nand_backup":  # "Do I have to wait 7 days?"
-            embed = discord.Embed(
-                title="⏳ Post-SOAP System Transfer",
-                description=(
-                    "If you don't want to system transfer to or from another 3DS, you're free to use your newly SOAPed console as normal. If you do want to system transfer:\n\n"
-                    "**After a normal SOAP transfer:**\n"
-                    "If a system transfer was required for your SOAP, you must wait **7 days** before "
-                    "you can do another system transfer from another 3DS to this console or vice versa.\n\n"
-                    "**After a SOAP lottery:**\n"
-                    "If you won the SOAP lottery (SOAP complete message was yellow), you can do a system "
-                    "transfer *right away* - no waiting required.\n\n"
-                    "**To perform a system transfer:**\n"
-                    "Use the System Transfer feature in System Settings -> Other Settings -> System Transfer. Make sure both consoles are "
-                    "charged and connected to WiFi."
-                ),
-                color=discord.Color.blue(),
-            )
-            embed.set_footer(
-                text="Again, if you don't want to system transfer from your old console to this one, you're free to use your console as normal."
-            )
+    elif value == "region_settings":  # "What is a SOAP lottery?"
+        embed = discord.Embed(
+            title="❓ What is a SOAP Lottery?",
+            description=(
+                "A **SOAP lottery** occurs when your SOAP transfer doesn't require a system transfer to complete.\n\n"
+                "**Normal SOAP:**\n"
+                "Most SOAP transfers require a system transfer from a donor console, which means you'll need to "
+                "wait **7 days** before you can do another system transfer from your old console to this one.\n\n"
+                "**SOAP Lottery:**\n"
+                "If you win the SOAP lottery, no system transfer was needed! This means:\n"
+                "• You can do a system transfer from another 3DS right away if you want\n"
+                "• No waiting period required\n"
+                "• Your SOAP transfer completed successfully without needing a donor console\n\n"
+                "You'll know if you won the lottery because the completion message will mention it!"
+            ),
+            color=discord.Color.green(),
+        )
+        embed.set_footer(
+            text="Winning the lottery is random and depends on your console's state."
+        )
 
-        elif value == "additional_steps":
-            embed = discord.Embed(
-                title="🔍 Post-SOAP Transfer",
-                description=(
-                    "If eShop is working and you don't want to system transfer to/from a different console (moving game/save data between two consoles), you are done.\n\n"
-                    "If you want to system transfer to/from a different console (moving game/save data between two consoles), you must wait 7 days before doing so. The only exception is if you won the SOAP lottery, which you would have already been told about in the SOAP completion message.\n\n"
-                    "If you want to use your console as normal, you can do so."
-                ),
-                color=discord.Color.blue(),
-            )
+    elif value == "nand_backup":  # "Do I have to wait 7 days?"
+        embed = discord.Embed(
+            title="⏳ Post-SOAP System Transfer",
+            description=(
+                "If you don't want to system transfer to or from another 3DS, you're free to use your newly SOAPed console as normal. If you do want to system transfer:\n\n"
+                "**After a normal SOAP transfer:**\n"
+                "If a system transfer was required for your SOAP, you must wait **7 days** before "
+                "you can do another system transfer from another 3DS to this console or vice versa.\n\n"
+                "**After a SOAP lottery:**\n"
+                "If you won the SOAP lottery (SOAP complete message was yellow), you can do a system "
+                "transfer *right away* - no waiting required.\n\n"
+                "**To perform a system transfer:**\n"
+                "Use the System Transfer feature in System Settings -> Other Settings -> System Transfer. Make sure both consoles are "
+                "charged and connected to WiFi."
+            ),
+            color=discord.Color.blue(),
+        )
+        embed.set_footer(
+            text="Again, if you don't want to system transfer from your old console to this one, you're free to use your console as normal."
+        )
 
-        elif value == "another_soap":
-            embed = discord.Embed(
-                title="🧼 Can I request a SOAP for another 3DS?",
-                description=(
-                    "Yes, you may request multiple SOAPs for personal use. We do not encourage you to request SOAPs for others; "
-                    "please ask your friends to request their own SOAPs.\n\n"
-                    "You may **not** request SOAPs for consoles you intend on selling. Please direct your customers to request their own SOAPs. "
-                    "You will be blacklisted from requesting new SOAPs if it is discovered you are in violation of this.\n\n"
-                    "To request another SOAP, please finish the current SOAP request and create another request using <#1427093890787315913>."
-                ),
-                color=discord.Color.blue(),
-            )
+    elif value == "additional_steps":
+        embed = discord.Embed(
+            title="🔍 Post-SOAP Transfer",
+            description=(
+                "If eShop is working and you don't want to system transfer to/from a different console (moving game/save data between two consoles), you are done.\n\n"
+                "If you want to system transfer to/from a different console (moving game/save data between two consoles), you must wait 7 days before doing so. The only exception is if you won the SOAP lottery, which you would have already been told about in the SOAP completion message.\n\n"
+                "If you want to use your console as normal, you can do so."
+            ),
+            color=discord.Color.blue(),
+        )
 
-        elif value == "redo_soap":
-            embed = discord.Embed(
-                title="🔄 Will I ever need to redo a SOAP Transfer?",
-                description=(
-                    "In most cases, **no**, a SOAP transfer is a one-time process. Once completed, your region-changed console "
-                    "should continue to work normally with the eShop, Pokémon Bank, NNID, and other services.\n\n"
-                    "You would only need a SOAP if you region change the same console again.\n"
-                ),
-                color=discord.Color.blue(),
-            )
+    elif value == "another_soap":
+        embed = discord.Embed(
+            title="🧼 Can I request a SOAP for another 3DS?",
+            description=(
+                "Yes, you may request multiple SOAPs for personal use. We do not encourage you to request SOAPs for others; "
+                "please ask your friends to request their own SOAPs.\n\n"
+                "You may **not** request SOAPs for consoles you intend on selling. Please direct your customers to request their own SOAPs. "
+                "You will be blacklisted from requesting new SOAPs if it is discovered you are in violation of this.\n\n"
+                "To request another SOAP, please finish the current SOAP request and create another request using <#1427093890787315913>."
+            ),
+            color=discord.Color.blue(),
+        )
 
-        elif value == "need_help":
-            soaper_ping = f"<@&{SOAPER_ROLE_ID}>"
-            embed = discord.Embed(
-                title="🆘 Assistance Requested",
-                description=(
-                    f"{interaction.user.mention} has requested additional help. "
-                    "Please wait for a Soaper to assist you."
-                ),
-                color=discord.Color.yellow(),
-            )
-            embed.set_footer(
-                text="Describe in detail what's happening and please include error codes if possible."
-            )
-            # Send with Soaper ping
-            await interaction.response.send_message(
-                content=soaper_ping,
-                embed=embed,
-                allowed_mentions=discord.AllowedMentions(roles=True),
-            )
-            return
+    elif value == "redo_soap":
+        embed = discord.Embed(
+            title="🔄 Will I ever need to redo a SOAP Transfer?",
+            description=(
+                "In most cases, **no**, a SOAP transfer is a one-time process. Once completed, your region-changed console "
+                "should continue to work normally with the eShop, Pokémon Bank, NNID, and other services.\n\n"
+                "You would only need a SOAP if you region change the same console again.\n"
+            ),
+            color=discord.Color.blue(),
+        )
 
-        # Send response
-        await interaction.response.send_message(embed=embed)
+    elif value == "need_help":
+        soaper_ping = f"<@&{SOAPER_ROLE_ID}>"
+        embed = discord.Embed(
+            title="🆘 Assistance Requested",
+            description=(
+                f"{interaction.user.mention} has requested additional help. "
+                "Please wait for a Soaper to assist you."
+            ),
+            color=discord.Color.yellow(),
+        )
+        embed.set_footer(
+            text="Describe in detail what's happening and please include error codes if possible."
+        )
+        # Send with Soaper ping
+        await interaction.response.send_message(
+            content=soaper_ping,
+            embed=embed,
+            allowed_mentions=discord.AllowedMentions(roles=True),
+        )
+        return
 
-        # Send context-aware follow-up (or none for standalone /soaphelp)
-        if context == "eshop_issue":
-            followup_embed = discord.Embed(
-                title="❓ Does the eShop work now?",
-                description=f"{interaction.user.mention}, please let us know if this resolved your issue.",
-                color=discord.Color.red(),
-            )
-            view = EshopResolutionView(channel_id=interaction.channel_id)
-            await interaction.followup.send(embed=followup_embed, view=view)
-        elif context == "other_questions":
-            followup_embed = discord.Embed(
-                title="❓ Is your issue resolved?",
-                description=f"{interaction.user.mention}, please let us know if this resolved your issue.",
-                color=discord.Color.red(),
-            )
-            view = IssueResolutionView(channel_id=interaction.channel_id)
-            await interaction.followup.send(embed=followup_embed, view=view)
-        # No follow-up for standalone /soaphelp (context=None)
+    # Send response
+    await interaction.response.send_message(embed=embed)
+
+    # Send context-aware follow-up (or none for standalone /soaphelp)
+    if context == "eshop_issue":
+        followup_embed = discord.Embed(
+            title="❓ Does the eShop work now?",
+            description=f"{interaction.user.mention}, please let us know if this resolved your issue.",
+            color=discord.Color.red(),
+        )
+        view = EshopResolutionView(channel_id=interaction.channel_id)
+        await interaction.followup.send(embed=followup_embed, view=view)
+    elif context == "other_questions":
+        followup_embed = discord.Embed(
+            title="❓ Is your issue resolved?",
+            description=f"{interaction.user.mention}, please let us know if this resolved your issue.",
+            color=discord.Color.red(),
+        )
+        view = IssueResolutionView(channel_id=interaction.channel_id)
+        await interaction.followup.send(embed=followup_embed, view=view)
+    # No follow-up for standalone /soaphelp (context=None)
 
 
 class SoapHelperView(discord.ui.View):
@@ -867,7 +829,8 @@ class SoapHelperView(discord.ui.View):
                 - "other_questions": User clicked "I have more questions" in automation
                 - None: Standalone /soaphelp command (no follow-up)
         """
-        super().__init__(timeout=None)
+        # Not stored: selections are routed by custom_id to _helper_selected
+        super().__init__(timeout=None, store=False)
         self.context = context
         self.add_item(SoapHelperDropdown(context=context))
 
@@ -936,19 +899,10 @@ class SoapHelperCog(commands.Cog):
         )
         await ctx.respond(embed=embed)
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        """Register persistent views on bot startup"""
-        # Register views for all possible context values
-        contexts = [None, "eshop_issue", "other_questions"]
-        for ctx in contexts:
-            self.bot.add_view(SoapHelperView(context=ctx))
-            self.bot.add_view(AwaitingErrorCodeView(context=ctx))
-            self.bot.add_view(InvalidErrorCodeView(target_message=None, context=ctx))
-
-        self.bot.add_view(ErrorResolutionView())
-        self.bot.add_view(EshopResolutionView())
-        self.bot.add_view(IssueResolutionView())
+
+components.persistent_view("ErrorResolutionView", lambda bot: ErrorResolutionView())
+components.persistent_view("EshopResolutionView", lambda bot: EshopResolutionView())
+components.persistent_view("IssueResolutionView", lambda bot: IssueResolutionView())
 
 
 def setup(bot):
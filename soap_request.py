@@ -2,6 +2,10 @@ from pathlib import Path
 import discord
 from discord.ext import commands
 from perms import command_with_perms
+from channel_index import soap_channels_owned_by
+import components
+import request_embeds
+import tracing
 from constants import REQUEST_SOAP_CHANNEL_ID, RESTRICTED_ROLE_ID
 
 
@@ -202,6 +206,7 @@ class RegionChangeView(discord.ui.View):
             await interaction.response.edit_message(embed=embed, view=None)
 
         else:  # yes
+            tracing.mark_user(self.user.id, "form_complete")
             # show confirmation before creating channel
             embed = discord.Embed(
                 title="📄 Pre-SOAP Information",
@@ -293,25 +298,9 @@ class SOAPRequestView(discord.ui.View):
     async def request_soap_button(
         self, button: discord.ui.Button, interaction: discord.Interaction
     ):
-        from constants import SOAP_CHANNEL_SUFFIX
-
         # check if user already has a SOAP channel
-        channel_name = (
-            interaction.user.name.lower().replace(".", "-") + SOAP_CHANNEL_SUFFIX
-        )
-        existing_channel = None
-
-        # only check channels in the SOAP categories
-        from constants import SOAP_CHANNEL_CATEGORY_ID, MANUAL_SOAP_CATEGORY_ID
-
-        for channel in interaction.guild.text_channels:
-            if channel.name == channel_name and channel.category:
-                if channel.category.id in [
-                    SOAP_CHANNEL_CATEGORY_ID,
-                    MANUAL_SOAP_CATEGORY_ID,
-                ]:
-                    existing_channel = channel
-                    break
+        owned = soap_channels_owned_by(interaction.guild, interaction.user.id)
+        existing_channel = owned[0] if owned else None
 
         if existing_channel:
             embed = discord.Embed(
@@ -324,10 +313,7 @@ class SOAPRequestView(discord.ui.View):
             return
 
         # check if user has the restricted role (set role in constants.py)
-        restricted_role = discord.utils.get(
-            interaction.guild.roles, id=RESTRICTED_ROLE_ID
-        )
-        if restricted_role in interaction.user.roles:
+        if interaction.user.get_role(RESTRICTED_ROLE_ID) is not None:
             embed = discord.Embed(
                 title="⛔ Restricted from Bluehax Services",
                 description="You are unable to request a new SOAP transfer. This restriction may be temporary or permanent, depending on the reason.\n\nYou may still receive help with previously completed SOAP transfers in #soap-help.",
@@ -340,6 +326,7 @@ class SOAPRequestView(discord.ui.View):
             return
 
         # no existing channel, proceed with the form
+        tracing.mark_user(interaction.user.id, "request", restart=True)
         embed = discord.Embed(
             title="🔍 Pre-SOAP Check",
             description="Let's ensure your 3DS is ready to be SOAPed.",
@@ -374,22 +361,15 @@ class SOAPRequestCog(commands.Cog):
         embed.set_footer(text="Click the button below to request a SOAP transfer.")
         view = SOAPRequestView()
 
-        # Try to load the image file
-        file = None
-        try:
-            path = Path(__file__).parent / "assets" / "SOAPTransfer.webp"
-            file = discord.File(fp=path, filename="SOAPTransfer.webp")
-            embed.set_image(url="attachment://SOAPTransfer.webp")
-        except FileNotFoundError as e:
-            print(f"Error: Could not find assets/SOAPTransfer.webp - {e}")
-            pass
-
-        return embed, view, file
+        # Use the image if it's there
+        image = Path(__file__).parent / "assets" / "SOAPTransfer.webp"
+        if image.exists():
+            embed.set_image(url=f"attachment://{image.name}")
+        else:
+            print("Error: Could not find assets/SOAPTransfer.webp")
+            image = None
 
-    # This fixes broken embeds if the bot stops.
-    @commands.Cog.listener()
-    async def on_ready(self):
-        self.bot.add_view(SOAPRequestView())
+        return embed, view, image
 
     @command_with_perms(
         name="requestsoap",
@@ -397,19 +377,19 @@ class SOAPRequestCog(commands.Cog):
         help="Creates an embed with a button for SOAP requests",
     )
     async def requestsoap(self, ctx):
+        embed, view, image = self._create_soap_request_embed_and_view()
         if ctx.channel.id == REQUEST_SOAP_CHANNEL_ID:
-            try:
-                await ctx.channel.purge(limit=None)
-            except discord.Forbidden:
-                print("No permission to clear messages in request SOAP channel")
-            except Exception as e:
-                print(f"Error clearing request SOAP channel: {e}")
-        embed, view, file = self._create_soap_request_embed_and_view()
-        if file:
-            await ctx.respond(embed=embed, view=view, file=file)
+            # Edited in place, and only when something changed
+            return await request_embeds.refresh_for_command(ctx, embed, view, image)
+        if image:
+            await ctx.respond(embed=embed, view=view, file=discord.File(fp=image, filename=image.name))
         else:
             await ctx.respond(embed=embed, view=view)
 
 
+# This fixes broken embeds if the bot stops.
+components.persistent_view("SOAPRequestView", lambda bot: SOAPRequestView())
+
+
 def setup(bot):
     return bot.add_cog(SOAPRequestCog(bot))
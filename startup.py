@@ -0,0 +1,220 @@
+"""
+Startup orchestration, installed by main.py before any extension is loaded.
+load_order() sorts the extensions by their module-level imports, so none is
+imported (and run) before its own load_extension. Persistent views are registered before the gateway
+connects (see main.py), so buttons work from the first interaction. The REST
+work cogs used to do one after another in on_ready is registered here with
+add_warmup() and run concurrently once the bot is first ready, at most
+STARTUP_REST_CONCURRENCY at a time so startup doesn't trip rate limits. Each
+step is put on a timeline, which is posted in the Ready embed and journaled.
+"""
+
+import ast
+import asyncio
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import discord
+from discord.ext import commands
+
+import journal
+from constants import MEMBER_CACHE_POLICY, SOAP_LOG_ID, STARTUP_REST_CONCURRENCY
+
+try:
+    import resource  # not on Windows
+except ImportError:
+    resource = None
+
+Warmup = Callable[[], Awaitable[None]]
+
+# main.py imports this module first, so this is close to process start
+started_at = time.monotonic()
+
+_warmups: dict[str, Warmup] = {}
+# (step, seconds since start), in the order steps finished
+timeline: list[tuple[str, float]] = []
+
+
+def mark(step: str):
+    timeline.append((step, time.monotonic() - started_at))
+
+
+def add_warmup(name: str, warmup: Warmup):
+    """Run warmup() once the bot is first ready, alongside the other warmups."""
+    _warmups[name] = warmup
+
+
+def remove_warmup(name: str):
+    _warmups.pop(name, None)
+
+
+def warmups_of(cogs) -> list[str]:
+    """Names of the warmups registered by these cogs (to re-run after a reload)."""
+    return [name for name, warmup in _warmups.items() if getattr(warmup, "__self__", None) in cogs]
+
+
+def _module_imports(name: str) -> set[str]:
+    """Top-level names of the modules a bot module imports when it's run (not inside functions)."""
+    try:
+        tree = ast.parse((Path(__file__).parent / f"{name}.py").read_text(encoding="utf-8"))
+    except (OSError, SyntaxError):
+        return set()
+    found = set()
+    pending = list(tree.body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            continue
+        if isinstance(node, ast.Import):
+            found.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            found.add(node.module.split(".")[0])
+        pending.extend(ast.iter_child_nodes(node))
+    return found
+
+
+def load_order(extensions: list[str]) -> list[str]:
+    """
+    The extensions ordered so each comes after every extension it imports,
+    directly or through other bot modules. Otherwise the ordering is kept.
+    """
+    wanted = set(extensions)
+    imports: dict[str, set[str]] = {}
+
+    def dependencies(name: str) -> set[str]:
+        # Extensions reachable from name's imports, following plain modules along the way
+        found, seen, pending = set(), {name}, [name]
+        while pending:
+            module = pending.pop()
+            if module not in imports:
+                imports[module] = _module_imports(module)
+            for imported in imports[module] - seen:
+                seen.add(imported)
+                if imported in wanted:
+                    found.add(imported)
+                pending.append(imported)
+        return found
+
+    order: list[str] = []
+    visiting: set[str] = set()
+
+    def visit(name: str):
+        if name in order or name in visiting:  # an import cycle can't be ordered; keep going
+            return
+        visiting.add(name)
+        for dependency in sorted(dependencies(name), key=extensions.index):
+            visit(dependency)
+        visiting.discard(name)
+        order.append(name)
+
+    for extension in extensions:
+        visit(extension)
+    return order
+
+
+def _member_cache():
+    # Imported late: member_cache is an extension, and importing it (or
+    # channel_index/perms through it) before load_extension would run it twice
+    import member_cache
+
+    return member_cache
+
+
+def seconds_to(step: str) -> float | None:
+    for name, at in timeline:
+        if name == step:
+            return at
+    return None
+
+
+class StartupCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._warmup_task: asyncio.Task | None = None
+
+    def cog_unload(self):
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+
+    @commands.Cog.listener()
+    async def on_connect(self):
+        if seconds_to("gateway connected") is None:
+            mark("gateway connected")
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        print(f"Logged-in as {self.bot.user}")
+        first_ready = seconds_to("ready") is None
+        if first_ready:
+            mark("ready")
+        journal.record(
+            "lifecycle.ready",
+            bot_id=self.bot.user.id,
+            guild_ids=[g.id for g in self.bot.guilds],
+            latency_ms=round(self.bot.latency * 1000),
+            seconds_to_ready=round(seconds_to("ready"), 2),
+            members_cached=_member_cache().cached_members(self.bot),
+        )
+        # Reconnects don't redo the warmups
+        if first_ready:
+            self._warmup_task = asyncio.create_task(self._warm_up())
+
+    async def _run_warmup(self, budget: asyncio.Semaphore, name: str, warmup: Warmup):
+        async with budget:
+            start = time.monotonic()
+            try:
+                await warmup()
+            except Exception as e:
+                print(f"Error in startup warmup {name}: {e}")
+                journal.record("lifecycle.warmup_failed", warmup=name, error=repr(e))
+            mark(f"{name} ({time.monotonic() - start:.1f}s)")
+
+    async def run_warmups(self, names: list[str]):
+        """Run the named warmups concurrently, at most STARTUP_REST_CONCURRENCY at a time."""
+        budget = asyncio.Semaphore(STARTUP_REST_CONCURRENCY)
+        await asyncio.gather(
+            *(self._run_warmup(budget, name, _warmups[name]) for name in names if name in _warmups)
+        )
+
+    async def _warm_up(self):
+        await self.run_warmups(list(_warmups))
+        mark("warm")
+        journal.record("lifecycle.warm", timeline=[[step, round(at, 2)] for step, at in timeline])
+        await self._post_ready_embed()
+
+    async def _post_ready_embed(self):
+        log_channel = self.bot.get_channel(SOAP_LOG_ID)
+        if log_channel is None:
+            print(f"Ready embed not sent: SOAP log channel {SOAP_LOG_ID} not found")
+            return
+
+        embed = discord.Embed(
+            title="Ready!",
+            description=f"{self.bot.user.name} has just restarted.",
+            color=discord.Color.blue(),
+        )
+        member_cache = _member_cache()
+        stats = [
+            f"ready in {seconds_to('ready'):.1f}s",
+            f"{member_cache.cached_members(self.bot)} members cached ({MEMBER_CACHE_POLICY}, "
+            f"{member_cache.stats['skipped']} skipped)",
+        ]
+        if resource is not None:
+            # ru_maxrss is in KB on Linux
+            stats.append(f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+        embed.add_field(name="Startup", value=" • ".join(stats), inline=False)
+        embed.add_field(
+            name="Timeline",
+            value="```\n" + "\n".join(f"{at:>6.1f}s {step}" for step, at in timeline)[:1000] + "\n```",
+            inline=False,
+        )
+        try:
+            await log_channel.send(embed=embed)
+        except discord.HTTPException as e:
+            print(f"Error sending the ready embed: {e}")
+
+
+def install(bot: commands.Bot):
+    """Add the startup cog. main.py calls this before loading extensions."""
+    bot.add_cog(StartupCog(bot))
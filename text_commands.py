@@ -5,18 +5,21 @@ from perms import command_with_perms, soap_channels_only, nnid_channels_only
 from discord.ext import commands
 from discord.ext.bridge import BridgeOption
 from functools import wraps
+import member_cache
 from constants import (
     SOAP_CHANNEL_SUFFIX,
     NNID_CHANNEL_SUFFIX,
-    SOAP_USABLE_IDS,
-    NNID_CHANNEL_CATEGORY_ID,
     BLOBSOAP_EMOTE_ID,
     SOAP_LOADING_ID,
 )
+from channel_index import SOAP_USABLE_CATEGORY_IDS, NNID_CATEGORY_IDS
 
 # Regex pulls the User ID from a mention
 MENTION_RE = re.compile(r"<@!?(\d{15,25})>")
 
+# Categories where an unresolved helpee gets a placeholder mention instead of "left"
+PING_CATEGORY_IDS = SOAP_USABLE_CATEGORY_IDS | NNID_CATEGORY_IDS
+
 
 def ping_before_mes():  # i didn't feel like writing the same line multiple times so i did the harder option of writing an entire decorator to write one single line
     def decorator(func):
@@ -29,12 +32,7 @@ def ping_before_mes():  # i didn't feel like writing the same line multiple time
                 m = MENTION_RE.search(topic)
                 if m:
                     uid = int(m.group(1))
-                    member_obj = ctx.guild.get_member(uid)
-                    if member_obj is None:
-                        try:
-                            member_obj = await ctx.guild.fetch_member(uid)
-                        except discord.NotFound:
-                            member_obj = None
+                    member_obj = await member_cache.get_member(ctx.guild, uid)
 
                 if member_obj:
                     await ctx.respond(
@@ -53,7 +51,7 @@ def ping_before_mes():  # i didn't feel like writing the same line multiple time
                 await ctx.respond(
                     f"{member_obj.mention}\n\n{'\n\n'.join(await func(self, ctx, *args, **kwargs))}"
                 )
-            elif ctx.channel.category and (ctx.channel.category.id in SOAP_USABLE_IDS or ctx.channel.category.id == NNID_CHANNEL_CATEGORY_ID):
+            elif ctx.channel.category_id in PING_CATEGORY_IDS:
                 await ctx.respond(
                     f"`HELPEE MENTION HERE` (This is not a working channel)\n\n{'\n\n'.join(await func(self, ctx, *args, **kwargs))}"
                 )
@@ -139,12 +137,7 @@ class TextCommandsCog(commands.Cog):  # temp until dynamic stuff is ready
             m = MENTION_RE.search(topic)
             if m:
                 uid = int(m.group(1))
-                member_obj = ctx.guild.get_member(uid)
-                if member_obj is None:
-                    try:
-                        member_obj = await ctx.guild.fetch_member(uid)
-                    except discord.NotFound:
-                        member_obj = None
+                member_obj = await member_cache.get_member(ctx.guild, uid)
 
         # Get the user from the channel name if topic failed
         if not member_obj:
@@ -171,7 +164,7 @@ class TextCommandsCog(commands.Cog):  # temp until dynamic stuff is ready
         # Send with user mention if found
         if member_obj:
             await ctx.respond(content=member_obj.mention, embed=embed)
-        elif ctx.channel.category and (ctx.channel.category.id in SOAP_USABLE_IDS or ctx.channel.category.id == NNID_CHANNEL_CATEGORY_ID):
+        elif ctx.channel.category_id in PING_CATEGORY_IDS:
             await ctx.respond(content="`HELPEE MENTION HERE` (This is not a working channel)", embed=embed)
         else:
             await ctx.respond(embed=embed)
@@ -214,12 +207,7 @@ class TextCommandsCog(commands.Cog):  # temp until dynamic stuff is ready
             m = MENTION_RE.search(topic)
             if m:
                 uid = int(m.group(1))
-                member_obj = ctx.guild.get_member(uid)
-                if member_obj is None:
-                    try:
-                        member_obj = await ctx.guild.fetch_member(uid)
-                    except discord.NotFound:
-                        member_obj = None
+                member_obj = await member_cache.get_member(ctx.guild, uid)
         if not member_obj:
             member_name = ctx.channel.name.removesuffix(NNID_CHANNEL_SUFFIX)
             member_obj = ctx.guild.get_member_named(member_name)
@@ -404,12 +392,7 @@ class TextCommandsCog(commands.Cog):  # temp until dynamic stuff is ready
             m = MENTION_RE.search(topic)
             if m:
                 uid = int(m.group(1))
-                member_obj = ctx.guild.get_member(uid)
-                if member_obj is None:
-                    try:
-                        member_obj = await ctx.guild.fetch_member(uid)
-                    except discord.NotFound:
-                        member_obj = None
+                member_obj = await member_cache.get_member(ctx.guild, uid)
 
         # Get the user from the channel name if topic failed
         if not member_obj:
@@ -429,7 +412,7 @@ class TextCommandsCog(commands.Cog):  # temp until dynamic stuff is ready
         # Send with user mention if found
         if member_obj:
             await ctx.respond(content=member_obj.mention, embed=embed)
-        elif ctx.channel.category and (ctx.channel.category.id in SOAP_USABLE_IDS or ctx.channel.category.id == NNID_CHANNEL_CATEGORY_ID):
+        elif ctx.channel.category_id in PING_CATEGORY_IDS:
             await ctx.respond(content="`HELPEE MENTION HERE` (This is not a working channel)", embed=embed)
         else:
             await ctx.respond(embed=embed)
@@ -0,0 +1,164 @@
+import time
+from collections import OrderedDict, deque
+import journal
+
+# Milestones in the order a SOAP normally hits them (used to order reports).
+# Soapy PROGRESS details are recorded as "progress:<detail>".
+MILESTONE_ORDER = [
+    "request",
+    "form_complete",
+    "channel_ready",
+    "serial_submitted",
+    "exefs_checked",
+    "soapy_start",
+    "progress:serial_check_attempt",
+    "progress:queued",
+    "progress:cleaninty_init",
+    "progress:cleaninty_serial_check",
+    "progress:eshop_region_change_attempt",
+    "progress:eshop_region_change_success",
+    "progress:system_transfer_attempt",
+    "progress:eshop_delete_success",
+    "progress:system_transfer_success",
+    "success",
+    "lottery",
+    "error",
+    "eshop_verified",
+    "archived",
+]
+
+# Bounds so abandoned requests/channels can't grow memory without limit
+MAX_PENDING_TRACES = 500
+MAX_ACTIVE_TRACES = 500
+MAX_FINISHED_TRACES = 2000
+
+
+class Trace:
+    """Timestamped milestones of one transfer."""
+
+    __slots__ = ("user_id", "channel_id", "milestones")
+
+    def __init__(self, user_id: int | None = None):
+        self.user_id = user_id
+        self.channel_id: int | None = None
+        self.milestones: list[tuple[str, float]] = []
+
+    def mark(self, milestone: str, at: float | None = None):
+        self.milestones.append((milestone, time.time() if at is None else at))
+
+    @property
+    def started_at(self) -> float:
+        return self.milestones[0][1] if self.milestones else 0.0
+
+    def stages(self) -> list[tuple[str, float]]:
+        """(milestone, seconds since the previous milestone) for every milestone after the first."""
+        return [
+            (name, at - prev_at)
+            for (_, prev_at), (name, at) in zip(self.milestones, self.milestones[1:])
+        ]
+
+
+# user_id -> trace started before the SOAP channel exists
+_pending: OrderedDict[int, Trace] = OrderedDict()
+# channel_id -> trace of an open SOAP channel
+_active: OrderedDict[int, Trace] = OrderedDict()
+_finished: deque[Trace] = deque(maxlen=MAX_FINISHED_TRACES)
+
+
+def _bounded_set(store: OrderedDict, key: int, trace: Trace, limit: int):
+    store[key] = trace
+    store.move_to_end(key)
+    while len(store) > limit:
+        store.popitem(last=False)
+
+
+def mark_user(user_id: int, milestone: str, *, restart: bool = False):
+    """Record a milestone for a user whose SOAP channel doesn't exist yet."""
+    trace = None if restart else _pending.get(user_id)
+    if trace is None:
+        trace = Trace(user_id)
+        _bounded_set(_pending, user_id, trace, MAX_PENDING_TRACES)
+    trace.mark(milestone)
+
+
+def bind_channel(user_id: int, channel_id: int):
+    """Move a user's pending trace onto their newly created SOAP channel."""
+    trace = _pending.pop(user_id, None) or Trace(user_id)
+    trace.channel_id = channel_id
+    _bounded_set(_active, channel_id, trace, MAX_ACTIVE_TRACES)
+
+
+def mark(channel_id: int, milestone: str):
+    """Record a milestone for a SOAP channel, starting a trace if it has none."""
+    trace = _active.get(channel_id)
+    if trace is None:
+        trace = Trace()
+        trace.channel_id = channel_id
+        _bounded_set(_active, channel_id, trace, MAX_ACTIVE_TRACES)
+    trace.mark(milestone)
+
+
+def finish(channel_id: int, milestone: str = "archived"):
+    """Close a channel's trace with a final milestone and store it. No-op for untraced channels."""
+    trace = _active.pop(channel_id, None)
+    if trace is None:
+        return
+    trace.mark(milestone)
+    _finished.append(trace)
+    journal.record(
+        "trace",
+        channel_id=channel_id,
+        user_id=trace.user_id,
+        milestones=[[name, round(at, 3)] for name, at in trace.milestones],
+    )
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100) of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+def stage_stats(window_seconds: float) -> list[tuple[str, int, float, float, float]]:
+    """
+    Per-stage (stage, count, p50, p95, p99) in seconds over traces finished within
+    the window, plus an "end-to-end" row, ordered like MILESTONE_ORDER.
+    """
+    cutoff = time.time() - window_seconds
+    durations: dict[str, list[float]] = {}
+    for trace in _finished:
+        if trace.milestones[-1][1] < cutoff:
+            continue
+        for name, seconds in trace.stages():
+            durations.setdefault(name, []).append(seconds)
+        if len(trace.milestones) > 1:
+            durations.setdefault("end-to-end", []).append(
+                trace.milestones[-1][1] - trace.started_at
+            )
+
+    def order(name: str):
+        if name == "end-to-end":
+            return (2, 0, name)
+        if name in MILESTONE_ORDER:
+            return (0, MILESTONE_ORDER.index(name), name)
+        return (1, 0, name)
+
+    rows = []
+    for name in sorted(durations, key=order):
+        values = sorted(durations[name])
+        rows.append(
+            (
+                name,
+                len(values),
+                percentile(values, 50),
+                percentile(values, 95),
+                percentile(values, 99),
+            )
+        )
+    return rows
+
+
+def active_count() -> int:
+    return len(_active)
@@ -5,6 +5,8 @@ from pathlib import Path
 from discord.ext import commands
 from discord.ext.bridge import BridgeOption
 from perms import command_with_perms
+import jobs
+import startup
 from constants import SOAP_TRACKER_ID, NNID_TRACKER_ID
 
 TRACKER_COUNTS_FILE = Path(__file__).parent / "tracker_counts.json"
@@ -15,6 +17,8 @@ class TrackerCog(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
+        self._periodic_task = None
+        startup.add_warmup("trackers", self.warm_up)
         # Initialize file if it doesn't exist
         try:
             if not TRACKER_COUNTS_FILE.exists():
@@ -73,7 +77,13 @@ class TrackerCog(commands.Cog):
                 if soap_tracker and isinstance(soap_tracker, discord.VoiceChannel):
                     new_name = f"🧼 SOAPs Served: {soap_count}"
                     if soap_tracker.name != new_name:
-                        await soap_tracker.edit(name=new_name)
+                        # Renames are limited to 2 per 10 minutes; a rename still waiting gets the new name
+                        await jobs.submit(
+                            "rename_channel",
+                            coalesce="channel_id",
+                            channel_id=soap_tracker.id,
+                            name=new_name,
+                        )
                 elif not soap_tracker:
                     print(
                         f"SOAP tracker channel {SOAP_TRACKER_ID} not found in guild {guild.id}"
@@ -93,7 +103,12 @@ class TrackerCog(commands.Cog):
                 if nnid_tracker and isinstance(nnid_tracker, discord.VoiceChannel):
                     new_name = f"🔄 NNIDs Served: {nnid_count}"
                     if nnid_tracker.name != new_name:
-                        await nnid_tracker.edit(name=new_name)
+                        await jobs.submit(
+                            "rename_channel",
+                            coalesce="channel_id",
+                            channel_id=nnid_tracker.id,
+                            name=new_name,
+                        )
                 elif not nnid_tracker:
                     print(
                         f"NNID tracker channel {NNID_TRACKER_ID} not found in guild {guild.id}"
@@ -103,29 +118,31 @@ class TrackerCog(commands.Cog):
             except Exception as e:
                 print(f"Error updating NNID tracker: {e}")
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        """Start periodic update task when bot starts"""
-        # Update immediately on startup
+    def cog_unload(self):
+        startup.remove_warmup("trackers")
+        if self._periodic_task and not self._periodic_task.done():
+            self._periodic_task.cancel()
+
+    async def warm_up(self):
+        """Update trackers on startup, then start the periodic update (once, not on every on_ready)"""
         for guild in self.bot.guilds:
             await self.update_trackers(guild)
 
-        # Start background task to update every 5 minutes
-        self.bot.loop.create_task(self._periodic_update())
+        if self._periodic_task is None or self._periodic_task.done():
+            self._periodic_task = asyncio.create_task(self._periodic_update())
 
     async def _periodic_update(self):
         """Background task that updates voice channels every 5 minutes"""
-        await self.bot.wait_until_ready()
         while not self.bot.is_closed():
+            # Wait 5 minutes (300 seconds); warm_up already did the first update
+            await asyncio.sleep(300)
+
             try:
                 for guild in self.bot.guilds:
                     await self.update_trackers(guild)
             except Exception as e:
                 print(f"Error in periodic tracker update: {e}")
 
-            # Wait 5 minutes (300 seconds)
-            await asyncio.sleep(300)
-
     @command_with_perms(
         allowed_roles=["Developer", "Staff"],
         name="sync",
@@ -0,0 +1,142 @@
+"""
+Event-loop stall detector. A watchdog thread keeps posting a no-op callback to
+the loop; if it isn't run within STALL_THRESHOLD_MS, the loop thread's stack is
+captured right then, labelled with the asyncio task that was running (Pycord
+names event tasks "pycord: on_<event>"), and kept for the .stalls command.
+"""
+
+import asyncio
+import re
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+import journal
+from constants import STALL_THRESHOLD_MS
+
+# Samples kept for .stalls
+MAX_STALL_SAMPLES = 200
+# Pause between heartbeats while the loop is healthy
+HEARTBEAT_INTERVAL = 0.1
+# Frames kept per captured stack (innermost last)
+MAX_STACK_FRAMES = 25
+
+_BOT_DIR = str(Path(__file__).parent)
+# Per-view/modal ids appended to Pycord task names
+_TASK_ID_RE = re.compile(r"-[0-9a-f]{16,}$")
+
+
+class StallSample:
+    __slots__ = ("at", "duration", "task", "stack", "location")
+
+    def __init__(self, at: float, task: str, stack: list[traceback.FrameSummary]):
+        self.at = at
+        self.duration = 0.0
+        self.task = task
+        self.stack = stack
+        self.location = _bot_location(stack)
+
+    def format_stack(self, limit: int = 8) -> str:
+        return "".join(traceback.format_list(self.stack[-limit:]))
+
+
+def _bot_location(stack: list[traceback.FrameSummary]) -> str:
+    """Innermost frame in our own code, e.g. 'tracker.py:52 _save_counts_to_file'."""
+    for frame in reversed(stack):
+        if frame.filename.startswith(_BOT_DIR) and "site-packages" not in frame.filename:
+            return f"{Path(frame.filename).name}:{frame.lineno} {frame.name}"
+    if stack:
+        frame = stack[-1]
+        return f"{Path(frame.filename).name}:{frame.lineno} {frame.name}"
+    return "unknown"
+
+
+samples: deque[StallSample] = deque(maxlen=MAX_STALL_SAMPLES)
+_thread: threading.Thread | None = None
+
+
+def _capture(loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> StallSample | None:
+    frame = sys._current_frames().get(loop_thread_id)
+    if frame is None:
+        return None
+    stack = traceback.extract_stack(frame)[-MAX_STACK_FRAMES:]
+    try:
+        task = asyncio.current_task(loop)
+        task_name = task.get_name() if task is not None else "no task (callback)"
+    except RuntimeError:
+        task_name = "unknown"
+    return StallSample(time.time(), task_name, stack)
+
+
+def _watch(loop: asyncio.AbstractEventLoop, loop_thread_id: int, threshold: float):
+    ack = threading.Event()
+    while not loop.is_closed():
+        ack.clear()
+        sent = time.monotonic()
+        try:
+            loop.call_soon_threadsafe(ack.set)
+        except RuntimeError:
+            return  # loop closed
+        if ack.wait(threshold):
+            time.sleep(HEARTBEAT_INTERVAL)
+            continue
+
+        # Stalled: grab the stack while it's still stuck, then wait it out
+        sample = _capture(loop, loop_thread_id)
+        while not ack.wait(1.0):
+            if loop.is_closed():
+                return
+        if sample is None:
+            continue
+        sample.duration = time.monotonic() - sent
+        samples.append(sample)
+        journal.record(
+            "stall",
+            duration_ms=round(sample.duration * 1000),
+            task=sample.task,
+            location=sample.location,
+            stack=sample.format_stack(),
+        )
+
+
+def start(loop: asyncio.AbstractEventLoop | None = None):
+    """Start the watchdog for the running loop (call from the loop thread). Idempotent."""
+    global _thread
+    if not STALL_THRESHOLD_MS or _thread is not None:
+        return
+    loop = loop or asyncio.get_running_loop()
+    _thread = threading.Thread(
+        target=_watch,
+        args=(loop, threading.get_ident(), STALL_THRESHOLD_MS / 1000),
+        name="loop-watchdog",
+        daemon=True,
+    )
+    _thread.start()
+
+
+def install(bot):
+    """Start the watchdog once the bot connects."""
+
+    async def start_watchdog(*_):
+        start()
+
+    bot.add_listener(start_watchdog, "on_connect")
+
+
+def worst_offenders(limit: int = 10) -> list[tuple[str, str, int, float, float, StallSample]]:
+    """(task, location, count, total s, max s, worst sample) grouped by task and location."""
+    groups: dict[tuple[str, str], list[StallSample]] = {}
+    for sample in list(samples):
+        # Strip per-view ids so "discord-ui-view-dispatch-<id>" groups together
+        task = _TASK_ID_RE.sub("", sample.task)
+        groups.setdefault((task, sample.location), []).append(sample)
+    rows = []
+    for (task, location), group in groups.items():
+        worst = max(group, key=lambda s: s.duration)
+        rows.append(
+            (task, location, len(group), sum(s.duration for s in group), worst.duration, worst)
+        )
+    rows.sort(key=lambda r: r[3], reverse=True)
+    return rows[:limit]
@@ -0,0 +1,37 @@
+"""
+Background job worker for JOB_MODE = "queue" (see jobs.py). Logs in with the
+bot token for REST only, without a gateway connection, and runs jobs from the
+shared queue. Start one or more next to main.py:
+
+    python worker.py
+"""
+
+import asyncio
+import os
+import signal
+import socket
+
+import discord
+
+import jobs
+from constants import KEY
+
+
+async def main():
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:  # Windows
+        pass
+    client = discord.Client(intents=discord.Intents.none())
+    async with client:
+        await client.login(KEY)
+        print(f"Worker {worker_id} running jobs as {client.user}")
+        await jobs.run_worker(client, worker_id)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass